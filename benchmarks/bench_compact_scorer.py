@@ -0,0 +1,92 @@
+"""
+Benchmark: libsvm decision_function vs the compact RBF scorer.
+
+Trains a One-Class SVM on synthetic clustered rows, compacts it into a
+CompactRBFScorer, optionally reduces the support-vector set under a score
+error budget, and reports the scoring latency per batch and the score error
+of each scorer against libsvm.
+
+Usage:
+    python benchmarks/bench_compact_scorer.py --rows 8000 --nu 0.5 --budget 0.05
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+from sklearn.svm import OneClassSVM
+
+project_root = Path(__file__).resolve().parents[1]
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
+
+from src.model.compact_scorer import CompactRBFScorer  # noqa: E402
+
+
+def make_clustered_rows(n_rows, n_features=30, n_clusters=20, seed=42):
+    """Rows drawn around a few centres, like preprocessed flow features."""
+    rng = np.random.default_rng(seed)
+    centres = rng.normal(size=(n_clusters, n_features)) * 3
+    labels = rng.integers(0, n_clusters, n_rows)
+    return centres[labels] + rng.normal(size=(n_rows, n_features)) * 0.5
+
+
+def time_batches(decision_function, X, batch_size, repeats):
+    batches = [X[i : i + batch_size] for i in range(0, len(X), batch_size)]
+    start = time.perf_counter()
+    for _ in range(repeats):
+        for batch in batches:
+            decision_function(batch)
+    return (time.perf_counter() - start) / (repeats * len(batches)) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=8000)
+    parser.add_argument("--nu", type=float, default=0.5)
+    parser.add_argument(
+        "--budget",
+        type=float,
+        default=0.05,
+        help="score error budget, as a fraction of the score standard deviation",
+    )
+    parser.add_argument("--batch-size", type=int, default=100)
+    parser.add_argument("--repeats", type=int, default=5)
+    args = parser.parse_args()
+
+    X_train = make_clustered_rows(args.rows)
+    X_val = make_clustered_rows(4000, seed=7)
+    X_test = make_clustered_rows(5000, seed=8)
+
+    start = time.perf_counter()
+    model = OneClassSVM(nu=args.nu, gamma="scale").fit(X_train)
+    print(
+        f"Trained on {args.rows} rows in {time.perf_counter() - start:.2f}s, "
+        f"{len(model.support_vectors_)} support vectors"
+    )
+
+    exact_scores = model.decision_function(X_test)
+    scorer = CompactRBFScorer.from_model(model)
+    budget = args.budget * exact_scores.std()
+    start = time.perf_counter()
+    reduced = scorer.reduce(X_val, budget)
+    reduce_seconds = time.perf_counter() - start
+
+    print(f"{'scorer':>10} {'vectors':>8} {'ms/batch':>9} {'max error':>10}")
+    for name, decision_function, n_support in [
+        ("libsvm", model.decision_function, len(model.support_vectors_)),
+        ("compact", scorer.decision_function, scorer.n_support),
+        ("reduced", reduced.decision_function, reduced.n_support),
+    ]:
+        batch_ms = time_batches(
+            decision_function, X_test, args.batch_size, args.repeats
+        )
+        error = np.max(np.abs(decision_function(X_test) - exact_scores))
+        print(f"{name:>10} {n_support:>8} {batch_ms:>9.3f} {error:>10.4f}")
+    print(f"Reduction under a {budget:.4f} budget took {reduce_seconds:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
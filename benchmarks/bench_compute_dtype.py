@@ -0,0 +1,126 @@
+"""
+Report: float64 vs float32 compute dtype of OneClassSVMModel.
+
+Fits the model with each compute dtype on the benign flows of the model test
+fixture (tests/test_model/test_oneclass_svm.py), repeated to --rows rows, and
+reports the memory of the feature matrix and of the compact scorer, the
+predict_batch latency, and the score drift and severity agreement of
+float32 versus float64.
+
+Usage:
+    python benchmarks/bench_compute_dtype.py --rows 30 20000 --batch-size 100
+"""
+
+import argparse
+import contextlib
+import io
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+project_root = Path(__file__).resolve().parents[1]
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
+
+from src.model.oneCSVM_model import OneClassSVMModel  # noqa: E402
+
+DTYPES = ("float64", "float32")
+
+
+def make_sample_data(n_rows, seed=42):
+    """The sample_data fixture of the model tests, with n_rows rows."""
+    rng = np.random.default_rng(seed)
+    pattern = np.arange(n_rows) % 3
+    df = pd.DataFrame(
+        {
+            "source_ip": np.array(["192.168.1.1", "10.0.0.1", "192.168.1.2"])[pattern],
+            "destination_ip": np.array(["8.8.8.8", "1.1.1.1", "8.8.4.4"])[pattern],
+            "bytes_in": rng.integers(100, 1000, n_rows),
+            "bytes_out": rng.integers(100, 1000, n_rows),
+            "transport_protocol": np.array(["TCP", "UDP", "TCP"])[pattern],
+            "application_protocol": np.array(["HTTP", "DNS", "HTTPS"])[pattern],
+            "label": "benign",
+        }
+    )
+    df["direction"] = "outbound"
+    df["day_of_week"] = 1
+    df["is_weekend"] = 0
+    df["is_business_hours"] = 1
+    df["src_is_private"] = 1
+    df["dst_is_private"] = 0
+    df["is_internal"] = 0
+    df["dst_port_is_common"] = 1
+    return df
+
+
+def fit_model(df, compute_dtype, max_train, tmp_dir):
+    model = OneClassSVMModel(nu=0.1, compute_dtype=compute_dtype)
+    model.model.set_params(verbose=False)
+    model.model_path = tmp_dir / f"{compute_dtype}_model.pkl"
+    model.preprocessor_path = tmp_dir / f"{compute_dtype}_preprocessor.pkl"
+    model.config_path = tmp_dir / f"{compute_dtype}_config.pkl"
+    with contextlib.redirect_stdout(io.StringIO()):
+        model.fit(df, max_train_samples=max_train, contamination=0.1)
+    return model
+
+
+def measure(model, df, batch_size, repeats):
+    X = df.drop(columns=model.features_to_drop, errors="ignore")
+    batches = [X.iloc[i : i + batch_size] for i in range(0, len(X), batch_size)]
+    start = time.perf_counter()
+    for _ in range(repeats):
+        results = pd.concat([model.predict_batch(batch) for batch in batches])
+    batch_ms = (time.perf_counter() - start) / (repeats * len(batches)) * 1000
+    return {
+        "matrix_kb": model._transform(X).nbytes / 1024,
+        "scorer_kb": model.scorer.nbytes / 1024,
+        "batch_ms": batch_ms,
+        "results": results,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, nargs="+", default=[30, 20_000])
+    parser.add_argument("--max-train", type=int, default=8000)
+    parser.add_argument("--batch-size", type=int, default=100)
+    parser.add_argument("--repeats", type=int, default=3)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for n_rows in args.rows:
+            df = make_sample_data(n_rows)
+            report = {
+                dtype: measure(
+                    fit_model(df, dtype, args.max_train, Path(tmp)),
+                    df,
+                    args.batch_size,
+                    args.repeats,
+                )
+                for dtype in DTYPES
+            }
+
+            print(f"\n{n_rows} rows")
+            print(f"{'dtype':>8} {'matrix KB':>10} {'scorer KB':>10} {'ms/batch':>9}")
+            for dtype in DTYPES:
+                row = report[dtype]
+                print(
+                    f"{dtype:>8} {row['matrix_kb']:>10.1f} {row['scorer_kb']:>10.1f} "
+                    f"{row['batch_ms']:>9.3f}"
+                )
+
+            base, single = (report[dtype]["results"] for dtype in DTYPES)
+            drift = np.abs(single["anomaly_score"] - base["anomaly_score"])
+            agreement = (single["severity"] == base["severity"]).mean()
+            print(
+                f"score drift vs float64: max {drift.max():.2e}, "
+                f"mean {drift.mean():.2e}; severity agreement {agreement:.4f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+"""
+Benchmark: JSON parsing backends for log ingestion.
+
+Writes a synthetic Suricata eve.json (line-delimited) and a synthetic benign
+traffic JSON array, then reports ingestion throughput in records per second
+for every installed backend of each initializer.
+
+Usage:
+    python benchmarks/bench_json_backends.py --records 200000
+"""
+
+import argparse
+import json
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+project_root = Path(__file__).resolve().parents[1]
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
+
+from src.feature_engineering.df_initializing import (  # noqa: E402
+    NormalTrafficDataFrameInitializer,
+    SuricataDataFrameInitializer,
+)
+from src.feature_engineering.df_initializing.json_backends import (  # noqa: E402
+    available_array_backends,
+    available_line_backends,
+)
+
+
+def suricata_event(i):
+    return {
+        "timestamp": "2025-10-24T02:44:07.619878+0000",
+        "flow_id": 2096863666648705 + i,
+        "in_iface": "ens4",
+        "event_type": "flow" if i % 2 else "alert",
+        "src_ip": f"10.0.{i % 256}.{i % 251}",
+        "src_port": 1024 + i % 60000,
+        "dest_ip": "10.128.0.2",
+        "dest_port": 22,
+        "proto": "TCP",
+        "app_proto": "ssh",
+        "flow": {
+            "pkts_toserver": 2,
+            "pkts_toclient": 1,
+            "bytes_toserver": 164,
+            "bytes_toclient": 172,
+            "start": "2025-10-24T02:44:07.619286+0000",
+        },
+    }
+
+
+def benign_record(i):
+    return {
+        "appName": "HTTPWeb",
+        "totalSourceBytes": 384 + i,
+        "totalDestinationBytes": 1200,
+        "totalDestinationPackets": 4,
+        "totalSourcePackets": 6,
+        "direction": "L2R",
+        "source": f"192.168.{i % 256}.{i % 251}",
+        "protocolName": "tcp_ip",
+        "sourcePort": 1024 + i % 60000,
+        "destination": "206.217.198.186",
+        "destinationPort": 80,
+        "startDateTime": "2010-06-13T23:58:00",
+        "stopDateTime": "2010-06-14T00:01:00",
+        "Label": "Normal",
+    }
+
+
+def report(kind, backend, n_records, seconds):
+    print(f"{kind:<10} {backend:<10} {n_records / seconds:>14,.0f} records/s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--records", type=int, default=200_000)
+    args = parser.parse_args()
+    n = args.records
+
+    with tempfile.TemporaryDirectory() as tmp:
+        eve_path = Path(tmp) / "eve.json"
+        with open(eve_path, "w") as f:
+            for i in range(n):
+                f.write(json.dumps(suricata_event(i)) + "\n")
+
+        benign_path = Path(tmp) / "benign.json"
+        with open(benign_path, "w") as f:
+            json.dump([benign_record(i) for i in range(n)], f)
+
+        print(f"{'source':<10} {'backend':<10} {'throughput':>22}")
+        for backend in available_line_backends():
+            init = SuricataDataFrameInitializer(str(eve_path), json_backend=backend)
+            start = time.perf_counter()
+            count = sum(1 for _ in init.iter_suricata_records())
+            report("suricata", backend, count, time.perf_counter() - start)
+
+        for backend in available_array_backends():
+            init = NormalTrafficDataFrameInitializer(
+                str(benign_path), json_backend=backend
+            )
+            start = time.perf_counter()
+            count = len(init.sample_large_json_with_ijson(n))
+            report("benign", backend, count, time.perf_counter() - start)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+"""
+Benchmark: DataFrameFormatter serial vs chunked process pool.
+
+Builds synthetic raw Suricata and benign traffic frames, formats them with
+n_jobs=1 and with each requested worker count, checks that the outputs are
+identical and reports the speedup.
+
+Usage:
+    python benchmarks/bench_parallel_formatter.py --rows 1000000 --jobs 2 4 8
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+project_root = Path(__file__).resolve().parents[1]
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
+
+from benchmarks.bench_suricata_flow_extraction import make_suricata_df  # noqa: E402
+from src.feature_engineering.df_formatting import DataFrameFormatter  # noqa: E402
+
+PROTOCOLS = ["TCP", "UDP", "ICMP"]
+APP_PROTOCOLS = ["http", "tls", "dns", "ssh", "failed", None]
+APP_NAMES = ["HTTPWeb", "SSL", "DNS", "SSH", "Unknown_UDP"]
+
+
+def _random_ips(rng, n_rows, n_unique):
+    pool = np.array(
+        [f"{a}.{b}.{c}.{d}" for a, b, c, d in rng.integers(1, 255, size=(n_unique, 4))]
+    )
+    return pool[rng.integers(0, n_unique, n_rows)]
+
+
+def make_raw_suricata_df(n_rows, seed=42):
+    """Synthetic raw Suricata alerts with flow data."""
+    rng = np.random.default_rng(seed)
+    df = make_suricata_df(n_rows, seed)
+    df["src_ip"] = _random_ips(rng, n_rows, 5_000)
+    df["dest_ip"] = "10.128.0.2"
+    df["src_port"] = rng.integers(1024, 65536, n_rows)
+    df["dest_port"] = rng.choice([22, 23, 80, 443, 8080, 3389], n_rows)
+    df["proto"] = rng.choice(PROTOCOLS, n_rows)
+    df["app_proto"] = rng.choice(np.array(APP_PROTOCOLS, dtype=object), n_rows)
+    df["direction"] = rng.choice(["to_server", "to_client"], n_rows)
+    return df
+
+
+def make_raw_normal_traffic_df(n_rows, seed=43):
+    """Synthetic raw benign traffic records."""
+    rng = np.random.default_rng(seed)
+    start = pd.Timestamp("2010-06-13")
+    starts = start + pd.to_timedelta(rng.integers(0, 86_400, n_rows), unit="s")
+    stops = starts + pd.to_timedelta(rng.integers(0, 600, n_rows), unit="s")
+    return pd.DataFrame(
+        {
+            "appName": rng.choice(APP_NAMES, n_rows),
+            "totalSourceBytes": rng.integers(0, 100_000, n_rows),
+            "totalDestinationBytes": rng.integers(0, 100_000, n_rows),
+            "totalDestinationPackets": rng.integers(0, 500, n_rows),
+            "totalSourcePackets": rng.integers(0, 500, n_rows),
+            "direction": rng.choice(["L2R", "R2L", "L2L", "R2R"], n_rows),
+            "source": _random_ips(rng, n_rows, 5_000),
+            "protocolName": rng.choice(["tcp_ip", "udp_ip", "icmp_ip"], n_rows),
+            "sourcePort": rng.integers(1024, 65536, n_rows),
+            "destination": _random_ips(rng, n_rows, 2_000),
+            "destinationPort": rng.choice([53, 80, 443, 5353], n_rows),
+            "startDateTime": starts.strftime("%-m/%-d/%Y %-H:%M"),
+            "stopDateTime": stops.strftime("%-m/%-d/%Y %-H:%M"),
+            "Label": "Normal",
+        }
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=1_000_000, help="rows per source")
+    parser.add_argument("--jobs", type=int, nargs="+", default=[2, 4])
+    parser.add_argument("--chunk-size", type=int, default=100_000)
+    args = parser.parse_args()
+
+    print(f"Generating {args.rows:,} synthetic rows per source...")
+    suricata_df = make_raw_suricata_df(args.rows)
+    normal_traffic_df = make_raw_normal_traffic_df(args.rows)
+
+    t0 = time.perf_counter()
+    serial = DataFrameFormatter(suricata_df.copy(), normal_traffic_df.copy())
+    serial_s = time.perf_counter() - t0
+    print(f"n_jobs=1  : {serial_s:8.2f} s")
+
+    for n_jobs in args.jobs:
+        t0 = time.perf_counter()
+        parallel = DataFrameFormatter(
+            suricata_df.copy(),
+            normal_traffic_df.copy(),
+            n_jobs=n_jobs,
+            chunk_size=args.chunk_size,
+        )
+        parallel_s = time.perf_counter() - t0
+
+        pd.testing.assert_frame_equal(parallel.suricata_df, serial.suricata_df)
+        pd.testing.assert_frame_equal(
+            parallel.normal_traffic_df, serial.normal_traffic_df
+        )
+        print(
+            f"n_jobs={n_jobs:<3}: {parallel_s:8.2f} s "
+            f"({serial_s / parallel_s:.1f}x, outputs identical)"
+        )
+
+
+if __name__ == "__main__":
+    main()
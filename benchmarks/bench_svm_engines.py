@@ -0,0 +1,126 @@
+"""
+Benchmark: libsvm One-Class SVM vs Nystroem + SGDOneClassSVM engine.
+
+Builds a synthetic benign training set and a test set with injected
+anomalies, trains the libsvm engine on a downsampled split and the sgd
+engine on the full split, then reports training time, scoring time per
+batch and the share of anomalies flagged by each engine.
+
+Usage:
+    python benchmarks/bench_svm_engines.py --rows 200000 --max-train 8000
+"""
+
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+project_root = Path(__file__).resolve().parents[1]
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
+
+from src.model.oneCSVM_model import OneClassSVMModel  # noqa: E402
+
+NUMERIC_COLUMNS = ["duration", "bytes_sent", "bytes_received", "pkts_sent"]
+
+
+def make_traffic_df(n_rows, anomalous=False, seed=42):
+    """Synthetic processed flows with the features the model trains on."""
+    rng = np.random.default_rng(seed)
+    scale = 25.0 if anomalous else 1.0
+    df = pd.DataFrame(
+        {
+            col: rng.lognormal(mean=3.0, sigma=1.0, size=n_rows) * scale
+            for col in NUMERIC_COLUMNS
+        }
+    )
+    df["transport_protocol"] = rng.choice(["TCP", "UDP"], n_rows)
+    df["application_protocol"] = rng.choice(["http", "dns", "tls"], n_rows)
+    df["direction"] = rng.choice(["inbound", "outbound"], n_rows)
+    df["day_of_week"] = rng.integers(0, 7, n_rows)
+    df["is_weekend"] = (df["day_of_week"] >= 5).astype(int)
+    df["is_business_hours"] = rng.integers(0, 2, n_rows)
+    df["src_is_private"] = rng.integers(0, 2, n_rows)
+    df["dst_is_private"] = rng.integers(0, 2, n_rows)
+    df["is_internal"] = df["src_is_private"] & df["dst_is_private"]
+    df["dst_port_is_common"] = rng.integers(0, 2, n_rows)
+    df["label"] = "malicious" if anomalous else "benign"
+    return df
+
+
+def run_engine(engine, df_benign, df_test, max_train, batch_size, tmp_dir):
+    model = OneClassSVMModel(nu=0.1, engine=engine)
+    if engine == "libsvm":
+        model.model.set_params(verbose=False)
+    model.model_path = tmp_dir / f"{engine}_model.pkl"
+    model.preprocessor_path = tmp_dir / f"{engine}_preprocessor.pkl"
+    model.config_path = tmp_dir / f"{engine}_config.pkl"
+
+    start = time.perf_counter()
+    model.fit(df_benign, max_train_samples=max_train, contamination=0.1)
+    fit_seconds = time.perf_counter() - start
+
+    X_test = df_test.drop(columns=model.features_to_drop, errors="ignore")
+    start = time.perf_counter()
+    severities = [
+        model.predict_batch(X_test.iloc[i : i + batch_size])["severity"]
+        for i in range(0, len(X_test), batch_size)
+    ]
+    batches = -(-len(X_test) // batch_size)
+    batch_ms = (time.perf_counter() - start) / batches * 1000
+
+    flagged = pd.concat(severities).isin(["RED", "ORANGE"]).to_numpy()
+    is_anomaly = (df_test["label"] == "malicious").to_numpy()
+    return {
+        "fit_s": fit_seconds,
+        "batch_ms": batch_ms,
+        "detection_rate": flagged[is_anomaly].mean(),
+        "false_alarm_rate": flagged[~is_anomaly].mean(),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--max-train", type=int, default=8000)
+    parser.add_argument("--test-rows", type=int, default=20_000)
+    parser.add_argument("--batch-size", type=int, default=100)
+    args = parser.parse_args()
+
+    df_benign = make_traffic_df(args.rows)
+    df_test = pd.concat(
+        [
+            make_traffic_df(args.test_rows // 2, seed=7),
+            make_traffic_df(args.test_rows // 2, anomalous=True, seed=8),
+        ],
+        ignore_index=True,
+    )
+
+    print(
+        f"{args.rows} benign rows, libsvm capped at {args.max_train}, "
+        f"{args.test_rows} test rows in batches of {args.batch_size}"
+    )
+    with tempfile.TemporaryDirectory() as tmp:
+        for engine in ("libsvm", "sgd"):
+            result = run_engine(
+                engine,
+                df_benign,
+                df_test,
+                args.max_train,
+                args.batch_size,
+                Path(tmp),
+            )
+            print(
+                f"{engine:>7}: fit {result['fit_s']:8.2f}s  "
+                f"score {result['batch_ms']:7.2f} ms/batch  "
+                f"detection {result['detection_rate']:.3f}  "
+                f"false alarms {result['false_alarm_rate']:.3f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
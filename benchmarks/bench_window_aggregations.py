@@ -0,0 +1,257 @@
+"""
+Benchmark: window aggregations (groupby/merge per feature vs shared engine).
+
+Builds a synthetic formatted traffic DataFrame, runs the original chain of
+six groupby/merge aggregation functions and ``calculate_all_aggregation_features``
+on it, checks that both produce identical frames and reports the speedup.
+
+Usage:
+    python benchmarks/bench_window_aggregations.py --rows 5000000
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+project_root = Path(__file__).resolve().parents[1]
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
+
+from src.feature_engineering.aggregation_functions import (  # noqa: E402
+    calculate_all_aggregation_features,
+)
+
+
+def make_traffic_df(n_rows, seed=42):
+    """Synthetic formatted traffic over a week, with a few NaT timestamps."""
+    rng = np.random.default_rng(seed)
+    timestamps = pd.Timestamp("2025-10-20") + pd.to_timedelta(
+        rng.integers(0, 7 * 86_400, n_rows), unit="s"
+    )
+    df = pd.DataFrame(
+        {
+            "source_ip": rng.integers(0, 50_000, n_rows).astype(str),
+            "destination_port": rng.choice([22, 23, 80, 443, 8080, 3389], n_rows),
+            "timestamp_start": timestamps,
+            "application_protocol": rng.choice(
+                ["http", "ssh", "dns", "tls", "unknown"], n_rows
+            ),
+            "label": rng.choice(["benign", "malicious"], n_rows, p=[0.7, 0.3]),
+        }
+    )
+    df.loc[rng.random(n_rows) < 0.001, "timestamp_start"] = pd.NaT
+    return df
+
+
+def legacy_calculate_total_events_processed(
+    df, timestamp_col="timestamp_start", window_minutes=60
+):
+    """Original groupby/merge implementation."""
+    df = df.copy()
+    df["time_window"] = df[timestamp_col].dt.floor(f"{window_minutes}min")
+    window_counts = (
+        df.groupby("time_window").size().reset_index(name="events_in_window")
+    )
+    df = df.merge(window_counts, on="time_window", how="left")
+    df = df.drop(columns=["time_window"])
+    return df
+
+
+def legacy_calculate_total_anomalous_events(
+    df,
+    timestamp_col="timestamp_start",
+    label_col="label",
+    malicious_label="malicious",
+    window_minutes=60,
+):
+    """Original groupby/merge implementation."""
+    df = df.copy()
+    df["time_window"] = df[timestamp_col].dt.floor(f"{window_minutes}min")
+    malicious_df = df[df[label_col] == malicious_label]
+    malicious_counts = (
+        malicious_df.groupby("time_window")
+        .size()
+        .reset_index(name="malicious_events_in_window")
+    )
+    df = df.merge(malicious_counts, on="time_window", how="left")
+    df = df.drop(columns=["time_window"])
+    return df
+
+
+def legacy_calculate_total_unique_malicious_ips(
+    df,
+    timestamp_col="timestamp_start",
+    source_ip_col="source_ip",
+    label_col="label",
+    malicious_label="malicious",
+    window_minutes=60,
+):
+    """Original groupby/merge implementation."""
+    df = df.copy()
+    df["time_window"] = df[timestamp_col].dt.floor(f"{window_minutes}min")
+    malicious_df = df[df[label_col] == malicious_label]
+    unique_ips = (
+        malicious_df.groupby("time_window")[source_ip_col]
+        .nunique()
+        .reset_index(name="unique_malicious_ips")
+    )
+    df = df.merge(unique_ips, on="time_window", how="left")
+    df["unique_malicious_ips"] = df["unique_malicious_ips"].fillna(0).astype(int)
+    df = df.drop(columns=["time_window"])
+    return df
+
+
+def legacy_calculate_trend_percentage_change(
+    df, timestamp_col="timestamp_start", window_minutes=60
+):
+    """Original groupby/merge implementation."""
+    df = df.copy()
+    df["time_window"] = df[timestamp_col].dt.floor(f"{window_minutes}min")
+    window_stats = df.groupby("time_window")["label"].count().reset_index()
+    window_stats.columns = ["time_window", "events_in_window"]
+    malicious_df = df[df["label"] == "malicious"]
+    malicious_stats = (
+        malicious_df.groupby("time_window")
+        .size()
+        .reset_index(name="malicious_events_in_window")
+    )
+    window_stats = window_stats.merge(malicious_stats, on="time_window", how="left")
+    window_stats["malicious_events_in_window"] = window_stats[
+        "malicious_events_in_window"
+    ].fillna(0)
+    window_stats = window_stats.sort_values("time_window")
+    window_stats["events_pct_change"] = (
+        window_stats["events_in_window"].pct_change() * 100
+    )
+    window_stats["malicious_events_pct_change"] = (
+        window_stats["malicious_events_in_window"].pct_change() * 100
+    )
+    window_stats = window_stats.replace([np.inf, -np.inf], 0)
+    window_stats["events_pct_change"] = window_stats["events_pct_change"].fillna(0)
+    window_stats["malicious_events_pct_change"] = window_stats[
+        "malicious_events_pct_change"
+    ].fillna(0)
+    window_stats["burst_indicator"] = (window_stats["events_pct_change"] > 50).astype(
+        int
+    )
+    df = df.merge(
+        window_stats[
+            [
+                "time_window",
+                "events_pct_change",
+                "malicious_events_pct_change",
+                "burst_indicator",
+            ]
+        ],
+        on="time_window",
+        how="left",
+    )
+    df = df.drop(columns=["time_window"])
+    return df
+
+
+def legacy_calculate_total_events_for_dst_ports(
+    df,
+    timestamp_col="timestamp_start",
+    destination_port_col="destination_port",
+    window_minutes=60,
+):
+    """Original groupby/merge implementation."""
+    df = df.copy()
+    df["time_window"] = df[timestamp_col].dt.floor(f"{window_minutes}min")
+    port_counts = (
+        df.groupby(["time_window", destination_port_col])
+        .size()
+        .reset_index(name="events_to_dst_port")
+    )
+    df = df.merge(port_counts, on=["time_window", destination_port_col], how="left")
+    df["events_to_dst_port"] = df["events_to_dst_port"].fillna(0).astype(int)
+    df = df.drop(columns=["time_window"])
+    return df
+
+
+def legacy_calculate_total_malicious_events_per_protocol(
+    df,
+    timestamp_col="timestamp_start",
+    app_protocol_col="application_protocol",
+    label_col="label",
+    malicious_label="malicious",
+    window_minutes=60,
+):
+    """Original groupby/merge implementation."""
+    df = df.copy()
+    df["time_window"] = df[timestamp_col].dt.floor(f"{window_minutes}min")
+    total_counts = (
+        df.groupby(["time_window", app_protocol_col])
+        .size()
+        .reset_index(name="total_events_for_protocol")
+    )
+    malicious_df = df[df[label_col] == malicious_label]
+    malicious_counts = (
+        malicious_df.groupby(["time_window", app_protocol_col])
+        .size()
+        .reset_index(name="malicious_events_for_protocol")
+    )
+    protocol_stats = total_counts.merge(
+        malicious_counts, on=["time_window", app_protocol_col], how="left"
+    )
+    protocol_stats["malicious_events_for_protocol"] = (
+        protocol_stats["malicious_events_for_protocol"].fillna(0).astype(int)
+    )
+    protocol_stats["malicious_ratio_for_protocol"] = (
+        protocol_stats["malicious_events_for_protocol"]
+        / protocol_stats["total_events_for_protocol"]
+        * 100
+    )
+    df = df.merge(protocol_stats, on=["time_window", app_protocol_col], how="left")
+    df["total_events_for_protocol"] = (
+        df["total_events_for_protocol"].fillna(0).astype(int)
+    )
+    df["malicious_events_for_protocol"] = (
+        df["malicious_events_for_protocol"].fillna(0).astype(int)
+    )
+    df["malicious_ratio_for_protocol"] = df["malicious_ratio_for_protocol"].fillna(0)
+    df = df.drop(columns=["time_window"])
+    return df
+
+
+def legacy_all_aggregation_features(df):
+    df = legacy_calculate_total_events_processed(df)
+    df = legacy_calculate_total_anomalous_events(df)
+    df = legacy_calculate_total_unique_malicious_ips(df)
+    df = legacy_calculate_trend_percentage_change(df)
+    df = legacy_calculate_total_events_for_dst_ports(df)
+    df = legacy_calculate_total_malicious_events_per_protocol(df)
+    return df
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=5_000_000)
+    args = parser.parse_args()
+
+    print(f"Generating {args.rows:,} synthetic traffic rows...")
+    df = make_traffic_df(args.rows)
+
+    t0 = time.perf_counter()
+    legacy = legacy_all_aggregation_features(df)
+    legacy_s = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    engine = calculate_all_aggregation_features(df)
+    engine_s = time.perf_counter() - t0
+
+    pd.testing.assert_frame_equal(engine, legacy)
+
+    print("Outputs identical (values, dtypes and column order)")
+    print(f"groupby/merge chain : {legacy_s:8.2f} s")
+    print(f"window engine       : {engine_s:8.2f} s")
+    print(f"speedup             : {legacy_s / engine_s:8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,271 @@
+"""
+Materialized statistics of the served dataset, backing the /api/stats/* endpoints.
+"""
+
+import threading
+import uuid
+
+import pandas as pd
+
+# Columns whose value counts feed the endpoints
+COUNT_COLUMNS = [
+    "label",
+    "transport_protocol",
+    "source_ip",
+    "destination_ip",
+    "destination_port",
+    "direction",
+    "hour",
+    "day_of_week",
+]
+
+# Columns whose means feed the endpoints
+MEAN_COLUMNS = [
+    "dst_port_is_common",
+    "burst_indicator",
+    "is_business_hours",
+    "is_weekend",
+    "bytes_per_second",
+    "packets_per_second",
+    "duration",
+    "bytes_sent_ratio",
+    "is_internal",
+]
+
+DAY_NAMES = ["Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun"]
+
+INTERNAL_EXTERNAL = {
+    "Internal → Internal": (1, 1),
+    "Internal → External": (1, 0),
+    "External → Internal": (0, 1),
+    "External → External": (0, 0),
+}
+
+
+def _partials(df):
+    """Mergeable aggregates of a frame: value counts, sums and non-null counts."""
+    partials = {
+        "rows": len(df),
+        "counts": {
+            col: df[col].value_counts() for col in COUNT_COLUMNS if col in df.columns
+        },
+        "sums": {
+            col: (float(df[col].sum()), int(df[col].count()))
+            for col in MEAN_COLUMNS
+            if col in df.columns
+        },
+        "internal_external": None,
+    }
+    if "src_is_private" in df.columns and "dst_is_private" in df.columns:
+        partials["internal_external"] = {
+            name: int(
+                ((df["src_is_private"] == src) & (df["dst_is_private"] == dst)).sum()
+            )
+            for name, (src, dst) in INTERNAL_EXTERNAL.items()
+        }
+    return partials
+
+
+def _merge_partials(left, right):
+    counts = dict(left["counts"])
+    for col, series in right["counts"].items():
+        if col in counts:
+            merged = counts[col].add(series, fill_value=0).astype(series.dtype)
+            counts[col] = merged.sort_values(ascending=False, kind="stable")
+        else:
+            counts[col] = series
+
+    sums = dict(left["sums"])
+    for col, (total, count) in right["sums"].items():
+        left_total, left_count = sums.get(col, (0.0, 0))
+        sums[col] = (left_total + total, left_count + count)
+
+    internal_external = left["internal_external"]
+    if right["internal_external"] is not None:
+        internal_external = {
+            name: (internal_external or {}).get(name, 0) + value
+            for name, value in right["internal_external"].items()
+        }
+
+    return {
+        "rows": left["rows"] + right["rows"],
+        "counts": counts,
+        "sums": sums,
+        "internal_external": internal_external,
+    }
+
+
+class DatasetStatistics:
+    """
+    Statistics payloads of the dataset, computed once per dataset version.
+    The aggregates are kept as mergeable partials (value counts, sums and
+    counts), so append() folds new rows in without rescanning the dataset.
+    Every change bumps the version and with it the ETag of the payloads.
+    Attributes:
+        df (DataFrame): The dataset the statistics describe.
+        version (int): Version of the dataset, incremented whenever the data
+            changes (the owner of the dataset can pass its own counter).
+    """
+
+    def __init__(self, df, version=0):
+        self.df = df
+        self.version = version
+        self._instance = uuid.uuid4().hex[:8]
+        self._partials = None
+        self._payloads = {}
+        self._lock = threading.Lock()
+
+    @property
+    def etag(self):
+        """ETag of the current version, unique across restarts."""
+        return f"stats-{self._instance}-{self.version}"
+
+    def append(self, new_rows, df=None):
+        """
+        Fold new rows into the statistics and bump the version.
+        df is the dataset with the new rows when the caller already built it,
+        otherwise the rows are concatenated to self.df.
+        """
+        with self._lock:
+            if df is None:
+                df = pd.concat([self.df, new_rows], ignore_index=True)
+            self.df = df
+            if self._partials is not None:
+                self._partials = _merge_partials(self._partials, _partials(new_rows))
+            self._payloads = {}
+            self.version += 1
+
+    def payload(self, name):
+        """The JSON payload of a stats endpoint: summary, network, temporal, traffic."""
+        with self._lock:
+            if name not in self._payloads:
+                if self._partials is None:
+                    self._partials = _partials(self.df)
+                self._payloads[name] = _BUILDERS[name](self._partials)
+            return self._payloads[name]
+
+
+def _counts(partials, col):
+    return partials["counts"].get(col)
+
+
+def _mean(partials, col):
+    total, count = partials["sums"][col]
+    return total / count if count else float("nan")
+
+
+def _summary_payload(partials):
+    labels = _counts(partials, "label")
+    protocols = _counts(partials, "transport_protocol")
+    source_ips = _counts(partials, "source_ip")
+    ports = _counts(partials, "destination_port")
+    return {
+        "total_records": partials["rows"],
+        "malicious_count": int(labels.get("malicious", 0)) if labels is not None else 0,
+        "benign_count": int(labels.get("benign", 0)) if labels is not None else 0,
+        "protocols": protocols.to_dict() if protocols is not None else {},
+        "top_source_ips": (
+            source_ips.head(10).to_dict() if source_ips is not None else {}
+        ),
+        "top_destination_ports": ports.head(10).to_dict() if ports is not None else {},
+    }
+
+
+def _network_payload(partials):
+    network_data = {
+        "internal_external": {},
+        "top_source_ips": {},
+        "top_dest_ips": {},
+        "top_dest_ports": {},
+        "common_port_ratio": 0,
+        "burst_events": 0,
+        "burst_ratio": 0,
+        "direction_stats": {},
+    }
+
+    if partials["internal_external"] is not None:
+        network_data["internal_external"] = dict(partials["internal_external"])
+
+    if "source_ip" in partials["counts"]:
+        network_data["top_source_ips"] = (
+            _counts(partials, "source_ip").head(10).to_dict()
+        )
+
+    if "destination_ip" in partials["counts"]:
+        network_data["top_dest_ips"] = (
+            _counts(partials, "destination_ip").head(10).to_dict()
+        )
+
+    if "destination_port" in partials["counts"]:
+        port_counts = _counts(partials, "destination_port").head(15)
+        network_data["top_dest_ports"] = {
+            str(int(k)): int(v) for k, v in port_counts.items()
+        }
+
+    if "dst_port_is_common" in partials["sums"]:
+        network_data["common_port_ratio"] = _mean(partials, "dst_port_is_common")
+
+    if "burst_indicator" in partials["sums"]:
+        network_data["burst_events"] = int(partials["sums"]["burst_indicator"][0])
+        network_data["burst_ratio"] = _mean(partials, "burst_indicator")
+
+    if "direction" in partials["counts"]:
+        network_data["direction_stats"] = _counts(partials, "direction").to_dict()
+
+    return network_data
+
+
+def _temporal_payload(partials):
+    temporal_data = {
+        "by_hour": {},
+        "by_day_of_week": {},
+        "business_hours_ratio": 0,
+        "weekend_ratio": 0,
+    }
+
+    if "hour" in partials["counts"]:
+        temporal_data["by_hour"] = _counts(partials, "hour").sort_index().to_dict()
+
+    if "day_of_week" in partials["counts"]:
+        day_counts = _counts(partials, "day_of_week").sort_index()
+        temporal_data["by_day_of_week"] = {
+            DAY_NAMES[int(i)]: int(count) for i, count in day_counts.items()
+        }
+
+    if "is_business_hours" in partials["sums"]:
+        temporal_data["business_hours_ratio"] = _mean(partials, "is_business_hours")
+
+    if "is_weekend" in partials["sums"]:
+        temporal_data["weekend_ratio"] = _mean(partials, "is_weekend")
+
+    return temporal_data
+
+
+def _traffic_payload(partials):
+    traffic_data = {
+        "avg_bytes_per_second": 0,
+        "avg_packets_per_second": 0,
+        "avg_duration": 0,
+        "bytes_sent_ratio_avg": 0,
+        "internal_traffic_ratio": 0,
+    }
+    fields = {
+        "avg_bytes_per_second": "bytes_per_second",
+        "avg_packets_per_second": "packets_per_second",
+        "avg_duration": "duration",
+        "bytes_sent_ratio_avg": "bytes_sent_ratio",
+        "internal_traffic_ratio": "is_internal",
+    }
+    for field, col in fields.items():
+        if col in partials["sums"]:
+            traffic_data[field] = _mean(partials, col)
+
+    return traffic_data
+
+
+_BUILDERS = {
+    "summary": _summary_payload,
+    "network": _network_payload,
+    "temporal": _temporal_payload,
+    "traffic": _traffic_payload,
+}
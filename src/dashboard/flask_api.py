@@ -5,6 +5,7 @@ Also exposes Prometheus metrics endpoint for Grafana monitoring.
 """
 
 import sys
+import threading
 import time
 from datetime import datetime, timedelta
 from functools import wraps
@@ -20,7 +21,12 @@ project_root = Path(__file__).resolve().parents[2]
 if str(project_root) not in sys.path:
     sys.path.insert(0, str(project_root))
 
+from src.dashboard.dataset_statistics import DatasetStatistics  # noqa: E402
 from src.dashboard.geolocation_service import get_geo_service  # noqa: E402
+from src.dashboard.ip_summary import SourceIPSummary  # noqa: E402
+from src.feature_engineering.df_formatting.dataset_cache import (  # noqa: E402
+    load_csv_with_cache,
+)
 from src.model.drift_detector import DriftDetector  # noqa: E402
 from src.model.oneCSVM_model import OneClassSVMModel  # noqa: E402
 
@@ -39,6 +45,14 @@ try:
 except ImportError:
     METRICS_ENABLED = False
 
+# orjson is optional - Flask's jsonify is used if it is not installed
+try:
+    import orjson
+
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 app = Flask(__name__)
 CORS(app)
 
@@ -46,8 +60,15 @@ CORS(app)
 model = None
 df_logs = None
 drift_detector = None
+ip_summary = None  # Per source IP aggregates of df_logs
+dataset_stats = None  # Materialized /api/stats/* payloads of df_logs
+logs_version = 0  # Incremented whenever df_logs changes
+logs_lock = threading.Lock()  # Serializes changes of df_logs
 current_index = 0  # Simulates real-time log streaming
 
+# Alert severities, most severe first; anything else ranks as UNKNOWN
+SEVERITY_ORDER = ["RED", "ORANGE", "GREEN", "UNKNOWN"]
+
 
 def track_request_metrics(f):
     """Decorator to track API request metrics for Prometheus."""
@@ -80,7 +101,7 @@ def track_request_metrics(f):
 
 def load_resources():
     """Load the ML model and dataset on startup."""
-    global model, df_logs, drift_detector
+    global model, df_logs, drift_detector, ip_summary, dataset_stats, logs_version
 
     # Initialize drift detector (lower threshold = more sensitive)
     drift_detector = DriftDetector(threshold=0.002, window_size=100)
@@ -98,7 +119,8 @@ def load_resources():
     # Load the processed dataset
     data_path = project_root / "data" / "processed" / "combined_shuffled_dataset.csv"
     if data_path.exists():
-        df_logs = pd.read_csv(data_path)
+        # Memory-mapped Feather sidecar, parsed from the CSV only on first start
+        df_logs = load_csv_with_cache(data_path)
         # Shuffle for simulation variety
         df_logs = df_logs.sample(frac=1, random_state=42).reset_index(drop=True)
         if METRICS_ENABLED:
@@ -108,6 +130,56 @@ def load_resources():
         if METRICS_ENABLED:
             dataset_size_gauge.set(0)
 
+    logs_version += 1
+    ip_summary = SourceIPSummary(df_logs)
+    dataset_stats = DatasetStatistics(df_logs, version=logs_version)
+
+
+def append_logs(new_rows):
+    """
+    Add processed log rows to df_logs.
+    The materialized statistics and the source IP summary fold the new rows in
+    instead of being rebuilt.
+    """
+    global df_logs, logs_version
+    with logs_lock:
+        stats_current = dataset_stats is not None and (
+            dataset_stats.version == logs_version
+        )
+        if df_logs is None or df_logs.empty:
+            df_logs = new_rows.reset_index(drop=True)
+        else:
+            df_logs = pd.concat([df_logs, new_rows], ignore_index=True)
+        logs_version += 1
+        if stats_current:
+            dataset_stats.append(new_rows, df=df_logs)
+        if ip_summary is not None:
+            ip_summary.update(new_rows)
+        if METRICS_ENABLED:
+            dataset_size_gauge.set(len(df_logs))
+
+
+def stats_response(name):
+    """
+    Serve a materialized stats payload with an ETag.
+    A request whose If-None-Match carries the current ETag gets a 304 without
+    touching the data. The statistics are only rebuilt when they missed a
+    change of df_logs, i.e. their version is behind logs_version.
+    """
+    global dataset_stats
+    with logs_lock:
+        if dataset_stats is None or dataset_stats.version != logs_version:
+            dataset_stats = DatasetStatistics(df_logs, version=logs_version)
+        stats = dataset_stats
+
+    etag = stats.etag
+    if request.if_none_match.contains(etag):
+        response = Response(status=304)
+    else:
+        response = jsonify(stats.payload(name))
+    response.set_etag(etag)
+    return response
+
 
 @app.route("/metrics", methods=["GET"])
 def prometheus_metrics():
@@ -174,18 +246,18 @@ def stream_logs():
         try:
             # Prepare data for prediction
             X_pred = batch.drop(columns=model.features_to_drop, errors="ignore")
-            predictions = model.predict(X_pred)
+            predictions = model.predict_batch(X_pred)
 
-            batch["severity"] = [p[0] for p in predictions]
-            batch["description"] = [p[1] for p in predictions]
-            batch["anomaly_score"] = [p[2] for p in predictions]
+            batch["severity"] = predictions["severity"]
+            batch["description"] = predictions["description"]
+            batch["anomaly_score"] = predictions["anomaly_score"]
 
             # Update drift detector with each prediction
             # The drift detector handles all Prometheus metrics internally
             if drift_detector is not None:
-                for severity in batch["severity"]:
-                    is_anomaly = severity in ["RED", "ORANGE"]
-                    drift_detector.update(is_anomaly)
+                drift_detector.update_many(
+                    predictions["severity"].isin(["RED", "ORANGE"]).to_numpy()
+                )
         except Exception:
             batch["severity"] = "UNKNOWN"
             batch["description"] = "Prediction failed"
@@ -215,6 +287,30 @@ def stream_logs():
     )
 
 
+@app.route("/api/logs/append", methods=["POST"])
+@track_request_metrics
+def ingest_logs():
+    """
+    Add processed log records (a JSON list of objects) to the served dataset,
+    e.g. from a live capture.
+    """
+    records = request.get_json(silent=True)
+    if not isinstance(records, list) or not all(
+        isinstance(record, dict) for record in records
+    ):
+        return jsonify({"error": "Expected a JSON list of log records"}), 400
+
+    if records:
+        append_logs(pd.DataFrame.from_records(records))
+
+    return jsonify(
+        {
+            "appended": len(records),
+            "total_records": len(df_logs) if df_logs is not None else 0,
+        }
+    )
+
+
 @app.route("/api/logs/reset", methods=["POST"])
 def reset_stream():
     """Reset the log stream and drift detector to the beginning."""
@@ -236,36 +332,7 @@ def get_summary_stats():
     if df_logs is None or df_logs.empty:
         return jsonify({"error": "No data available"}), 500
 
-    stats = {
-        "total_records": len(df_logs),
-        "malicious_count": (
-            int((df_logs["label"] == "malicious").sum())
-            if "label" in df_logs.columns
-            else 0
-        ),
-        "benign_count": (
-            int((df_logs["label"] == "benign").sum())
-            if "label" in df_logs.columns
-            else 0
-        ),
-        "protocols": (
-            df_logs["transport_protocol"].value_counts().to_dict()
-            if "transport_protocol" in df_logs.columns
-            else {}
-        ),
-        "top_source_ips": (
-            df_logs["source_ip"].value_counts().head(10).to_dict()
-            if "source_ip" in df_logs.columns
-            else {}
-        ),
-        "top_destination_ports": (
-            df_logs["destination_port"].value_counts().head(10).to_dict()
-            if "destination_port" in df_logs.columns
-            else {}
-        ),
-    }
-
-    return jsonify(stats)
+    return stats_response("summary")
 
 
 @app.route("/api/stats/network", methods=["GET"])
@@ -274,72 +341,7 @@ def get_network_stats():
     if df_logs is None or df_logs.empty:
         return jsonify({"error": "No data available"}), 500
 
-    network_data = {
-        "internal_external": {},
-        "top_source_ips": {},
-        "top_dest_ips": {},
-        "top_dest_ports": {},
-        "common_port_ratio": 0,
-        "burst_events": 0,
-        "burst_ratio": 0,
-        "direction_stats": {},
-    }
-
-    # Internal vs External traffic analysis
-    if all(col in df_logs.columns for col in ["src_is_private", "dst_is_private"]):
-        internal_internal = int(
-            ((df_logs["src_is_private"] == 1) & (df_logs["dst_is_private"] == 1)).sum()
-        )
-        internal_external = int(
-            ((df_logs["src_is_private"] == 1) & (df_logs["dst_is_private"] == 0)).sum()
-        )
-        external_internal = int(
-            ((df_logs["src_is_private"] == 0) & (df_logs["dst_is_private"] == 1)).sum()
-        )
-        external_external = int(
-            ((df_logs["src_is_private"] == 0) & (df_logs["dst_is_private"] == 0)).sum()
-        )
-
-        network_data["internal_external"] = {
-            "Internal → Internal": internal_internal,
-            "Internal → External": internal_external,
-            "External → Internal": external_internal,
-            "External → External": external_external,
-        }
-
-    # Top source IPs
-    if "source_ip" in df_logs.columns:
-        network_data["top_source_ips"] = (
-            df_logs["source_ip"].value_counts().head(10).to_dict()
-        )
-
-    # Top destination IPs
-    if "destination_ip" in df_logs.columns:
-        network_data["top_dest_ips"] = (
-            df_logs["destination_ip"].value_counts().head(10).to_dict()
-        )
-
-    # Top destination ports
-    if "destination_port" in df_logs.columns:
-        port_counts = df_logs["destination_port"].value_counts().head(15)
-        network_data["top_dest_ports"] = {
-            str(int(k)): int(v) for k, v in port_counts.items()
-        }
-
-    # Common port ratio
-    if "dst_port_is_common" in df_logs.columns:
-        network_data["common_port_ratio"] = float(df_logs["dst_port_is_common"].mean())
-
-    # Burst indicator analysis
-    if "burst_indicator" in df_logs.columns:
-        network_data["burst_events"] = int(df_logs["burst_indicator"].sum())
-        network_data["burst_ratio"] = float(df_logs["burst_indicator"].mean())
-
-    # Direction statistics
-    if "direction" in df_logs.columns:
-        network_data["direction_stats"] = df_logs["direction"].value_counts().to_dict()
-
-    return jsonify(network_data)
+    return stats_response("network")
 
 
 @app.route("/api/stats/geolocation", methods=["GET"])
@@ -348,46 +350,22 @@ def get_geolocation_stats():
     if df_logs is None or df_logs.empty:
         return jsonify({"error": "No data available"}), 500
 
-    geo_service = get_geo_service()
-
-    # Get unique source IPs (limit for performance)
-    unique_ips = df_logs["source_ip"].dropna().unique()[:200]
-
-    geo_points = []
-    country_counts = {}
+    global ip_summary
+    if ip_summary is None:
+        ip_summary = SourceIPSummary(df_logs)
 
-    for ip in unique_ips:
-        location = geo_service.get_location(str(ip))
-        if location and location.get("latitude") and location.get("longitude"):
-            # Get label for this IP (malicious if any record is malicious)
-            ip_records = df_logs[df_logs["source_ip"] == ip]
-            label = (
-                "malicious" if (ip_records["label"] == "malicious").any() else "benign"
-            )
-
-            geo_points.append(
-                {
-                    "ip": str(ip),
-                    "lat": location["latitude"],
-                    "lon": location["longitude"],
-                    "country": location["country"],
-                    "city": location.get("city", "Unknown"),
-                    "label": label,
-                }
-            )
+    geo_service = get_geo_service()
 
-            # Count by country
-            country = location["country"]
-            if country and country != "Private":
-                country_counts[country] = country_counts.get(country, 0) + 1
+    # Unresolved IPs are looked up in the background, the request only
+    # serves the points located so far
+    ip_summary.resolve_in_background(geo_service)
 
     return jsonify(
         {
-            "geo_points": geo_points,
-            "country_stats": dict(
-                sorted(country_counts.items(), key=lambda x: x[1], reverse=True)[:20]
-            ),
+            "geo_points": ip_summary.geo_points(),
+            "country_stats": ip_summary.country_counts(top=20),
             "cached_ips": geo_service.get_cached_count(),
+            "pending_ips": ip_summary.pending_count(),
         }
     )
 
@@ -398,32 +376,7 @@ def get_temporal_stats():
     if df_logs is None or df_logs.empty:
         return jsonify({"error": "No data available"}), 500
 
-    temporal_data = {
-        "by_hour": {},
-        "by_day_of_week": {},
-        "business_hours_ratio": 0,
-        "weekend_ratio": 0,
-    }
-
-    if "hour" in df_logs.columns:
-        temporal_data["by_hour"] = df_logs["hour"].value_counts().sort_index().to_dict()
-
-    if "day_of_week" in df_logs.columns:
-        day_names = ["Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun"]
-        day_counts = df_logs["day_of_week"].value_counts().sort_index()
-        temporal_data["by_day_of_week"] = {
-            day_names[i]: int(count) for i, count in day_counts.items()
-        }
-
-    if "is_business_hours" in df_logs.columns:
-        temporal_data["business_hours_ratio"] = float(
-            df_logs["is_business_hours"].mean()
-        )
-
-    if "is_weekend" in df_logs.columns:
-        temporal_data["weekend_ratio"] = float(df_logs["is_weekend"].mean())
-
-    return jsonify(temporal_data)
+    return stats_response("temporal")
 
 
 @app.route("/api/stats/traffic", methods=["GET"])
@@ -432,32 +385,7 @@ def get_traffic_stats():
     if df_logs is None or df_logs.empty:
         return jsonify({"error": "No data available"}), 500
 
-    traffic_data = {
-        "avg_bytes_per_second": 0,
-        "avg_packets_per_second": 0,
-        "avg_duration": 0,
-        "bytes_sent_ratio_avg": 0,
-        "internal_traffic_ratio": 0,
-    }
-
-    if "bytes_per_second" in df_logs.columns:
-        traffic_data["avg_bytes_per_second"] = float(df_logs["bytes_per_second"].mean())
-
-    if "packets_per_second" in df_logs.columns:
-        traffic_data["avg_packets_per_second"] = float(
-            df_logs["packets_per_second"].mean()
-        )
-
-    if "duration" in df_logs.columns:
-        traffic_data["avg_duration"] = float(df_logs["duration"].mean())
-
-    if "bytes_sent_ratio" in df_logs.columns:
-        traffic_data["bytes_sent_ratio_avg"] = float(df_logs["bytes_sent_ratio"].mean())
-
-    if "is_internal" in df_logs.columns:
-        traffic_data["internal_traffic_ratio"] = float(df_logs["is_internal"].mean())
-
-    return jsonify(traffic_data)
+    return stats_response("traffic")
 
 
 @app.route("/api/alerts/recent", methods=["GET"])
@@ -471,58 +399,105 @@ def get_recent_alerts():
         return jsonify({"error": "No data available"}), 500
 
     # Get a sample of logs
-    sample = df_logs.sample(n=min(window_size, len(df_logs)), random_state=None).copy()
+    sample = df_logs.sample(n=min(window_size, len(df_logs)), random_state=None)
 
     # Make predictions
-    alerts = []
+    payload = build_alerts_payload(sample, [], severity_filter)
     if model is not None and model.model_exists():
         try:
             X_pred = sample.drop(columns=model.features_to_drop, errors="ignore")
-            predictions = model.predict(X_pred)
-
-            for i, (row_idx, row) in enumerate(sample.iterrows()):
-                severity, desc, score = predictions[i]
-
-                # Apply severity filter
-                if severity_filter and severity != severity_filter:
-                    continue
-
-                alerts.append(
-                    {
-                        "id": int(row_idx),
-                        "timestamp": datetime.now().isoformat(),
-                        "source_ip": row.get("source_ip", "N/A"),
-                        "destination_ip": row.get("destination_ip", "N/A"),
-                        "destination_port": int(row.get("destination_port", 0)),
-                        "protocol": row.get("transport_protocol", "N/A"),
-                        "severity": severity,
-                        "description": desc,
-                        "anomaly_score": float(score),
-                        "label": row.get("label", "unknown"),
-                        "bytes_sent": int(row.get("bytes_sent", 0)),
-                        "packets_sent": int(row.get("pkts_sent", 0)),
-                        "country": row.get("src_country", "Unknown"),
-                    }
-                )
+            predictions = model.predict_batch(X_pred)
+            payload = build_alerts_payload(sample, predictions, severity_filter)
         except Exception as e:
             print(f"[ERROR] Prediction failed: {e}")
             import traceback
 
             traceback.print_exc()
 
-    # Sort by severity (RED first)
-    severity_order = {"RED": 0, "ORANGE": 1, "GREEN": 2, "UNKNOWN": 3}
-    alerts.sort(key=lambda x: severity_order.get(x["severity"], 3))
+    return json_response(payload)
 
-    return jsonify(
-        {
-            "alerts": alerts,
-            "total_count": len(alerts),
-            "red_count": sum(1 for a in alerts if a["severity"] == "RED"),
-            "orange_count": sum(1 for a in alerts if a["severity"] == "ORANGE"),
-            "green_count": sum(1 for a in alerts if a["severity"] == "GREEN"),
-        }
-    )
+
+def json_response(payload):
+    """JSON response, encoded with orjson when it is installed."""
+    if ORJSON_AVAILABLE:
+        return Response(orjson.dumps(payload), mimetype="application/json")
+    return jsonify(payload)
+
+
+def _alert_column(sample, col, default, dtype=None):
+    """Column of the sample as a list of Python values, default if missing."""
+    if col not in sample.columns:
+        return [default] * len(sample)
+    values = sample[col]
+    if dtype is not None:
+        return values.fillna(0).astype(dtype).tolist()
+    values = values.astype(object)
+    return values.where(values.notna(), None).tolist()
+
+
+def build_alerts_payload(sample, predictions, severity_filter=None):
+    """
+    Alerts of the sampled rows, most severe first, built column-wise.
+    predictions holds one (severity, description, score) per row of sample,
+    either as tuples or as the columns of OneClassSVMModel.predict_batch.
+    Rows are filtered by severity before any column is materialized.
+    """
+    if isinstance(predictions, pd.DataFrame):
+        severities, descriptions, scores = (
+            predictions[col].to_numpy(dtype=object)
+            for col in ("severity", "description", "anomaly_score")
+        )
+        if not len(predictions):
+            sample = sample.iloc[:0]
+    elif len(predictions):
+        severities, descriptions, scores = (
+            np.asarray(values, dtype=object) for values in zip(*predictions)
+        )
+    else:
+        severities = descriptions = scores = np.empty(0, dtype=object)
+        sample = sample.iloc[:0]
+
+    if severity_filter:
+        keep = severities == severity_filter
+        sample = sample[keep]
+        severities, descriptions, scores = (
+            severities[keep],
+            descriptions[keep],
+            scores[keep],
+        )
+
+    rank = pd.Index(SEVERITY_ORDER).get_indexer(severities)
+    rank[rank < 0] = SEVERITY_ORDER.index("UNKNOWN")
+    counts = np.bincount(rank, minlength=len(SEVERITY_ORDER))
+
+    # Stable sort keeps the sample order within a severity
+    order = np.argsort(rank, kind="stable")
+    sample = sample.iloc[order]
+
+    columns = {
+        "id": sample.index.astype(int).tolist(),
+        "timestamp": [datetime.now().isoformat()] * len(sample),
+        "source_ip": _alert_column(sample, "source_ip", "N/A"),
+        "destination_ip": _alert_column(sample, "destination_ip", "N/A"),
+        "destination_port": _alert_column(sample, "destination_port", 0, int),
+        "protocol": _alert_column(sample, "transport_protocol", "N/A"),
+        "severity": severities[order].tolist(),
+        "description": descriptions[order].tolist(),
+        "anomaly_score": scores[order].astype(float).tolist(),
+        "label": _alert_column(sample, "label", "unknown"),
+        "bytes_sent": _alert_column(sample, "bytes_sent", 0, int),
+        "packets_sent": _alert_column(sample, "pkts_sent", 0, int),
+        "country": _alert_column(sample, "src_country", "Unknown"),
+    }
+    alerts = [dict(zip(columns, values)) for values in zip(*columns.values())]
+
+    return {
+        "alerts": alerts,
+        "total_count": len(alerts),
+        "red_count": int(counts[SEVERITY_ORDER.index("RED")]),
+        "orange_count": int(counts[SEVERITY_ORDER.index("ORANGE")]),
+        "green_count": int(counts[SEVERITY_ORDER.index("GREEN")]),
+    }
 
 
 @app.route("/api/evaluate", methods=["POST"])
@@ -554,10 +529,10 @@ def evaluate_model():
 
         # Make predictions
         X_pred = sample.drop(columns=model.features_to_drop, errors="ignore")
-        predictions = model.predict(X_pred)
+        predictions = model.predict_batch(X_pred)
 
         # Convert predictions to binary (RED/ORANGE = anomaly = 1, GREEN = normal = 0)
-        y_pred = [1 if p[0] in ["RED", "ORANGE"] else 0 for p in predictions]
+        y_pred = predictions["severity"].isin(["RED", "ORANGE"]).astype(int).values
 
         # Calculate metrics
         precision = precision_score(y_true, y_pred, zero_division=0)
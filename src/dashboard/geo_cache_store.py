@@ -0,0 +1,160 @@
+"""
+SQLite backed geolocation cache.
+Records are stored as JSON in a WAL mode database, so the Flask API and the
+offline feature pipeline can read and append to the same file concurrently.
+"""
+
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import MutableMapping
+from pathlib import Path
+from typing import Dict, Iterator, Optional
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS geo_cache (
+    ip TEXT PRIMARY KEY,
+    record TEXT NOT NULL,
+    updated_at REAL NOT NULL
+) WITHOUT ROWID
+"""
+
+
+class SQLiteGeoCache(MutableMapping):
+    """
+    Geolocation cache mapping IP -> record, persisted in SQLite.
+    Every write is appended to the database immediately, so there is no
+    file to rewrite. Recently used records are kept in an in-memory LRU layer
+    in front of the database. len() and iteration include stale records.
+    Attributes:
+        path (Path): SQLite database file.
+        max_memory_entries (int): Size of the in-memory LRU layer.
+        ttl (float): Seconds after which a record is stale and treated as
+            missing, None to keep records forever.
+    """
+
+    def __init__(self, path, max_memory_entries: int = 10_000, ttl=None):
+        self.path = Path(path)
+        self.max_memory_entries = max_memory_entries
+        self.ttl = ttl
+        self._memory: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        # Connections of every thread, closed together by close()
+        self._connections = []
+        self._generation = 0
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self._connection() as conn:
+            conn.execute(_SCHEMA)
+
+    def _connection(self) -> sqlite3.Connection:
+        """Connection of the calling thread, opened on first use."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None or self._local.generation != self._generation:
+            # Only used by this thread, but close() may run on another one
+            conn = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            with self._lock:
+                self._connections.append(conn)
+                self._local.generation = self._generation
+            self._local.conn = conn
+        return conn
+
+    def _is_fresh(self, updated_at: float) -> bool:
+        return self.ttl is None or time.time() - updated_at < self.ttl
+
+    def _remember(self, ip: str, record: Dict, updated_at: float):
+        with self._lock:
+            self._memory[ip] = (record, updated_at)
+            self._memory.move_to_end(ip)
+            while len(self._memory) > self.max_memory_entries:
+                self._memory.popitem(last=False)
+
+    def get_entry(self, ip: str) -> Optional[tuple]:
+        """(record, updated_at) of a fresh entry, None if missing or stale."""
+        with self._lock:
+            entry = self._memory.get(ip)
+            if entry is not None:
+                self._memory.move_to_end(ip)
+        if entry is None:
+            row = (
+                self._connection()
+                .execute("SELECT record, updated_at FROM geo_cache WHERE ip = ?", (ip,))
+                .fetchone()
+            )
+            if row is None:
+                return None
+            entry = (json.loads(row[0]), row[1])
+            self._remember(ip, *entry)
+        return entry if self._is_fresh(entry[1]) else None
+
+    def __getitem__(self, ip: str) -> Dict:
+        entry = self.get_entry(ip)
+        if entry is None:
+            raise KeyError(ip)
+        return entry[0]
+
+    def __contains__(self, ip) -> bool:
+        return isinstance(ip, str) and self.get_entry(ip) is not None
+
+    def __setitem__(self, ip: str, record: Dict):
+        updated_at = time.time()
+        conn = self._connection()
+        with conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO geo_cache VALUES (?, ?, ?)",
+                (ip, json.dumps(record), updated_at),
+            )
+        self._remember(ip, record, updated_at)
+
+    def __delitem__(self, ip: str):
+        conn = self._connection()
+        with conn:
+            deleted = conn.execute("DELETE FROM geo_cache WHERE ip = ?", (ip,))
+        with self._lock:
+            self._memory.pop(ip, None)
+        if deleted.rowcount == 0:
+            raise KeyError(ip)
+
+    def __iter__(self) -> Iterator[str]:
+        rows = self._connection().execute("SELECT ip FROM geo_cache").fetchall()
+        return (ip for (ip,) in rows)
+
+    def __len__(self) -> int:
+        return (
+            self._connection().execute("SELECT COUNT(*) FROM geo_cache").fetchone()[0]
+        )
+
+    def update_many(self, records: Dict[str, Dict]):
+        """Append many records in a single transaction."""
+        updated_at = time.time()
+        conn = self._connection()
+        with conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO geo_cache VALUES (?, ?, ?)",
+                (
+                    (ip, json.dumps(record), updated_at)
+                    for ip, record in records.items()
+                ),
+            )
+        with self._lock:
+            self._memory.clear()
+
+    def import_json(self, json_path) -> int:
+        """Import a legacy geo_cache.json file, returns the number of records."""
+        with open(json_path, "r") as f:
+            records = json.load(f)
+        self.update_many(records)
+        return len(records)
+
+    def close(self):
+        """Close the connections of every thread, later calls open new ones."""
+        with self._lock:
+            connections, self._connections = self._connections, []
+            self._generation += 1
+        for conn in connections:
+            conn.close()
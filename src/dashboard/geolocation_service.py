@@ -5,10 +5,17 @@ Falls back to ipwho.is API if database not available.
 
 import ipaddress
 import json
+import sqlite3
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
 from pathlib import Path
-from typing import Dict, Optional
+from typing import Callable, Dict, Iterable, MutableMapping, Optional
 
 import requests
+from requests.adapters import HTTPAdapter
+
+from src.dashboard.geo_cache_store import SQLiteGeoCache
 
 # Try to import geoip2, fallback to API if not available
 try:
@@ -20,13 +27,130 @@ except ImportError:
     GEOIP2_AVAILABLE = False
 
 
-class GeolocationService:
-    """Service for IP geolocation with caching."""
+DEFAULT_API_URL = "https://ipwho.is/{ip}"
+DEFAULT_CACHE_FILE = Path(__file__).parent / "geo_cache.sqlite"
+# Cache format used before the SQLite backend, imported on first use
+LEGACY_CACHE_FILE = Path(__file__).parent / "geo_cache.json"
+
+
+def ip_type(ip: str) -> Optional[str]:
+    """IPv4 or IPv6, None for an invalid address."""
+    try:
+        return f"IPv{ipaddress.ip_address(ip).version}"
+    except ValueError:
+        return None
+
+
+def ipwhois_record(ip: str, data: Dict) -> Dict:
+    """Service record from a successful ipwho.is response."""
+    connection = data.get("connection")
+    return {
+        "ip": ip,
+        "type": data.get("type"),
+        "continent": data.get("continent"),
+        "country": data.get("country", "Unknown"),
+        "country_code": data.get("country_code", "XX"),
+        "region": data.get("region"),
+        "city": data.get("city", "Unknown"),
+        "latitude": data.get("latitude"),
+        "longitude": data.get("longitude"),
+        "isp": connection.get("isp") if isinstance(connection, dict) else None,
+        "source": "api",
+    }
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket rate limiter.
+    Attributes:
+        rate (float): Tokens added per second, None for no limit.
+        capacity (float): Maximum number of tokens, i.e. the allowed burst.
+    """
+
+    def __init__(self, rate: Optional[float], capacity: Optional[float] = None):
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(rate or 1.0, 1.0)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """Block until a token is available and take it."""
+        if self.rate is None:
+            return
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(
+                    self.capacity, self._tokens + (now - self._updated) * self.rate
+                )
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+
+class _RemoteLookupState:
+    """Pooled session, rate limiter, negative cache and in-flight lookups."""
+
+    def __init__(self, max_workers: int, requests_per_second: Optional[float]):
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=max_workers)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self.rate_limiter = TokenBucket(requests_per_second)
+        self.negative: Dict[str, float] = {}
+        self.inflight: Dict[str, Future] = {}
+        self.lock = threading.Lock()
 
-    def __init__(self):
-        self.cache: Dict[str, Dict] = {}
-        self.cache_file = Path(__file__).parent / "geo_cache.json"
+
+_REMOTE_STATE_LOCK = threading.Lock()
+
+
+class GeolocationService:
+    """
+    Service for IP geolocation with caching.
+    Cache misses of get_locations_batch are fetched from the API concurrently
+    through a pooled session and a token bucket rate limiter. Failed lookups
+    are remembered for negative_ttl seconds, and concurrent lookups of the
+    same IP share a single request.
+    Attributes:
+        api_url (str): Lookup URL template with an {ip} placeholder.
+        cache_file (Path): SQLite database the cache is persisted to, or a
+            ".json" file for the legacy whole-file JSON cache.
+        max_workers (int): Concurrent API requests of a batch.
+        requests_per_second (float): API rate limit, None for no limit.
+        negative_ttl (float): Seconds a failed lookup is not retried.
+        cache_ttl (float): Seconds after which a cached record is refetched,
+            None to keep records forever (SQLite cache only).
+    """
+
+    # Class level defaults, so instances created without __init__ still work
+    api_url = DEFAULT_API_URL
+    max_workers = 8
+    requests_per_second = 10.0
+    negative_ttl = 3600.0
+    cache_ttl = None
+
+    def __init__(
+        self,
+        api_url: str = DEFAULT_API_URL,
+        cache_file=None,
+        max_workers: int = 8,
+        requests_per_second: Optional[float] = 10.0,
+        negative_ttl: float = 3600.0,
+        cache_ttl: Optional[float] = None,
+    ):
+        self.cache: MutableMapping = {}
+        self.cache_file = Path(cache_file) if cache_file is not None else None
         self.geoip_reader = None
+        self.api_url = api_url
+        self.max_workers = max_workers
+        self.requests_per_second = requests_per_second
+        self.negative_ttl = negative_ttl
+        self.cache_ttl = cache_ttl
 
         # Try to load GeoLite2 database
         self._init_geoip_database()
@@ -34,6 +158,19 @@ class GeolocationService:
         # Load existing cache
         self._load_cache()
 
+    def _remote_state(self) -> _RemoteLookupState:
+        """State of the API lookups, created on first use."""
+        state = self.__dict__.get("_remote")
+        if state is None:
+            with _REMOTE_STATE_LOCK:
+                state = self.__dict__.get("_remote")
+                if state is None:
+                    state = _RemoteLookupState(
+                        self.max_workers, self.requests_per_second
+                    )
+                    self._remote = state
+        return state
+
     def _init_geoip_database(self):
         """Initialize GeoIP2 database reader."""
         if not GEOIP2_AVAILABLE:
@@ -57,21 +194,53 @@ class GeolocationService:
 
     def _load_cache(self):
         """Load cached geolocation data."""
-        if self.cache_file.exists():
+        if self.cache_file is None:
+            self.cache_file = DEFAULT_CACHE_FILE
+            self._open_sqlite_cache(legacy_json=LEGACY_CACHE_FILE)
+        elif self.cache_file.suffix != ".json":
+            self._open_sqlite_cache()
+        elif self.cache_file.exists():
             try:
                 with open(self.cache_file, "r") as f:
                     self.cache = json.load(f)
             except Exception:
                 self.cache = {}
 
+    def _open_sqlite_cache(self, legacy_json=None):
+        """Use the SQLite cache, importing legacy_json into it when empty."""
+        try:
+            self.cache = SQLiteGeoCache(self.cache_file, ttl=self.cache_ttl)
+        except sqlite3.Error as e:
+            print(f"Warning: geolocation cache unavailable, using memory: {e}")
+            self.cache = {}
+            return
+
+        if legacy_json is not None and legacy_json.exists() and not len(self.cache):
+            try:
+                self.cache.import_json(legacy_json)
+            except (OSError, ValueError) as e:
+                print(f"Warning: could not import {legacy_json}: {e}")
+
     def _save_cache(self):
         """Save geolocation cache to disk."""
+        if isinstance(self.cache, SQLiteGeoCache):
+            # Every entry is already written through to the database
+            return
         try:
             with open(self.cache_file, "w") as f:
                 json.dump(self.cache, f)
         except Exception:
             pass
 
+    def flush(self):
+        """Persist the cache, a no-op for SQLite which writes every record through."""
+        self._save_cache()
+
+    def cached_location(self, ip: str) -> Optional[Dict]:
+        """Cached record of an IP, None if missing or stale."""
+        # A single get: with a TTL the record may expire between two calls
+        return self.cache.get(ip)
+
     def _is_private_ip(self, ip: str) -> bool:
         """Check if IP is private/internal."""
         try:
@@ -89,11 +258,15 @@ class GeolocationService:
             response = self.geoip_reader.city(ip)
             return {
                 "ip": ip,
+                "type": ip_type(ip),
+                "continent": response.continent.name,
                 "country": response.country.name or "Unknown",
                 "country_code": response.country.iso_code or "XX",
+                "region": response.subdivisions.most_specific.name,
                 "city": response.city.name or "Unknown",
                 "latitude": response.location.latitude,
                 "longitude": response.location.longitude,
+                "isp": None,
                 "source": "geoip2",
             }
         except geoip2.errors.AddressNotFoundError:
@@ -101,32 +274,32 @@ class GeolocationService:
         except Exception:
             return None
 
-    def _lookup_api(self, ip: str) -> Optional[Dict]:
+    def _lookup_api(self, ip: str, session=None) -> Optional[Dict]:
         """Lookup IP using ipwho.is API (fallback)."""
+        get = session.get if session is not None else requests.get
         try:
-            response = requests.get(f"https://ipwho.is/{ip}", timeout=5)
+            response = get(self.api_url.format(ip=ip), timeout=5)
             if response.status_code == 200:
                 data = response.json()
                 if data.get("success", False):
-                    return {
-                        "ip": ip,
-                        "country": data.get("country", "Unknown"),
-                        "country_code": data.get("country_code", "XX"),
-                        "city": data.get("city", "Unknown"),
-                        "latitude": data.get("latitude"),
-                        "longitude": data.get("longitude"),
-                        "source": "api",
-                    }
+                    return ipwhois_record(ip, data)
         except Exception:
             pass
         return None
 
-    def get_location(self, ip: str) -> Optional[Dict]:
-        """Get geolocation for an IP address."""
+    def _lookup_local(self, ip: str) -> Optional[Dict]:
+        """Cache, private address and GeoIP2 lookup, None if the API is needed."""
         # Check cache first
-        if ip in self.cache:
-            return self.cache[ip]
+        result = self.cached_location(ip)
+        if result is not None:
+            return result
+        return self.lookup_offline(ip)
 
+    def lookup_offline(self, ip: str) -> Optional[Dict]:
+        """
+        Private address or GeoIP2 record of an IP, added to the cache.
+        The cache itself is not read. None if only the API can resolve the IP.
+        """
         # Skip private IPs
         if self._is_private_ip(ip):
             result = {
@@ -141,32 +314,125 @@ class GeolocationService:
             self.cache[ip] = result
             return result
 
-        # Try GeoIP2 first (fast, offline)
+        # Try GeoIP2 (fast, offline)
         result = self._lookup_geoip2(ip)
+        if result:
+            self.cache[ip] = result
+        return result
+
+    def fetch_remote(
+        self,
+        ip: str,
+        fetch: Optional[Callable] = None,
+        rate_limiter: Optional[TokenBucket] = None,
+    ) -> Optional[Dict]:
+        """
+        Fetch one IP from the API, caching the record or the failure.
+        fetch(ip, session) returns a record or None and defaults to
+        _lookup_api. A lookup of an IP already in flight waits for that
+        request instead of sending another one.
+        """
+        state = self._remote_state()
+        with state.lock:
+            cached = self.cache.get(ip)
+            if cached is not None:
+                return cached
+            expiry = state.negative.get(ip)
+            if expiry is not None and expiry > time.monotonic():
+                return None
+            future = state.inflight.get(ip)
+            owner = future is None
+            if owner:
+                future = state.inflight[ip] = Future()
+        if not owner:
+            return future.result()
+
+        try:
+            (rate_limiter or state.rate_limiter).acquire()
+            if fetch is None:
+                result = self._lookup_api(ip, state.session)
+            else:
+                result = fetch(ip, state.session)
+            with state.lock:
+                if result is None:
+                    state.negative[ip] = time.monotonic() + self.negative_ttl
+                else:
+                    state.negative.pop(ip, None)
+                    self.cache[ip] = result
+            future.set_result(result)
+            return result
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with state.lock:
+                state.inflight.pop(ip, None)
+
+    def fetch_remote_many(
+        self,
+        ips: Iterable[str],
+        fetch: Optional[Callable] = None,
+        rate_limiter: Optional[TokenBucket] = None,
+        on_done: Optional[Callable] = None,
+    ) -> Dict[str, Optional[Dict]]:
+        """Fetch distinct IPs concurrently with fetch_remote, on_done(ip) after each."""
+        ips = list(dict.fromkeys(ips))
+        results = {}
+        if not ips:
+            return results
+
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(ips))) as pool:
+            futures = {
+                pool.submit(self.fetch_remote, ip, fetch, rate_limiter): ip
+                for ip in ips
+            }
+            for future in as_completed(futures):
+                ip = futures[future]
+                results[ip] = future.result()
+                if on_done:
+                    on_done(ip)
+        return results
+
+    def get_location(self, ip: str) -> Optional[Dict]:
+        """Get geolocation for an IP address."""
+        result = self._lookup_local(ip)
 
         # Fallback to API
         if result is None:
-            result = self._lookup_api(ip)
-
-        # Cache result
-        if result:
-            self.cache[ip] = result
-            # Periodically save cache
-            if len(self.cache) % 100 == 0:
+            result = self.fetch_remote(ip)
+
+            # Periodically save the JSON cache (SQLite writes every record
+            # through, and len() would cost a COUNT(*) per lookup)
+            if (
+                result
+                and not isinstance(self.cache, SQLiteGeoCache)
+                and len(self.cache) % 100 == 0
+            ):
                 self._save_cache()
 
         return result
 
     def get_locations_batch(self, ips: list, progress_callback=None) -> Dict[str, Dict]:
-        """Get geolocation for multiple IPs."""
+        """Get geolocation for multiple IPs, fetching cache misses concurrently."""
         results = {}
         total = len(ips)
+        done = 0
+
+        def report(_ip=None):
+            nonlocal done
+            if progress_callback and done % 50 == 0:
+                progress_callback(done, total)
+            done += 1
 
-        for i, ip in enumerate(ips):
-            results[ip] = self.get_location(ip)
+        misses = []
+        for ip in ips:
+            results[ip] = self._lookup_local(ip)
+            if results[ip] is None:
+                misses.append(ip)
+            else:
+                report()
 
-            if progress_callback and i % 50 == 0:
-                progress_callback(i, total)
+        results.update(self.fetch_remote_many(misses, on_done=report))
 
         # Save cache after batch
         self._save_cache()
@@ -178,9 +444,14 @@ class GeolocationService:
         return len(self.cache)
 
     def close(self):
-        """Close database reader."""
+        """Close database reader, the API session and the cache."""
         if self.geoip_reader:
             self.geoip_reader.close()
+        if isinstance(self.cache, SQLiteGeoCache):
+            self.cache.close()
+        state = self.__dict__.get("_remote")
+        if state is not None:
+            state.session.close()
 
 
 # Singleton instance
@@ -0,0 +1,266 @@
+"""
+Per source IP summary of the served logs, backing the geolocation endpoint.
+"""
+
+import sys
+import threading
+from pathlib import Path
+from typing import Dict, List
+
+import numpy as np
+import pandas as pd
+
+# Add project root to path
+project_root = Path(__file__).resolve().parents[2]
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
+
+from src.feature_engineering.precalculations_functions import (  # noqa: E402
+    parse_timestamps,
+)
+
+LOCATION_FIELDS = ["latitude", "longitude", "country", "city"]
+
+
+class SourceIPSummary:
+    """
+    Aggregates of every source IP: event count, whether any event was
+    malicious, first/last seen timestamps and the resolved location.
+    Built once from the loaded logs and updated incrementally with update()
+    as rows are appended to them, so requests never scan the logs. Locations
+    are looked up off the request path by resolve_in_background().
+    Attributes:
+        ip_col (str): Source IP column.
+        label_col (str): Label column.
+        timestamp_col (str): Timestamp column for first/last seen.
+        malicious_label (str): Label value of malicious events.
+        table (DataFrame): One row per source IP, indexed by IP.
+    """
+
+    def __init__(
+        self,
+        df=None,
+        ip_col="source_ip",
+        label_col="label",
+        timestamp_col="timestamp_start",
+        malicious_label="malicious",
+    ):
+        self.ip_col = ip_col
+        self.label_col = label_col
+        self.timestamp_col = timestamp_col
+        self.malicious_label = malicious_label
+        self.table = self._empty_table()
+        self._lock = threading.Lock()
+        # geo_points() result, dropped whenever the table changes
+        self._points = None
+        # Bumped on every table change, so a stale geo_points() is not cached
+        self._version = 0
+        # Thread running resolve_in_background(), None when idle
+        self._resolver = None
+        if df is not None:
+            self.update(df)
+
+    @staticmethod
+    def _empty_table():
+        table = pd.DataFrame(
+            {
+                "count": pd.Series(dtype=np.int64),
+                "malicious": pd.Series(dtype=bool),
+                "first_seen": pd.Series(dtype="datetime64[ns]"),
+                "last_seen": pd.Series(dtype="datetime64[ns]"),
+                "latitude": pd.Series(dtype=float),
+                "longitude": pd.Series(dtype=float),
+                "country": pd.Series(dtype=object),
+                "city": pd.Series(dtype=object),
+                "resolved": pd.Series(dtype=bool),
+            }
+        )
+        table.index.name = "ip"
+        return table
+
+    def _aggregate(self, df):
+        """Per IP aggregates of one batch of logs."""
+        ips = df[self.ip_col]
+        valid = ips.notna().to_numpy()
+        frame = pd.DataFrame({"ip": ips[valid].astype(str).to_numpy()})
+        if self.label_col in df.columns:
+            is_malicious = df[self.label_col] == self.malicious_label
+            frame["malicious"] = is_malicious.to_numpy(dtype=bool)[valid]
+        else:
+            frame["malicious"] = False
+        if self.timestamp_col in df.columns:
+            timestamps = df[self.timestamp_col]
+            if not pd.api.types.is_datetime64_any_dtype(timestamps):
+                timestamps = parse_timestamps(timestamps.astype(object))
+            if timestamps.dt.tz is not None:
+                timestamps = timestamps.dt.tz_convert("UTC").dt.tz_localize(None)
+            frame["timestamp"] = timestamps.to_numpy(dtype="datetime64[ns]")[valid]
+        else:
+            frame["timestamp"] = pd.NaT
+
+        grouped = frame.groupby("ip", sort=False)
+        return pd.DataFrame(
+            {
+                "count": grouped.size(),
+                "malicious": grouped["malicious"].any(),
+                "first_seen": grouped["timestamp"].min(),
+                "last_seen": grouped["timestamp"].max(),
+            }
+        )
+
+    def update(self, df):
+        """Add a batch of logs to the summary."""
+        if df is None or df.empty or self.ip_col not in df.columns:
+            return
+        batch = self._aggregate(df)
+
+        with self._lock:
+            table = self.table
+            known = batch.index.isin(table.index)
+
+            seen = batch[known]
+            if len(seen):
+                current = table.loc[seen.index]
+                table.loc[seen.index, "count"] = current["count"] + seen["count"]
+                table.loc[seen.index, "malicious"] = (
+                    current["malicious"] | seen["malicious"]
+                )
+                # fmin/fmax skip NaT
+                table.loc[seen.index, "first_seen"] = np.fmin(
+                    current["first_seen"].to_numpy(), seen["first_seen"].to_numpy()
+                )
+                table.loc[seen.index, "last_seen"] = np.fmax(
+                    current["last_seen"].to_numpy(), seen["last_seen"].to_numpy()
+                )
+
+            new = batch[~known]
+            if len(new):
+                new = new.reindex(columns=table.columns)
+                new["resolved"] = False
+                new = new.astype(table.dtypes.to_dict())
+                table = new if table.empty else pd.concat([table, new])
+                table.index.name = "ip"
+            self.table = table
+            self._changed()
+
+    def pending_count(self) -> int:
+        """Number of IPs whose location has not been looked up yet."""
+        with self._lock:
+            return int((~self.table["resolved"]).sum())
+
+    def resolve_locations(self, geo_service, limit=None) -> int:
+        """
+        Look up the location of the IPs not resolved yet, at most limit of
+        them. Returns the number of IPs looked up.
+        """
+        with self._lock:
+            pending = self.table.index[~self.table["resolved"]][:limit].tolist()
+        if not pending:
+            return 0
+
+        locations = geo_service.get_locations_batch(pending)
+        rows = {
+            field: [(locations.get(ip) or {}).get(field) for ip in pending]
+            for field in LOCATION_FIELDS
+        }
+
+        with self._lock:
+            for field in ("latitude", "longitude"):
+                self.table.loc[pending, field] = pd.to_numeric(
+                    pd.Series(rows[field], dtype=object), errors="coerce"
+                ).to_numpy(dtype=float)
+            for field in ("country", "city"):
+                self.table.loc[pending, field] = pd.Series(
+                    rows[field], index=pending, dtype=object
+                )
+            self.table.loc[pending, "resolved"] = True
+            self._changed()
+        return len(pending)
+
+    def resolve_in_background(self, geo_service, chunk_size=200) -> bool:
+        """
+        Resolve the pending IPs in a daemon thread, chunk_size IPs at a time
+        so located points are served as they arrive. Does nothing if a
+        resolver is already running or nothing is pending. Returns True when
+        a resolver was started.
+        """
+        with self._lock:
+            if self._resolver is not None and self._resolver.is_alive():
+                return False
+            if self.table["resolved"].all():
+                return False
+            self._resolver = threading.Thread(
+                target=self._resolve_all,
+                args=(geo_service, chunk_size),
+                name="ip-summary-resolver",
+                daemon=True,
+            )
+            self._resolver.start()
+        return True
+
+    def _resolve_all(self, geo_service, chunk_size):
+        try:
+            while self.resolve_locations(geo_service, limit=chunk_size):
+                pass
+        except Exception as e:
+            print(f"Warning: Geolocation resolution stopped: {e}")
+
+    def wait_resolved(self, timeout=None) -> bool:
+        """Wait for the background resolver, True if none is running."""
+        resolver = self._resolver
+        if resolver is not None:
+            resolver.join(timeout)
+        return resolver is None or not resolver.is_alive()
+
+    def _changed(self):
+        # Called with the lock held after the table changed
+        self._version += 1
+        self._points = None
+
+    def _located(self):
+        """Rows with a non zero latitude and longitude."""
+        table = self.table
+        has_location = (table["latitude"].fillna(0).to_numpy() != 0) & (
+            table["longitude"].fillna(0).to_numpy() != 0
+        )
+        return table[has_location]
+
+    def geo_points(self) -> List[Dict]:
+        """Map points of every located IP."""
+        with self._lock:
+            if self._points is not None:
+                return self._points
+            located = self._located()
+            version = self._version
+
+        def iso(values):
+            strings = np.datetime_as_string(values.to_numpy(), unit="s")
+            return np.where(values.isna(), None, strings)
+
+        points = pd.DataFrame(
+            {
+                "ip": located.index.to_numpy(dtype=object),
+                "lat": located["latitude"].to_numpy(),
+                "lon": located["longitude"].to_numpy(),
+                "country": located["country"].to_numpy(dtype=object),
+                "city": located["city"].fillna("Unknown").to_numpy(dtype=object),
+                "label": np.where(located["malicious"], "malicious", "benign"),
+                "count": located["count"].to_numpy(),
+                "first_seen": iso(located["first_seen"]),
+                "last_seen": iso(located["last_seen"]),
+            }
+        ).to_dict(orient="records")
+
+        with self._lock:
+            if self._version == version:
+                self._points = points
+        return points
+
+    def country_counts(self, top=20) -> Dict[str, int]:
+        """Number of located IPs per country, most frequent first."""
+        with self._lock:
+            located = self._located()
+        countries = located["country"]
+        countries = countries[countries.notna() & (countries != "Private")]
+        counts = countries.value_counts().head(top)
+        return {country: int(count) for country, count in counts.items()}
@@ -234,12 +234,33 @@ st.markdown(
 )
 
 
+@st.cache_resource
+def _etag_cache():
+    """
+    Last (ETag, data) of each request, revalidated with If-None-Match.
+    Held as a cached resource so it survives the st.rerun() refreshes, which
+    re-execute this script and would reset a module-level dict.
+    """
+    return {}
+
+
 def fetch_api(endpoint, params=None):
     """Fetch data from Flask API."""
+    etag_cache = _etag_cache()
+    key = (endpoint, tuple(sorted((params or {}).items())))
+    cached = etag_cache.get(key)
+    headers = {"If-None-Match": cached[0]} if cached else None
     try:
-        response = requests.get(f"{API_BASE_URL}{endpoint}", params=params, timeout=30)
+        response = requests.get(
+            f"{API_BASE_URL}{endpoint}", params=params, headers=headers, timeout=30
+        )
+        if response.status_code == 304 and cached:
+            return cached[1]
         response.raise_for_status()
-        return response.json()
+        data = response.json()
+        if response.headers.get("ETag"):
+            etag_cache[key] = (response.headers["ETag"], data)
+        return data
     except requests.exceptions.RequestException as e:
         return None
 
@@ -449,6 +470,9 @@ def render_geolocation_map(geo_data):
         return
 
     points = geo_data["geo_points"]
+    pending = geo_data.get("pending_ips", 0)
+    if pending:
+        st.caption(f"Locating {pending} more source IPs in the background...")
     if not points:
         st.info("No geolocation points available")
         return
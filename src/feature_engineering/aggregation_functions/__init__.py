@@ -5,6 +5,7 @@ Feature engineering functions for network traffic anomaly detection.
 """
 
 from .metrics_features import (
+    calculate_all_aggregation_features,
     calculate_total_anomalous_events,
     calculate_total_events_for_dst_ports,
     calculate_total_events_processed,
@@ -12,12 +13,15 @@ from .metrics_features import (
     calculate_total_unique_malicious_ips,
     calculate_trend_percentage_change,
 )
+from .window_engine import WindowAggregator
 
 __all__ = [
+    "calculate_all_aggregation_features",
     "calculate_total_events_processed",
     "calculate_total_anomalous_events",
     "calculate_total_unique_malicious_ips",
     "calculate_trend_percentage_change",
     "calculate_total_events_for_dst_ports",
     "calculate_total_malicious_events_per_protocol",
+    "WindowAggregator",
 ]
@@ -0,0 +1,158 @@
+import numpy as np
+import pandas as pd
+
+
+class WindowAggregator:
+    """
+    Shared time window grouping for the metrics features.
+    The window of each row is floored and factorized once; every statistic is
+    then a bincount over integer codes, broadcast back to the rows by
+    indexing, instead of a groupby and merge per feature.
+    Rows without a window (NaT timestamp) get NaN or 0 exactly like the
+    groupby/merge implementation did.
+    Attributes:
+        df (DataFrame): Traffic with a datetime timestamp column.
+        timestamp_col (str): Column the windows are computed from.
+        window_minutes (int): Window length in minutes.
+    """
+
+    def __init__(self, df, timestamp_col="timestamp_start", window_minutes=60):
+        self.df = df
+        window = df[timestamp_col].dt.floor(f"{window_minutes}min")
+        # sort=True keeps the window codes in chronological order
+        self.window_codes, windows = pd.factorize(window, sort=True)
+        self.n_windows = len(windows)
+        self.has_window = self.window_codes >= 0
+        self._value_codes = {}
+        self._malicious_masks = {}
+
+    @staticmethod
+    def _broadcast(per_group, codes, valid, fill):
+        """Per-group values to per-row values, fill where the row has no group."""
+        if valid.all():
+            return per_group[codes]
+        dtype = np.result_type(per_group.dtype, np.asarray(fill).dtype)
+        result = np.full(len(codes), fill, dtype=dtype)
+        result[valid] = per_group[codes[valid]]
+        return result
+
+    def _window_counts(self, mask=None):
+        valid = self.has_window if mask is None else self.has_window & mask
+        return np.bincount(self.window_codes[valid], minlength=self.n_windows)
+
+    def _malicious_mask(self, label_col, malicious_label):
+        key = (label_col, malicious_label)
+        if key not in self._malicious_masks:
+            is_malicious = self.df[label_col] == malicious_label
+            self._malicious_masks[key] = is_malicious.fillna(False).to_numpy(dtype=bool)
+        return self._malicious_masks[key]
+
+    def _codes(self, col):
+        """Factorized codes of a column (-1 for missing) and the number of values."""
+        if col not in self._value_codes:
+            codes, uniques = pd.factorize(self.df[col])
+            self._value_codes[col] = (codes, len(uniques))
+        return self._value_codes[col]
+
+    def _pair_codes(self, col):
+        """Codes of the (window, value) pairs, -1 where either is missing."""
+        value_codes, n_values = self._codes(col)
+        valid = self.has_window & (value_codes >= 0)
+        keys = self.window_codes.astype(np.int64) * n_values + value_codes
+        pair_codes = np.full(len(keys), -1, dtype=np.intp)
+        pair_codes[valid], pairs = pd.factorize(keys[valid])
+        return pair_codes, len(pairs), valid
+
+    def events_in_window(self):
+        return self._broadcast(
+            self._window_counts(), self.window_codes, self.has_window, np.nan
+        )
+
+    def malicious_events_in_window(
+        self, label_col="label", malicious_label="malicious"
+    ):
+        # Windows without malicious events are NaN (they were missing from the merge)
+        counts = self._window_counts(self._malicious_mask(label_col, malicious_label))
+        per_window = np.where(counts > 0, counts, np.nan)
+        result = self._broadcast(per_window, self.window_codes, self.has_window, np.nan)
+        if not np.isnan(result).any():
+            result = result.astype(np.int64)
+        return result
+
+    def unique_malicious_ips(
+        self, source_ip_col="source_ip", label_col="label", malicious_label="malicious"
+    ):
+        ip_codes, n_ips = self._codes(source_ip_col)
+        valid = (
+            self.has_window
+            & (ip_codes >= 0)
+            & self._malicious_mask(label_col, malicious_label)
+        )
+        keys = self.window_codes[valid].astype(np.int64) * n_ips + ip_codes[valid]
+        distinct_keys = pd.unique(keys)
+        counts = np.bincount(distinct_keys // max(n_ips, 1), minlength=self.n_windows)
+        return self._broadcast(counts, self.window_codes, self.has_window, 0)
+
+    def trend_percentage_change(self, label_col="label", malicious_label="malicious"):
+        """
+        events_pct_change, malicious_events_pct_change and burst_indicator of
+        each row's window against the previous window present in the data.
+        """
+        labelled = self.df[label_col].notna().to_numpy()
+        events = self._window_counts(labelled)
+        malicious = self._window_counts(
+            self._malicious_mask(label_col, malicious_label)
+        ).astype(float)
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            events_pct = np.full(self.n_windows, np.nan)
+            events_pct[1:] = (events[1:] / events[:-1] - 1) * 100
+            malicious_pct = np.full(self.n_windows, np.nan)
+            malicious_pct[1:] = (malicious[1:] / malicious[:-1] - 1) * 100
+
+        # Division by zero (inf) and first window / 0 over 0 (NaN) become 0
+        events_pct[~np.isfinite(events_pct)] = 0
+        malicious_pct[~np.isfinite(malicious_pct)] = 0
+        burst = (events_pct > 50).astype(np.int64)
+
+        return {
+            name: self._broadcast(
+                per_window, self.window_codes, self.has_window, np.nan
+            )
+            for name, per_window in (
+                ("events_pct_change", events_pct),
+                ("malicious_events_pct_change", malicious_pct),
+                ("burst_indicator", burst),
+            )
+        }
+
+    def events_to_dst_port(self, destination_port_col="destination_port"):
+        pair_codes, n_pairs, valid = self._pair_codes(destination_port_col)
+        counts = np.bincount(pair_codes[valid], minlength=n_pairs)
+        return self._broadcast(counts, pair_codes, valid, 0)
+
+    def malicious_events_per_protocol(
+        self,
+        app_protocol_col="application_protocol",
+        label_col="label",
+        malicious_label="malicious",
+    ):
+        """
+        total_events_for_protocol, malicious_events_for_protocol and
+        malicious_ratio_for_protocol of each row's (window, protocol) pair.
+        """
+        pair_codes, n_pairs, valid = self._pair_codes(app_protocol_col)
+        malicious = valid & self._malicious_mask(label_col, malicious_label)
+        total = np.bincount(pair_codes[valid], minlength=n_pairs)
+        malicious_total = np.bincount(pair_codes[malicious], minlength=n_pairs)
+        ratio = malicious_total / total * 100
+
+        return {
+            "total_events_for_protocol": self._broadcast(total, pair_codes, valid, 0),
+            "malicious_events_for_protocol": self._broadcast(
+                malicious_total, pair_codes, valid, 0
+            ),
+            "malicious_ratio_for_protocol": self._broadcast(
+                ratio, pair_codes, valid, 0.0
+            ),
+        }
@@ -0,0 +1,178 @@
+import hashlib
+import json
+import os
+from pathlib import Path
+
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.feather as feather
+
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+# Bump whenever formatting or feature code changes the produced columns/values
+FEATURE_CODE_VERSION = "1"
+
+# Low-cardinality string columns stored as categoricals in the Feather files,
+# read back as object columns
+CATEGORICAL_COLUMNS = [
+    "transport_protocol",
+    "application_protocol",
+    "direction",
+    "label",
+]
+
+HASH_BLOCK_SIZE = 1 << 20
+
+
+def hash_files(paths):
+    """Content hash of the given files, in order."""
+    digest = hashlib.sha256()
+    for path in paths:
+        with open(path, "rb") as f:
+            while block := f.read(HASH_BLOCK_SIZE):
+                digest.update(block)
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+def apply_cache_dtypes(df):
+    """Cast the low-cardinality string columns to categoricals."""
+    categorical = {
+        col: "category"
+        for col in CATEGORICAL_COLUMNS
+        if col in df.columns and df[col].dtype == object
+    }
+    return df.astype(categorical) if categorical else df
+
+
+def restore_dtypes(df):
+    """Cast the categoricals written by apply_cache_dtypes back to object."""
+    restored = {
+        col: object
+        for col in CATEGORICAL_COLUMNS
+        if col in df.columns and isinstance(df[col].dtype, pd.CategoricalDtype)
+    }
+    return df.astype(restored) if restored else df
+
+
+def write_feather(df, path):
+    """
+    Atomically write df as an uncompressed Feather (Arrow IPC) file, which can
+    be memory-mapped when read back.
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(path.name + ".tmp")
+    table = pa.Table.from_pandas(
+        apply_cache_dtypes(df).reset_index(drop=True), preserve_index=False
+    )
+    feather.write_feather(table, tmp_path, compression="uncompressed")
+    os.replace(tmp_path, path)
+
+
+def read_feather(path):
+    """
+    Read a Feather file memory-mapped. The categorical string columns are
+    returned as object columns, so readers see the dtypes of the source data.
+    """
+    return restore_dtypes(feather.read_table(str(path), memory_map=True).to_pandas())
+
+
+def to_arrow_ipc(df):
+    """Serialize df as Arrow IPC stream bytes (index dropped)."""
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue().to_pybytes()
+
+
+def from_arrow_ipc(payload):
+    """DataFrame from to_arrow_ipc bytes."""
+    return pa.ipc.open_stream(payload).read_all().to_pandas()
+
+
+class FormattedDatasetCache:
+    """
+    Feather cache of formatted datasets.
+    Entries are keyed by the content hash of the input logs, the formatting
+    parameters and FEATURE_CODE_VERSION, so a change in any of them misses.
+    Attributes:
+        cache_dir (str): Directory holding the cached Feather files.
+        input_paths (list): Paths of the raw logs the datasets are built from.
+        params (dict): Extra parameters affecting the output (e.g. sample_size).
+    """
+
+    def __init__(self, cache_dir, input_paths, **params):
+        self.cache_dir = Path(cache_dir)
+        self.input_paths = [str(path) for path in input_paths]
+        self.params = params
+        self._key = None
+
+    @property
+    def key(self):
+        if self._key is None:
+            digest = hashlib.sha256()
+            digest.update(hash_files(self.input_paths).encode())
+            digest.update(FEATURE_CODE_VERSION.encode())
+            digest.update(json.dumps(self.params, sort_keys=True).encode())
+            self._key = digest.hexdigest()[:16]
+        return self._key
+
+    def path(self, name):
+        return self.cache_dir / f"{name}-{self.key}.feather"
+
+    def load(self, name):
+        """Return the cached DataFrame, or None on a miss."""
+        if not PYARROW_AVAILABLE or not self.path(name).exists():
+            return None
+        return read_feather(self.path(name))
+
+    def save(self, name, df):
+        if not PYARROW_AVAILABLE:
+            print("Warning: pyarrow not installed, dataset cache disabled")
+            return
+        write_feather(df, self.path(name))
+
+
+def csv_cache_path(csv_path):
+    """Feather sidecar of a CSV, keyed by its size, mtime and FEATURE_CODE_VERSION."""
+    csv_path = Path(csv_path)
+    stat = os.stat(csv_path)
+    digest = hashlib.sha256(
+        f"{stat.st_size}:{stat.st_mtime_ns}:{FEATURE_CODE_VERSION}".encode()
+    ).hexdigest()[:16]
+    return csv_path.parent / ".cache" / f"{csv_path.stem}-{digest}.feather"
+
+
+def load_csv_with_cache(csv_path):
+    """
+    Load a processed CSV through its Feather sidecar.
+    The first load parses the CSV and writes the sidecar, later loads read it
+    memory-mapped with the parsed dtypes. Falls back to pd.read_csv whenever
+    the cache cannot be used.
+    """
+    if not PYARROW_AVAILABLE:
+        return pd.read_csv(csv_path)
+
+    try:
+        cache_path = csv_cache_path(csv_path)
+    except OSError:
+        return pd.read_csv(csv_path)
+
+    if cache_path.exists():
+        try:
+            return read_feather(cache_path)
+        except (OSError, pa.ArrowException) as e:
+            print(f"Warning: unreadable dataset cache {cache_path}: {e}")
+
+    df = pd.read_csv(csv_path)
+    try:
+        write_feather(df, cache_path)
+    except (OSError, ValueError, TypeError, pa.ArrowException) as e:
+        print(f"Warning: could not write dataset cache {cache_path}: {e}")
+    return df
@@ -1,11 +1,43 @@
+import numpy as np
 import pandas as pd
 
+# Suricata flow counters mapped to the unified schema
+FLOW_COUNTER_FIELDS = {
+    "bytes_toserver": "bytes_sent",
+    "bytes_toclient": "bytes_received",
+    "pkts_toserver": "pkts_sent",
+    "pkts_toclient": "pkts_received",
+}
+
+# Suricata eve.json timestamp format, e.g. 2025-10-24T02:44:06.405778+0000
+SURICATA_TIMESTAMP_FORMAT = "%Y-%m-%dT%H:%M:%S.%f%z"
+
+
+def parse_suricata_timestamps(values):
+    """
+    Parse a Series of Suricata timestamps to UTC datetimes.
+
+    Uses the explicit eve.json format as fast path and falls back to generic
+    ISO-8601 parsing for the values that do not match it. Unparseable values
+    become NaT.
+    """
+    parsed = pd.to_datetime(
+        values, format=SURICATA_TIMESTAMP_FORMAT, errors="coerce", utc=True
+    )
+    retry = parsed.isna() & values.notna()
+    if retry.any():
+        parsed[retry] = pd.to_datetime(
+            values[retry], format="ISO8601", errors="coerce", utc=True
+        )
+    return parsed
+
 
 class DataFrameFormatterSuricata:
 
     def __init__(self, suricata_df, list_of_features_to_rename: list):
         self.suricata_df = suricata_df
         self.list_of_features_to_rename = list_of_features_to_rename
+        self.duration_parse_failures = 0
 
     def format_suricata_df(self):
         # Create a copy to work with
@@ -102,43 +134,46 @@ class DataFrameFormatterSuricata:
     def _extract_flow_data(self, df):
         """Extract nested flow data and calculate derived features"""
 
-        # Initialize new columns with default values
-        df["bytes_sent"] = 0
-        df["bytes_received"] = 0
-        df["pkts_sent"] = 0
-        df["pkts_received"] = 0
-        df["duration"] = 0.0
-        df["flow_start"] = None
-
-        # Process each row
-        for idx, row in df.iterrows():
-            flow_data = row.get("flow")
-
-            # Skip if flow data is NaN or None
-            if pd.isna(flow_data) or flow_data is None:
-                continue
-
-            try:
-                # Extract bytes and packets
-                bytes_toserver = flow_data.get("bytes_toserver", 0)
-                bytes_toclient = flow_data.get("bytes_toclient", 0)
-                pkts_toserver = flow_data.get("pkts_toserver", 0)
-                pkts_toclient = flow_data.get("pkts_toclient", 0)
+        n_rows = len(df)
+
+        # Default values for rows without flow data
+        counters = {
+            column: np.zeros(n_rows, dtype="int64")
+            for column in FLOW_COUNTER_FIELDS.values()
+        }
+        flow_start = np.full(n_rows, None, dtype=object)
+
+        flows = df["flow"] if "flow" in df.columns else None
+        if flows is not None:
+            # Only dict entries carry flow data (NaN/None are skipped)
+            has_flow = np.fromiter(
+                (isinstance(flow, dict) for flow in flows), dtype=bool, count=n_rows
+            )
+
+            if has_flow.any():
+                # Normalize all flow dicts into columns in a single pass
+                flow_df = pd.DataFrame(
+                    flows[has_flow].tolist(),
+                    columns=[*FLOW_COUNTER_FIELDS, "start"],
+                )
 
                 # toserver = sent (from client), toclient = received
-                df.at[idx, "bytes_sent"] = bytes_toserver
-                df.at[idx, "bytes_received"] = bytes_toclient
-                df.at[idx, "pkts_sent"] = pkts_toserver
-                df.at[idx, "pkts_received"] = pkts_toclient
+                for field, column in FLOW_COUNTER_FIELDS.items():
+                    counters[column][has_flow] = (
+                        pd.to_numeric(flow_df[field], errors="coerce")
+                        .fillna(0)
+                        .to_numpy(dtype="int64")
+                    )
 
                 # Extract flow start time for duration calculation
-                flow_start = flow_data.get("start")
-                if flow_start:
-                    df.at[idx, "flow_start"] = flow_start
+                starts = flow_df["start"].to_numpy(dtype=object)
+                valid_start = pd.notna(starts) & (starts != "")
+                flow_start[np.flatnonzero(has_flow)[valid_start]] = starts[valid_start]
 
-            except Exception as e:
-                print(f"Error processing flow data at index {idx}: {e}")
-                continue
+        for column, values in counters.items():
+            df[column] = values
+        df["duration"] = 0.0
+        df["flow_start"] = flow_start
 
         # Calculate duration (timestamp - flow.start)
         df = self._calculate_duration(df)
@@ -148,24 +183,25 @@ class DataFrameFormatterSuricata:
     def _calculate_duration(self, df):
         """Calculate duration as difference between timestamp and flow.start"""
 
-        for idx, row in df.iterrows():
-            try:
-                # Get main timestamp
-                main_timestamp = row.get("timestamp")
-                flow_start = row.get("flow_start")
-
-                if pd.notna(main_timestamp) and pd.notna(flow_start):
-                    # Convert to datetime objects
-                    main_dt = pd.to_datetime(main_timestamp)
-                    flow_dt = pd.to_datetime(flow_start)
-
-                    # Calculate duration in seconds
-                    duration = (main_dt - flow_dt).total_seconds()
-                    df.at[idx, "duration"] = max(0, duration)  # Ensure non-negative
-
-            except Exception as e:
-                print(f"Error calculating duration at index {idx}: {e}")
-                df.at[idx, "duration"] = 0.0
+        main_raw = df["timestamp"] if "timestamp" in df.columns else None
+        if main_raw is not None and "flow_start" in df.columns:
+            # Parse both columns once (vectorized) instead of per row
+            main_dt = parse_suricata_timestamps(main_raw)
+            flow_dt = parse_suricata_timestamps(df["flow_start"])
+
+            # Rows where both values exist but at least one failed to parse
+            both_present = main_raw.notna() & df["flow_start"].notna()
+            failed = both_present & (main_dt.isna() | flow_dt.isna())
+            self.duration_parse_failures = int(failed.sum())
+            if self.duration_parse_failures:
+                print(
+                    f"Warning: could not parse timestamps for "
+                    f"{self.duration_parse_failures} events, duration set to 0"
+                )
+
+            # Calculate duration in seconds, ensure non-negative
+            duration = (main_dt - flow_dt).dt.total_seconds()
+            df["duration"] = duration.clip(lower=0).fillna(0.0).to_numpy()
 
         # Clean up temporary column
         if "flow_start" in df.columns:
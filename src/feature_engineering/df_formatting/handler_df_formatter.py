@@ -1,4 +1,7 @@
+import multiprocessing
+import os
 import sys
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
 import pandas as pd
@@ -9,12 +12,13 @@ if str(project_root) not in sys.path:
     sys.path.insert(0, str(project_root))
 
 from src.feature_engineering.aggregation_functions import (
-    calculate_total_anomalous_events,
-    calculate_total_events_for_dst_ports,
-    calculate_total_events_processed,
-    calculate_total_malicious_events_per_protocol,
-    calculate_total_unique_malicious_ips,
-    calculate_trend_percentage_change,
+    calculate_all_aggregation_features,
+)
+from src.feature_engineering.df_formatting.dataset_cache import (
+    PYARROW_AVAILABLE,
+    FormattedDatasetCache,
+    from_arrow_ipc,
+    to_arrow_ipc,
 )
 from src.feature_engineering.df_formatting.format_normal_traffic_df import (
     DataFrameFormatterNormalTraffic,
@@ -22,6 +26,7 @@ from src.feature_engineering.df_formatting.format_normal_traffic_df import (
 from src.feature_engineering.df_formatting.format_suricata_df import (
     DataFrameFormatterSuricata,
 )
+from src.feature_engineering.df_initializing import DataFrameInitializer
 from src.feature_engineering.precalculations_functions import (
     calculate_dst_ip_geolocation_features,
     calculate_ip_classification_features,
@@ -30,33 +35,140 @@ from src.feature_engineering.precalculations_functions import (
     calculate_ratio_features,
     calculate_src_ip_geolocation_features,
     calculate_temporal_features,
+    calculate_traffic_totals,
 )
 
+BASE_FEATURES = [
+    "source_ip",
+    "destination_ip",
+    "source_port",
+    "destination_port",
+    "timestamp_start",
+    "transport_protocol",
+    "application_protocol",
+    "duration",
+    "bytes_sent",
+    "bytes_received",
+    "pkts_sent",
+    "pkts_received",
+    "direction",
+    "label",
+]
+
+# Columns added by apply_aggregations, all computed per time window
+AGGREGATION_FEATURES = [
+    "events_in_window",
+    "malicious_events_in_window",
+    "unique_malicious_ips",
+    "events_pct_change",
+    "malicious_events_pct_change",
+    "burst_indicator",
+    "events_to_dst_port",
+    "total_events_for_protocol",
+    "malicious_events_for_protocol",
+    "malicious_ratio_for_protocol",
+]
+
+# Raw frames of the running parallel format, inherited by forked workers
+_WORKER_SOURCES = {}
+
+
+def _format_chunk(task):
+    """Format and precalculate rows [start, stop) of a source, as Arrow IPC bytes."""
+    source, start, stop = task
+    chunk = _WORKER_SOURCES[source].iloc[start:stop]
+    return to_arrow_ipc(format_and_precalculate(source, chunk))
+
+
+def format_and_precalculate(source, df):
+    """Format a raw "suricata" or "normal_traffic" frame and add precalculations."""
+    if source == "suricata":
+        formatted = DataFrameFormatterSuricata(
+            df, list(BASE_FEATURES)
+        ).format_suricata_df()
+    else:
+        formatted = DataFrameFormatterNormalTraffic(
+            df, list(BASE_FEATURES)
+        ).format_normal_traffic_df()
+    return apply_precalculations(formatted)
+
 
 class DataFrameFormatter:
+    """
+    Formats the Suricata and benign traffic frames into the unified schema and
+    adds the precalculated and aggregation features.
+    Attributes:
+        suricata_df (DataFrame): Raw Suricata events.
+        normal_traffic_df (DataFrame): Raw benign traffic records.
+        n_jobs (int): Worker processes for formatting and precalculations,
+            -1 for all cores. 1 runs serially.
+        chunk_size (int): Rows per worker task when n_jobs != 1.
+        formatted (bool): The frames are already formatted (e.g. loaded from
+            the dataset cache), skip formatting.
+    """
 
-    def __init__(self, suricata_df, normal_traffic_df):
+    def __init__(
+        self,
+        suricata_df,
+        normal_traffic_df,
+        n_jobs=1,
+        chunk_size=100_000,
+        formatted=False,
+    ):
         self.suricata_df = suricata_df
         self.normal_traffic_df = normal_traffic_df
-        self.base_features = [
-            "source_ip",
-            "destination_ip",
-            "source_port",
-            "destination_port",
-            "timestamp_start",
-            "transport_protocol",
-            "application_protocol",
-            "duration",
-            "bytes_sent",
-            "bytes_received",
-            "pkts_sent",
-            "pkts_received",
-            "direction",
-            "label",
-        ]
-        self.format_all_dfs()
+        self.base_features = list(BASE_FEATURES)
+        self.n_jobs = os.cpu_count() if n_jobs == -1 else n_jobs
+        self.chunk_size = chunk_size
+        if not formatted:
+            self.format_all_dfs()
+
+    @classmethod
+    def from_logs(
+        cls,
+        suricata_json_path,
+        normal_traffic_json_path,
+        sample_size=1000,
+        cache_dir=None,
+        n_jobs=1,
+    ):
+        """
+        Initialize and format both logs. With cache_dir, the formatted
+        DataFrames are stored as Feather files keyed by the log contents and
+        FEATURE_CODE_VERSION, and later calls load them instead of formatting.
+        """
+        cache = None
+        if cache_dir is not None:
+            cache = FormattedDatasetCache(
+                cache_dir,
+                [suricata_json_path, normal_traffic_json_path],
+                sample_size=sample_size,
+            )
+            suricata_df = cache.load("suricata_formatted")
+            normal_traffic_df = cache.load("normal_traffic_formatted")
+            if suricata_df is not None and normal_traffic_df is not None:
+                return cls(suricata_df, normal_traffic_df, n_jobs, formatted=True)
+
+        suricata_df, normal_traffic_df = DataFrameInitializer(
+            suricata_json_path, normal_traffic_json_path
+        ).initialize_dfs(sample_size=sample_size)
+        formatter = cls(suricata_df, normal_traffic_df, n_jobs=n_jobs)
+
+        if cache is not None:
+            cache.save("suricata_formatted", formatter.suricata_df)
+            cache.save("normal_traffic_formatted", formatter.normal_traffic_df)
+        return formatter
 
     def format_all_dfs(self):
+        if self.n_jobs > 1:
+            if PYARROW_AVAILABLE and "fork" in multiprocessing.get_all_start_methods():
+                self._format_all_dfs_parallel()
+                self.add_aggregation_features_all_dfs()
+                return
+            print(
+                "Warning: parallel formatting needs fork and pyarrow, running serially"
+            )
+
         self.suricata_df = DataFrameFormatterSuricata(
             self.suricata_df, self.base_features
         ).format_suricata_df()
@@ -66,6 +178,46 @@ class DataFrameFormatter:
         self.add_precalculations_all_dfs(calculate_ip_geoloc=False)
         self.add_aggregation_features_all_dfs()
 
+    def _format_all_dfs_parallel(self):
+        """
+        Format and precalculate both sources in chunks on a fork process pool.
+        Workers read their rows from the inherited frames, so the input is
+        never pickled, and send results back as Arrow IPC streams.
+        """
+        sources = {
+            "suricata": self.suricata_df,
+            "normal_traffic": self.normal_traffic_df,
+        }
+        tasks = [
+            (source, start, start + self.chunk_size)
+            for source, df in sources.items()
+            for start in range(0, len(df), self.chunk_size)
+        ]
+
+        _WORKER_SOURCES.update(sources)
+        try:
+            with ProcessPoolExecutor(
+                max_workers=self.n_jobs,
+                mp_context=multiprocessing.get_context("fork"),
+            ) as executor:
+                payloads = list(executor.map(_format_chunk, tasks))
+        finally:
+            _WORKER_SOURCES.clear()
+
+        formatted = {source: [] for source in sources}
+        for (source, _, _), payload in zip(tasks, payloads):
+            formatted[source].append(from_arrow_ipc(payload))
+
+        for source, df in sources.items():
+            if not formatted[source]:
+                # Empty source, nothing was sent to the workers
+                formatted[source].append(format_and_precalculate(source, df))
+
+        self.suricata_df = pd.concat(formatted["suricata"], ignore_index=True)
+        self.normal_traffic_df = pd.concat(
+            formatted["normal_traffic"], ignore_index=True
+        )
+
     def unite_honeypot_and_normal_traffic_dfs(self):
         # concatenate rows from all sources and keep only base_features (as requested)
         combined_df = pd.concat(
@@ -97,49 +249,52 @@ class DataFrameFormatter:
 
     def _apply_precalculations(self, df, calculate_ip_geoloc):
         """Apply all precalculation functions to a dataframe"""
-        # Rate features: bytes/packets per second
-        df = calculate_rate_features(df)
+        return apply_precalculations(df, calculate_ip_geoloc)
 
-        # Ratio features: sent/received ratios
-        df = calculate_ratio_features(df)
+    def _apply_aggregation(self, df):
+        """Apply all aggregation functions to a dataframe"""
+        return apply_aggregations(df)
 
-        # Temporal features: hour, day, month, etc.
-        df = calculate_temporal_features(df)
 
-        # IP classification: private/public/multicast/loopback
-        df = calculate_ip_classification_features(df)
+def apply_precalculations(df, calculate_ip_geoloc=False):
+    """
+    Apply all precalculation functions to a dataframe.
+    The frame is copied once and every function then adds its columns in place.
+    """
+    df = df.copy()
 
-        # Port categorization: well-known/registered/dynamic
-        df = calculate_port_categorization(df)
+    # Totals shared by the rate and ratio features
+    totals = calculate_traffic_totals(df)
 
-        if calculate_ip_geoloc:
-            # Add source IP geolocation features
-            df = calculate_src_ip_geolocation_features(df)
+    # Rate features: bytes/packets per second
+    calculate_rate_features(df, inplace=True, totals=totals)
 
-            # Add destination IP geolocation features
-            df = calculate_dst_ip_geolocation_features(df)
+    # Ratio features: sent/received ratios
+    calculate_ratio_features(df, inplace=True, totals=totals)
 
-        return df
+    # Temporal features: hour, day, month, etc.
+    calculate_temporal_features(df, inplace=True)
 
-    def _apply_aggregation(self, df):
-        """Apply all aggregation functions to a dataframe"""
+    # IP classification: private/public/multicast/loopback
+    calculate_ip_classification_features(df, inplace=True)
 
-        # Calculate total number of events/flows processed
-        df = calculate_total_events_processed(df)
+    # Port categorization: well-known/registered/dynamic
+    calculate_port_categorization(df, inplace=True)
 
-        # Calculate total count of anomalous/malicious events
-        df = calculate_total_anomalous_events(df)
+    if calculate_ip_geoloc:
+        # Add source IP geolocation features
+        df = calculate_src_ip_geolocation_features(df)
 
-        # Calculate count of unique malicious source IPs
-        df = calculate_total_unique_malicious_ips(df)
+        # Add destination IP geolocation features
+        df = calculate_dst_ip_geolocation_features(df)
 
-        # Calculate percentage change in event volume over time (trend analysis)
-        df = calculate_trend_percentage_change(df)
+    return df
 
-        # Calculate event counts grouped by destination port
-        df = calculate_total_events_for_dst_ports(df)
 
-        # Calculate malicious event counts grouped by protocol type
-        df = calculate_total_malicious_events_per_protocol(df)
+def apply_aggregations(df):
+    """Apply all aggregation functions to a dataframe"""
 
-        return df
+    # Events, malicious events, unique malicious IPs, trend percentages,
+    # events per dst port and malicious events per protocol, computed in a
+    # single pass over shared time windows
+    return calculate_all_aggregation_features(df)
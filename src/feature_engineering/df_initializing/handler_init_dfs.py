@@ -24,6 +24,7 @@ class DataFrameInitializer:
 
     Methods:
         initialize_dfs():  returns DataFrames for all log types.
+        iter_suricata_chunks():  yields the Suricata log as bounded DataFrames.
     """
 
     def __init__(self, suricata_json_path, normal_traffic_json_path):
@@ -34,15 +35,19 @@ class DataFrameInitializer:
         df_suricata = self.suricata_init.initialize_suricata()
 
         if preprocess_normal_traffic:
-            self.normal_traffic_init.preprocess_json_replace_invalid_numbers(
-                output_path="data/normal_traffic/benign_traffic_fixed.json"
-            )
+            # Replace NaN/Infinity inline while parsing, no intermediate file
+            self.normal_traffic_init.sanitize_invalid_numbers = True
 
         df_normal_traffic = self.normal_traffic_init.initialize_benign_traffic(
             sample_size=sample_size
         )
         return df_suricata, df_normal_traffic
 
+    def iter_suricata_chunks(self, chunk_size=100_000, event_types=None):
+        return self.suricata_init.iter_suricata_chunks(
+            chunk_size=chunk_size, event_types=event_types
+        )
+
 
 if __name__ == "__main__":
     df_initializer = DataFrameInitializer(
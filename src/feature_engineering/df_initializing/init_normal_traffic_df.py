@@ -1,22 +1,60 @@
-import gzip
-import re
+import random
 
-import ijson
 import pandas as pd
 
+from src.feature_engineering.df_initializing.json_backends import get_array_parser
+from src.feature_engineering.df_initializing.json_sanitizer import (
+    InvalidNumberSanitizer,
+    sanitize_json_file,
+)
+from src.feature_engineering.df_initializing.log_io import open_log_file
+from src.feature_engineering.df_initializing.reservoir_sampling import (
+    ReservoirSampler,
+    StratifiedReservoirSampler,
+)
+
 
 class NormalTrafficDataFrameInitializer:
     """
     Initializes a DataFrame from benign_traffic JSON log file.
     Attributes:
         benign_traffic_json_path (str): Path to benign_traffic JSON log file.
+        json_backend (str): ijson backend name, the fastest available if None.
+        sanitize_invalid_numbers (bool): Replace NaN/Infinity with null while parsing.
     """
 
-    def __init__(self, benign_traffic_json_path):
+    def __init__(
+        self,
+        benign_traffic_json_path,
+        json_backend=None,
+        sanitize_invalid_numbers=False,
+    ):
         self.benign_traffic_json_path = benign_traffic_json_path
+        self.ijson_backend = get_array_parser(json_backend)
+        self.sanitize_invalid_numbers = sanitize_invalid_numbers
+
+    def _json_source(self, f):
+        if self.sanitize_invalid_numbers:
+            return InvalidNumberSanitizer(f)
+        return f
 
-    def initialize_benign_traffic(self, sample_size):
-        sampled_records = self.sample_large_json_with_ijson(sample_size)
+    def initialize_benign_traffic(
+        self, sample_size, sampling="reservoir", random_state=42, stratify_by=None
+    ):
+        """
+        Sample the benign traffic into a DataFrame.
+        sampling="reservoir" draws a uniform sample in one pass over the file
+        (optionally stratified on the `stratify_by` field), sampling="head"
+        keeps the first sample_size records.
+        """
+        if sampling == "reservoir":
+            sampled_records = self.reservoir_sample_json(
+                sample_size, random_state=random_state, stratify_by=stratify_by
+            )
+        elif sampling == "head":
+            sampled_records = self.sample_large_json_with_ijson(sample_size)
+        else:
+            raise ValueError(f"Unknown sampling method: {sampling}")
         df_benign_traffic = pd.DataFrame(sampled_records)
         return df_benign_traffic
 
@@ -24,34 +62,51 @@ class NormalTrafficDataFrameInitializer:
         N = sample_size
         result = []
 
-        # Check if file is gzipped
-        if self.benign_traffic_json_path.endswith(".gz"):
-            f = gzip.open(
-                self.benign_traffic_json_path, "rb"
-            )  # ✅ Changed "rt" to "rb"
-        else:
-            f = open(self.benign_traffic_json_path, "rb")  # ✅ Changed "r" to "rb"
-
-        try:
-            parser = ijson.items(f, "item")
+        with open_log_file(self.benign_traffic_json_path) as f:
+            parser = self.ijson_backend.items(self._json_source(f), "item")
             for i, item in enumerate(parser):
                 if i == N:
                     break
                 result.append(item)
-        finally:
-            f.close()
 
         return result
 
+    def reservoir_sample_json(self, sample_size, random_state=42, stratify_by=None):
+        """
+        Uniform random sample of sample_size records in a single streaming pass.
+        With stratify_by (e.g. "appName") the sample is split across strata
+        proportionally to their counts, with at least one record per stratum
+        when sample_size allows it. At most sample_size records are held in
+        memory at any time.
+        """
+        rng = random.Random(random_state)
+
+        with open_log_file(self.benign_traffic_json_path) as f:
+            parser = self.ijson_backend.items(self._json_source(f), "item")
+
+            if stratify_by is None:
+                sampler = ReservoirSampler(sample_size, rng)
+                for item in parser:
+                    sampler.offer(item)
+                return sampler.items
+
+            sampler = StratifiedReservoirSampler(sample_size, rng)
+            for item in parser:
+                sampler.offer(item.get(stratify_by), item)
+
+        result = sampler.items
+        rng.shuffle(result)
+        return result
+
     def preprocess_json_replace_invalid_numbers(self, output_path):
-        with (
-            open(self.benign_traffic_json_path, "rb", encoding="utf-8") as f_in,
-            open(output_path, "w", encoding="utf-8") as f_out,
-        ):
-            for line in f_in:
-                # replace NaN, Infinity, -Infinity with null
-                line_fixed = re.sub(r"\bNaN\b|\bInfinity\b|\b-Infinity\b", "null", line)
-                f_out.write(line_fixed)
+        """
+        Write a copy of the log with NaN/Infinity/-Infinity replaced by null and
+        read from it afterwards. Input and output are gzip compressed when their
+        path ends with ".gz". Prefer sanitize_invalid_numbers=True, which does
+        the same inline without an intermediate file.
+        """
+        replacements = sanitize_json_file(self.benign_traffic_json_path, output_path)
+        print(f"Replaced {replacements} invalid numbers in {output_path}")
         self.benign_traffic_json_path = output_path
 
 
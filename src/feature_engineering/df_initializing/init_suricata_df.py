@@ -1,22 +1,62 @@
-import json
+import re
 
 import pandas as pd
 
+from src.feature_engineering.df_initializing.json_backends import get_line_parser
+from src.feature_engineering.df_initializing.log_io import open_log_file
+
+# Matches the event_type field of a raw eve.json line without parsing it
+EVENT_TYPE_PATTERN = re.compile(rb'"event_type"\s*:\s*"([^"]*)"')
+
 
 class SuricataDataFrameInitializer:
     """
     Initializes a DataFrame from Suricata JSON log file.
     Attributes:
-        suricata_json_path (str): Path to Suricata JSON log file.
+        suricata_json_path (str): Path to Suricata JSON log file (plain or .gz).
+        json_backend (str): "orjson" or "json", the fastest available if None.
     """
 
-    def __init__(self, suricata_json_path):
+    def __init__(self, suricata_json_path, json_backend=None):
         self.suricata_json_path = suricata_json_path
+        self.json_loads = get_line_parser(json_backend)
 
-    def initialize_suricata(self):
-        records_Suricata = []
-        with open(self.suricata_json_path, "r") as f:
-            for line in f:
-                records_Suricata.append(json.loads(line))
+    def initialize_suricata(self, event_types=None):
+        records_Suricata = list(self.iter_suricata_records(event_types))
         df_suricata = pd.DataFrame(records_Suricata)
         return df_suricata
+
+    def iter_suricata_chunks(self, chunk_size=100_000, event_types=None):
+        """
+        Yield the log as DataFrames of at most chunk_size events.
+        Memory stays bounded by the chunk size, so each chunk can be formatted
+        and precalculated on its own.
+        """
+        chunk = []
+        for record in self.iter_suricata_records(event_types):
+            chunk.append(record)
+            if len(chunk) == chunk_size:
+                yield pd.DataFrame(chunk)
+                chunk = []
+        if chunk:
+            yield pd.DataFrame(chunk)
+
+    def iter_suricata_records(self, event_types=None):
+        """
+        Yield one dict per eve.json line.
+        If event_types is given (e.g. {"flow", "alert"}), lines of other types
+        are skipped before being parsed.
+        """
+        wanted = None
+        if event_types is not None:
+            wanted = {event_type.encode() for event_type in event_types}
+
+        with open_log_file(self.suricata_json_path) as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                if wanted is not None:
+                    match = EVENT_TYPE_PATTERN.search(line)
+                    if match is None or match.group(1) not in wanted:
+                        continue
+                yield self.json_loads(line)
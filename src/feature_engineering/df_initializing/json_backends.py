@@ -0,0 +1,84 @@
+"""
+JSON parsing backends for log ingestion.
+
+Line-delimited logs (Suricata eve.json) are parsed record by record with the
+fastest available loads function: orjson, falling back to the stdlib json
+module (also per line, for the NaN/Infinity literals and integers wider than
+64 bits that orjson rejects). JSON arrays (benign traffic) are streamed with
+ijson, preferring its C backend (yajl2_c). All parsers work on bytes, without
+decoding to str.
+"""
+
+import json
+
+import ijson
+
+# orjson is optional - the stdlib json module is used if it is not installed
+try:
+    import orjson
+
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# Backends in order of preference
+LINE_BACKENDS = ["orjson", "json"]
+ARRAY_BACKENDS = ["yajl2_c", "yajl2_cffi", "yajl2", "python"]
+
+
+def available_line_backends():
+    """Return the installed backends for line-delimited JSON, fastest first."""
+    return [name for name in LINE_BACKENDS if name != "orjson" or ORJSON_AVAILABLE]
+
+
+def available_array_backends():
+    """Return the installed ijson backends, fastest first."""
+    available = []
+    for name in ARRAY_BACKENDS:
+        try:
+            ijson.get_backend(name)
+        except Exception:
+            # Missing C extension / shared library
+            continue
+        available.append(name)
+    return available
+
+
+def _orjson_loads(line):
+    try:
+        return orjson.loads(line)
+    except orjson.JSONDecodeError:
+        # NaN/Infinity or integers over 64 bits, which the stdlib accepts
+        return json.loads(line)
+
+
+def get_line_parser(backend=None):
+    """
+    Return a loads function that parses one JSON document from bytes.
+    Attributes:
+        backend (str): "orjson" or "json", the fastest available if None.
+    """
+    if backend is None:
+        backend = available_line_backends()[0]
+
+    if backend == "orjson":
+        if not ORJSON_AVAILABLE:
+            raise ImportError("orjson backend requested but orjson is not installed")
+        return _orjson_loads
+    if backend == "json":
+        return json.loads
+    raise ValueError(f"Unknown JSON line backend: {backend}")
+
+
+def get_array_parser(backend=None):
+    """
+    Return an ijson backend module (exposing items/parse) for streaming arrays.
+    Attributes:
+        backend (str): ijson backend name, the fastest available if None.
+    """
+    if backend is None:
+        backend = available_array_backends()[0]
+
+    if backend not in ARRAY_BACKENDS:
+        raise ValueError(f"Unknown ijson backend: {backend}")
+    return ijson.get_backend(backend)
@@ -0,0 +1,92 @@
+import re
+import sys
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).resolve().parents[3]
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
+
+from src.feature_engineering.df_initializing.log_io import open_log_file
+
+# NaN, Infinity and -Infinity are emitted by Python's json module but are not valid JSON
+INVALID_NUMBER_PATTERN = re.compile(rb"-?\bInfinity\b|\bNaN\b")
+
+# Bytes that can never be part of a token, a block is only cut right after one of them
+TOKEN_DELIMITERS = (b",", b":", b"[", b"]", b"{", b"}", b" ", b"\n", b"\r", b"\t")
+
+DEFAULT_BLOCK_SIZE = 1 << 20
+
+
+def _safe_cut(buffer):
+    """Return the offset just past the last token delimiter in buffer (0 if none)."""
+    return max(buffer.rfind(delimiter) for delimiter in TOKEN_DELIMITERS) + 1
+
+
+class InvalidNumberSanitizer:
+    """
+    Read-only file-like filter replacing NaN/Infinity/-Infinity with null.
+    Works on large blocks and carries the tail of each block over to the next
+    one, so tokens split across block boundaries are still replaced. Can be
+    handed directly to ijson as its input file.
+    Attributes:
+        raw (file): Binary file object to read from.
+        block_size (int): Number of bytes read from raw at a time.
+    """
+
+    def __init__(self, raw, block_size=DEFAULT_BLOCK_SIZE):
+        self.raw = raw
+        self.block_size = block_size
+        self.replacements = 0
+        self._carry = b""
+        self._output = bytearray()
+        self._eof = False
+
+    def _sanitize(self, data):
+        data, count = INVALID_NUMBER_PATTERN.subn(b"null", data)
+        self.replacements += count
+        return data
+
+    def _fill(self):
+        block = self.raw.read(self.block_size)
+        if not block:
+            self._eof = True
+            self._output += self._sanitize(self._carry)
+            self._carry = b""
+            return
+
+        buffer = self._carry + block
+        cut = _safe_cut(buffer)
+        self._output += self._sanitize(buffer[:cut])
+        self._carry = buffer[cut:]
+
+    def read(self, size=-1):
+        while not self._eof and (size is None or size < 0 or len(self._output) < size):
+            self._fill()
+
+        if size is None or size < 0 or size >= len(self._output):
+            data = bytes(self._output)
+            self._output.clear()
+            return data
+
+        data = bytes(self._output[:size])
+        del self._output[:size]
+        return data
+
+
+def sanitize_json_file(input_path, output_path, block_size=DEFAULT_BLOCK_SIZE):
+    """
+    Stream input_path to output_path replacing NaN/Infinity with null.
+    Either path may be gzip compressed (".gz"). Returns the number of replacements.
+    """
+    with (
+        open_log_file(input_path) as f_in,
+        open_log_file(output_path, "wb") as f_out,
+    ):
+        sanitizer = InvalidNumberSanitizer(f_in, block_size=block_size)
+        while True:
+            data = sanitizer.read(block_size)
+            if not data:
+                break
+            f_out.write(data)
+    return sanitizer.replacements
@@ -0,0 +1,14 @@
+import gzip
+
+
+def open_log_file(path, mode="rb"):
+    """
+    Open a log file, transparently handling gzip compression.
+    Attributes:
+        path (str): Path to the log file, compressed if it ends with ".gz".
+        mode (str): File mode, binary by default.
+    """
+    path = str(path)
+    if path.endswith(".gz"):
+        return gzip.open(path, mode)
+    return open(path, mode)
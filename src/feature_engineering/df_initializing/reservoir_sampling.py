@@ -0,0 +1,168 @@
+import heapq
+import math
+
+
+class ReservoirSampler:
+    """
+    Uniform random sample of fixed size over a stream (Algorithm L).
+    Once the reservoir is full, the number of items to skip before the next
+    replacement is drawn directly, so every skipped item costs O(1) and no
+    random number.
+    Attributes:
+        size (int): Maximum number of items kept.
+        rng (random.Random): Source of randomness (seeded by the caller).
+        items (list): Current reservoir content.
+        seen (int): Number of items offered so far.
+    """
+
+    def __init__(self, size, rng):
+        self.size = size
+        self.rng = rng
+        self.items = []
+        self.seen = 0
+        self._weight = 1.0
+        self._skip = 0
+
+    def offer(self, item):
+        self.seen += 1
+
+        # Fill phase: keep the first `size` items
+        if len(self.items) < self.size:
+            self.items.append(item)
+            if len(self.items) == self.size:
+                self._weight = math.exp(math.log(self._uniform()) / self.size)
+                self._draw_skip()
+            return
+
+        # Skip phase: item is not selected
+        if self._skip > 0:
+            self._skip -= 1
+            return
+
+        # Selected item replaces a random slot
+        if self.size > 0:
+            self.items[self.rng.randrange(self.size)] = item
+            self._weight *= math.exp(math.log(self._uniform()) / self.size)
+            self._draw_skip()
+
+    def _draw_skip(self):
+        if self._weight >= 1.0:
+            self._skip = 0
+            return
+        self._skip = math.floor(math.log(self._uniform()) / math.log1p(-self._weight))
+
+    def _uniform(self):
+        # Uniform in (0, 1): log(0) is undefined
+        u = self.rng.random()
+        while u == 0.0:
+            u = self.rng.random()
+        return u
+
+
+def proportional_quotas(counts, total):
+    """
+    Split a sample of `total` items across strata proportionally to `counts`
+    (largest remainder method). Every stratum gets at least one item when
+    total allows it, and no stratum gets more than its count.
+    """
+    n_items = sum(counts.values())
+    if total >= n_items:
+        return dict(counts)
+
+    exact = {key: total * count / n_items for key, count in counts.items()}
+    quotas = {key: min(math.floor(value), counts[key]) for key, value in exact.items()}
+    if total >= len(counts):
+        quotas = {key: max(quota, 1) for key, quota in quotas.items()}
+
+    remaining = total - sum(quotas.values())
+
+    # Hand out leftover slots by largest remainder
+    by_remainder = sorted(
+        counts, key=lambda key: exact[key] - math.floor(exact[key]), reverse=True
+    )
+    while remaining > 0:
+        for key in by_remainder:
+            if remaining == 0:
+                break
+            if quotas[key] < counts[key]:
+                quotas[key] += 1
+                remaining -= 1
+
+    # Take back slots given by the minimum of one, from the largest strata
+    while remaining < 0:
+        key = max(quotas, key=quotas.get)
+        quotas[key] -= 1
+        remaining += 1
+
+    return quotas
+
+
+class StratifiedReservoirSampler:
+    """
+    Stratified random sample of at most `size` items over a stream.
+    Every item gets a random priority key and each stratum keeps the items
+    with the smallest keys under its running quota, the proportional share of
+    `size` given the counts seen so far. Quotas are recomputed when a new
+    stratum appears and every `size` items, and a stratum over its quota drops
+    its largest keys, so no more than `size` items are held at any time.
+    Attributes:
+        size (int): Maximum number of items kept across all strata.
+        rng (random.Random): Source of randomness (seeded by the caller).
+        counts (dict): Number of items offered so far per stratum.
+        seen (int): Number of items offered so far.
+        quotas (dict): Current number of items each stratum may keep.
+    """
+
+    def __init__(self, size, rng):
+        self.size = size
+        self.rng = rng
+        self.counts = {}
+        self.quotas = {}
+        self.seen = 0
+        # Per stratum: max-heap of (-key, arrival, item) and the smallest key
+        # dropped so far; the heap holds exactly the items below that key
+        self._heaps = {}
+        self._thresholds = {}
+        self._since_refresh = 0
+
+    @property
+    def retained(self):
+        return sum(len(heap) for heap in self._heaps.values())
+
+    @property
+    def items(self):
+        self._refresh_quotas()
+        return [item for heap in self._heaps.values() for _, _, item in heap]
+
+    def offer(self, stratum, item):
+        self.seen += 1
+        self._since_refresh += 1
+        is_new = stratum not in self.counts
+        if is_new:
+            self._heaps[stratum] = []
+            self._thresholds[stratum] = 1.0
+        self.counts[stratum] = self.counts.get(stratum, 0) + 1
+        if self.seen <= self.size:
+            # Fill phase: every item offered so far fits in the sample
+            self.quotas[stratum] = self.counts[stratum]
+        elif is_new or self._since_refresh >= self.size:
+            self._refresh_quotas()
+
+        key = self.rng.random()
+        if key >= self._thresholds[stratum]:
+            return
+        heap = self._heaps[stratum]
+        heapq.heappush(heap, (-key, self.seen, item))
+        if len(heap) > self.quotas[stratum]:
+            self._evict(stratum)
+
+    def _refresh_quotas(self):
+        self._since_refresh = 0
+        self.quotas = proportional_quotas(self.counts, self.size)
+        for stratum, heap in self._heaps.items():
+            while len(heap) > self.quotas[stratum]:
+                self._evict(stratum)
+
+    def _evict(self, stratum):
+        neg_key, _, _ = heapq.heappop(self._heaps[stratum])
+        self._thresholds[stratum] = -neg_key
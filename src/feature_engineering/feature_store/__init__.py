@@ -0,0 +1,9 @@
+"""
+Feature store module
+"""
+
+from .partitioned_store import PartitionedFeatureStore
+
+__all__ = [
+    "PartitionedFeatureStore",
+]
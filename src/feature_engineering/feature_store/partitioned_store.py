@@ -0,0 +1,186 @@
+import json
+import os
+import sys
+from bisect import bisect_left
+from pathlib import Path
+
+import pandas as pd
+
+# Add project root to path
+project_root = Path(__file__).resolve().parents[3]
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
+
+from src.feature_engineering.df_formatting.dataset_cache import (
+    FEATURE_CODE_VERSION,
+    read_feather,
+    write_feather,
+)
+from src.feature_engineering.df_formatting.format_suricata_df import (
+    DataFrameFormatterSuricata,
+)
+from src.feature_engineering.df_formatting.handler_df_formatter import (
+    AGGREGATION_FEATURES,
+    BASE_FEATURES,
+    apply_aggregations,
+    apply_precalculations,
+)
+from src.feature_engineering.df_initializing.init_suricata_df import (
+    SuricataDataFrameInitializer,
+)
+
+MANIFEST_NAME = "manifest.json"
+
+# Partition key of an hour, sorts chronologically as a string
+PARTITION_FORMAT = "%Y-%m-%dT%H"
+
+
+class PartitionedFeatureStore:
+    """
+    Append-only store of processed traffic, partitioned by hour of timestamp_start.
+    Each partition is a Feather file with the precalculated and aggregation
+    features of its rows. Appending only precalculates the new rows and
+    recomputes the aggregations of the hours they fall into, plus the next
+    stored hour whose trend features depend on them, so a refresh costs
+    O(new data). Keep one store per traffic source, as DataFrameFormatter
+    aggregates each source separately.
+    Attributes:
+        root (str): Directory holding the partitions and the manifest.
+        timestamp_col (str): Datetime column the partitions are keyed on.
+    """
+
+    def __init__(self, root, timestamp_col="timestamp_start"):
+        self.root = Path(root)
+        self.timestamp_col = timestamp_col
+        self.manifest = self._load_manifest()
+
+    def _load_manifest(self):
+        manifest_path = self.root / MANIFEST_NAME
+        if not manifest_path.exists():
+            return {"feature_code_version": FEATURE_CODE_VERSION, "partitions": {}}
+
+        with open(manifest_path, "r") as f:
+            manifest = json.load(f)
+        if manifest.get("feature_code_version") != FEATURE_CODE_VERSION:
+            print(
+                f"Warning: feature store {self.root} was built with feature code "
+                f"version {manifest.get('feature_code_version')}, current is "
+                f"{FEATURE_CODE_VERSION}"
+            )
+        return manifest
+
+    def _save_manifest(self):
+        self.root.mkdir(parents=True, exist_ok=True)
+        manifest_path = self.root / MANIFEST_NAME
+        tmp_path = manifest_path.with_name(MANIFEST_NAME + ".tmp")
+        with open(tmp_path, "w") as f:
+            json.dump(self.manifest, f, indent=2, sort_keys=True)
+        os.replace(tmp_path, manifest_path)
+
+    def _partition_keys(self, timestamps):
+        return timestamps.dt.floor("60min").dt.strftime(PARTITION_FORMAT)
+
+    def _partition_path(self, key):
+        return self.root / f"hour={key}.feather"
+
+    def _read_partition(self, key):
+        return read_feather(self._partition_path(key))
+
+    def partitions(self):
+        """Sorted keys of the stored hourly partitions."""
+        return sorted(self.manifest["partitions"])
+
+    def read(self, start=None, end=None):
+        """Concatenate the partitions whose hour lies in [start, end]."""
+        keys = self.partitions()
+        if start is not None:
+            start_key = pd.Timestamp(start).floor("60min").strftime(PARTITION_FORMAT)
+            keys = [key for key in keys if key >= start_key]
+        if end is not None:
+            end_key = pd.Timestamp(end).floor("60min").strftime(PARTITION_FORMAT)
+            keys = [key for key in keys if key <= end_key]
+
+        if not keys:
+            return pd.DataFrame()
+        return pd.concat([self._read_partition(key) for key in keys], ignore_index=True)
+
+    def _keys_to_recompute(self, touched_keys):
+        """
+        Hours whose aggregations change, and the hours only needed as context.
+        The trend features of an hour compare it with the previous stored hour.
+        """
+        all_keys = sorted(set(self.manifest["partitions"]) | set(touched_keys))
+
+        recompute = set(touched_keys)
+        for key in touched_keys:
+            position = bisect_left(all_keys, key)
+            if position + 1 < len(all_keys):
+                recompute.add(all_keys[position + 1])
+
+        context = set()
+        for key in recompute:
+            position = bisect_left(all_keys, key)
+            if position > 0 and all_keys[position - 1] not in recompute:
+                context.add(all_keys[position - 1])
+
+        return recompute, context
+
+    def append(self, df, calculate_ip_geoloc=False):
+        """
+        Append formatted rows (BASE_FEATURES) to the store.
+        Returns the keys of the rewritten partitions.
+        """
+        timestamps = pd.to_datetime(df[self.timestamp_col])
+        missing = timestamps.isna()
+        if missing.any():
+            print(
+                f"Warning: dropping {int(missing.sum())} rows without "
+                f"{self.timestamp_col}"
+            )
+        df = df.loc[~missing].reset_index(drop=True)
+        if df.empty:
+            return []
+        df[self.timestamp_col] = timestamps[~missing].reset_index(drop=True)
+
+        new_rows = apply_precalculations(df, calculate_ip_geoloc)
+        touched_keys = self._partition_keys(new_rows[self.timestamp_col]).unique()
+        recompute, context = self._keys_to_recompute(touched_keys)
+
+        # Stored rows of the affected hours without their stale aggregations
+        frames = []
+        for key in sorted(recompute | context):
+            if key not in self.manifest["partitions"]:
+                continue
+            frames.append(
+                self._read_partition(key).drop(
+                    columns=AGGREGATION_FEATURES, errors="ignore"
+                )
+            )
+        frames.append(new_rows)
+
+        combined = apply_aggregations(pd.concat(frames, ignore_index=True))
+        combined_keys = self._partition_keys(combined[self.timestamp_col])
+
+        for key, partition in combined.groupby(combined_keys, sort=True):
+            if key not in recompute:
+                continue
+            write_feather(partition, self._partition_path(key))
+            self.manifest["partitions"][key] = {
+                "rows": len(partition),
+                "min_timestamp": str(partition[self.timestamp_col].min()),
+                "max_timestamp": str(partition[self.timestamp_col].max()),
+            }
+
+        self._save_manifest()
+        return sorted(recompute)
+
+    def append_suricata_log(self, suricata_json_path, chunk_size=100_000):
+        """Format a new Suricata log segment and append it to the store."""
+        initializer = SuricataDataFrameInitializer(suricata_json_path)
+        formatted = [
+            DataFrameFormatterSuricata(chunk, list(BASE_FEATURES)).format_suricata_df()
+            for chunk in initializer.iter_suricata_chunks(chunk_size=chunk_size)
+        ]
+        if not formatted:
+            return []
+        return self.append(pd.concat(formatted, ignore_index=True))
@@ -6,29 +6,41 @@ Feature engineering functions for network traffic anomaly detection.
 
 from .ip_classification_features import (
     calculate_ip_classification_features,
+    classify_private_ips,
     is_private_ip,
 )
 from .ip_geolocation_features import (
     calculate_dst_ip_geolocation_features,
     calculate_ip_info,
     calculate_src_ip_geolocation_features,
+    resolve_ip_geolocation,
+)
+from .port_categorization_features import (
+    DEFAULT_PORT_CATEGORIES,
+    calculate_port_categorization,
+    is_port_common,
 )
-from .port_categorization_features import calculate_port_categorization, is_port_common
 
 # Import functions as you create them
 from .rate_features import calculate_rate_features
 from .ratio_features import calculate_ratio_features
-from .temporal_features import calculate_temporal_features
+from .temporal_features import calculate_temporal_features, parse_timestamps
+from .traffic_totals import calculate_traffic_totals
 
 __all__ = [
     "calculate_rate_features",
     "calculate_ratio_features",
     "calculate_temporal_features",
+    "parse_timestamps",
+    "calculate_traffic_totals",
     "calculate_port_categorization",
     "is_port_common",
+    "DEFAULT_PORT_CATEGORIES",
     "calculate_ip_classification_features",
     "is_private_ip",
+    "classify_private_ips",
     "calculate_ip_info",
     "calculate_dst_ip_geolocation_features",
     "calculate_src_ip_geolocation_features",
+    "resolve_ip_geolocation",
 ]
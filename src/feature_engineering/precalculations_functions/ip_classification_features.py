@@ -1,4 +1,40 @@
 import ipaddress
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+# Dotted quads exactly as ipaddress accepts them (no leading zeros, octets <= 255)
+OCTET_PATTERN = r"(?:25[0-5]|2[0-4][0-9]|1[0-9][0-9]|[1-9]?[0-9])"
+IPV4_PATTERN = rf"{OCTET_PATTERN}(?:\.{OCTET_PATTERN}){{3}}"
+
+# Ranges behind ipaddress' is_private for IPv4 (RFC1918, loopback, link-local, ...),
+# as in the IANA special-purpose registry and Python >= 3.11.10 / 3.12.4
+PRIVATE_NETWORKS = tuple(
+    ipaddress.IPv4Network(network)
+    for network in (
+        "0.0.0.0/8",
+        "10.0.0.0/8",
+        "127.0.0.0/8",
+        "169.254.0.0/16",
+        "172.16.0.0/12",
+        "192.0.0.0/24",
+        "192.0.0.170/31",
+        "192.0.2.0/24",
+        "192.168.0.0/16",
+        "198.18.0.0/15",
+        "198.51.100.0/24",
+        "203.0.113.0/24",
+        "240.0.0.0/4",
+        "255.255.255.255/32",
+    )
+)
+# Globally reachable addresses inside PRIVATE_NETWORKS
+PRIVATE_NETWORK_EXCEPTIONS = tuple(
+    ipaddress.IPv4Network(network) for network in ("192.0.0.9/32", "192.0.0.10/32")
+)
+
+MEMO_CACHE_SIZE = 65536
 
 
 def is_private_ip(ip):
@@ -11,19 +47,107 @@ def is_private_ip(ip):
         return False  # Invalid IP or NaN
 
 
+@lru_cache(maxsize=MEMO_CACHE_SIZE)
+def _is_private_ip_cached(ip):
+    return is_private_ip(ip)
+
+
+def _in_networks(addresses, networks):
+    """Mask of the uint32 addresses falling in any of the networks."""
+    mask = np.zeros(len(addresses), dtype=bool)
+    for network in networks:
+        netmask = np.uint32(int(network.netmask))
+        mask |= (addresses & netmask) == np.uint32(int(network.network_address))
+    return mask
+
+
+def _private_mask(addresses):
+    """is_private of uint32 IPv4 addresses, through the network table."""
+    return _in_networks(addresses, PRIVATE_NETWORKS) & ~_in_networks(
+        addresses, PRIVATE_NETWORK_EXCEPTIONS
+    )
+
+
+def _table_matches_ipaddress():
+    """
+    Whether the network table gives the running Python's is_private on the
+    boundaries of every range and the addresses whose status changed between
+    Python releases.
+    """
+    addresses = {
+        int(ipaddress.IPv4Address(ip))
+        for ip in ("100.64.0.1", "192.0.0.8", "192.0.0.100", "192.0.0.171")
+    }
+    for network in PRIVATE_NETWORKS + PRIVATE_NETWORK_EXCEPTIONS:
+        first = int(network.network_address)
+        last = int(network.broadcast_address)
+        addresses.update(
+            address
+            for address in (first - 1, first, last, last + 1)
+            if 0 <= address < 2**32
+        )
+    addresses = sorted(addresses)
+    expected = [ipaddress.IPv4Address(address).is_private for address in addresses]
+    return _private_mask(np.array(addresses, dtype=np.uint32)).tolist() == expected
+
+
+# Older Pythons (e.g. 192.0.0.0/24 before 3.11.10) disagree with the table:
+# there every value goes through the memoized is_private_ip instead
+TABLE_MATCHES_IPADDRESS = _table_matches_ipaddress()
+
+
+def classify_private_ips(values):
+    """
+    is_private_ip for every value of a Series, as a boolean array.
+    Only unique values are classified: dotted-quad IPv4 strings through uint32
+    range masks, anything else (IPv6, invalid) through a memoized is_private_ip.
+    Without TABLE_MATCHES_IPADDRESS every value takes the memoized path.
+    """
+    codes, uniques = pd.factorize(values)
+    uniques = np.asarray(uniques, dtype=object)
+    unique_private = np.zeros(len(uniques), dtype=bool)
+
+    is_str = np.fromiter(
+        (isinstance(value, str) for value in uniques), dtype=bool, count=len(uniques)
+    )
+    strings = pd.Series(uniques[is_str], dtype=object)
+    is_ipv4 = np.zeros(len(uniques), dtype=bool)
+    if TABLE_MATCHES_IPADDRESS:
+        is_ipv4[is_str] = strings.str.fullmatch(IPV4_PATTERN).to_numpy(dtype=bool)
+
+    if is_ipv4.any():
+        octets = (
+            pd.Series(uniques[is_ipv4], dtype=object)
+            .str.split(".", expand=True)
+            .to_numpy(dtype=np.uint32)
+        )
+        addresses = (
+            (octets[:, 0] << 24) | (octets[:, 1] << 16) | (octets[:, 2] << 8)
+        ) | octets[:, 3]
+        unique_private[is_ipv4] = _private_mask(addresses)
+
+    for i in np.flatnonzero(~is_ipv4):
+        unique_private[i] = _is_private_ip_cached(uniques[i])
+
+    # Missing values (code -1) are not private
+    return np.where(codes >= 0, unique_private[codes], False)
+
+
 def calculate_ip_classification_features(
-    df, src_ip_col="source_ip", dst_ip_col="destination_ip"
+    df, src_ip_col="source_ip", dst_ip_col="destination_ip", inplace=False
 ):
     """
     Calculate:
     - src_is_private: 1 if source IP is private, 0 otherwise
     - dst_is_private: 1 if destination IP is private, 0 otherwise
     - is_internal: 1 if both IPs are private, 0 otherwise
+    With inplace=True the columns are added to df without copying it.
     """
-    df = df.copy()
+    if not inplace:
+        df = df.copy()
 
-    df["src_is_private"] = df[src_ip_col].apply(is_private_ip).astype(int)
-    df["dst_is_private"] = df[dst_ip_col].apply(is_private_ip).astype(int)
+    df["src_is_private"] = classify_private_ips(df[src_ip_col]).astype(int)
+    df["dst_is_private"] = classify_private_ips(df[dst_ip_col]).astype(int)
     df["is_internal"] = (
         (df["src_is_private"] == 1) & (df["dst_is_private"] == 1)
     ).astype(int)
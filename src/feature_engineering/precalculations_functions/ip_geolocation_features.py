@@ -1,15 +1,47 @@
-import time
+import sys
+from pathlib import Path
 
+import numpy as np
+import pandas as pd
 import requests
 
-
-def calculate_ip_info(ip):
+# Add project root to path
+project_root = Path(__file__).resolve().parents[3]
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
+
+from src.dashboard.geolocation_service import (
+    TokenBucket,
+    get_geo_service,
+    ip_type,
+    ipwhois_record,
+)
+
+# Feature name suffixes, in output column order, and the record field each reads
+GEO_FEATURES = {
+    "ip_type": "type",
+    "continent": "continent",
+    "country": "country",
+    "region": "region",
+    "city": "city",
+    "latitude": "latitude",
+    "longitude": "longitude",
+    "isp": "isp",
+}
+
+# Placeholder values of the service records that mean "not known"
+_MISSING_VALUES = (None, "", "Unknown")
+
+
+def calculate_ip_info(ip, session=None):
     """
     Fetch IP geolocation information from ipwho.is API.
+    With a requests session the connection is reused across calls.
     """
+    get = session.get if session is not None else requests.get
     try:
         url = f"https://ipwho.is/{ip}"
-        response = requests.get(url, timeout=5)
+        response = get(url, timeout=5)
         response.raise_for_status()
         return response.json()
     except Exception as e:
@@ -17,11 +49,104 @@ def calculate_ip_info(ip):
         return {"success": False}
 
 
+def _fetch_ip_record(ip, session):
+    """Service record of an IP fetched with calculate_ip_info, None on failure."""
+    ip_info = calculate_ip_info(ip, session=session)
+    if ip_info.get("success", False):
+        return ipwhois_record(ip, ip_info)
+    return None
+
+
+def _feature_values(ip, record):
+    """Geolocation feature values of a service record, 'unknown' when missing."""
+    if record is None or record.get("source") == "private":
+        return ["unknown"] * len(GEO_FEATURES)
+    values = []
+    for field in GEO_FEATURES.values():
+        value = record.get(field)
+        if value is None and field == "type":
+            # Records cached before the field existed
+            value = ip_type(str(ip))
+        values.append("unknown" if value in _MISSING_VALUES else value)
+    return values
+
+
+def resolve_ip_geolocation(ips, geo_service=None, rate_limit_delay=0.1):
+    """
+    Geolocation feature values of each distinct IP, as a DataFrame indexed by IP
+    with one column per GEO_FEATURES key.
+    IPs are resolved offline first through the shared GeolocationService: its
+    cache, then GeolocationService.lookup_offline (the private address check
+    and the GeoLite2 database, whose records are cached too). Only
+    the remaining IPs are fetched from ipwho.is, concurrently and at most one
+    request per rate_limit_delay seconds. Successful lookups are added to the
+    service cache, which is saved once at the end, and failures go to its
+    negative cache.
+    """
+    if geo_service is None:
+        geo_service = get_geo_service()
+
+    unique_ips = pd.unique(pd.Series(ips).dropna())
+    records = {}
+    misses = []
+    added = 0
+    for ip in unique_ips:
+        ip_str = str(ip)
+        record = geo_service.cached_location(ip_str)
+        if record is None:
+            record = geo_service.lookup_offline(ip_str)
+            if record is None:
+                misses.append(ip)
+                continue
+            added += 1
+        records[ip] = record
+
+    if misses:
+        print(f"Fetching geolocation data for {len(misses)} uncached IPs...")
+        rate_limiter = TokenBucket(
+            1 / rate_limit_delay if rate_limit_delay > 0 else None, capacity=1
+        )
+        fetched = geo_service.fetch_remote_many(
+            [str(ip) for ip in misses],
+            fetch=_fetch_ip_record,
+            rate_limiter=rate_limiter,
+        )
+        for ip in misses:
+            records[ip] = fetched[str(ip)]
+        added += sum(record is not None for record in fetched.values())
+
+    if added:
+        geo_service.flush()
+
+    return pd.DataFrame(
+        [_feature_values(ip, records[ip]) for ip in unique_ips],
+        index=pd.Index(unique_ips),
+        columns=list(GEO_FEATURES),
+        dtype=object,
+    )
+
+
+def _add_geolocation_features(df, ip_col, prefix, rate_limit_delay, geo_service):
+    """Join the per-IP feature table back to the rows through factorize codes."""
+    df = df.copy()
+
+    codes, uniques = pd.factorize(df[ip_col])
+    table = resolve_ip_geolocation(uniques, geo_service, rate_limit_delay)
+    table = table.reindex(uniques)
+
+    for name in GEO_FEATURES:
+        # The extra trailing slot is taken by missing IPs (code -1)
+        values = np.append(table[name].to_numpy(dtype=object), "unknown")
+        df[f"{prefix}_{name}"] = values[codes]
+
+    return df
+
+
 def calculate_src_ip_geolocation_features(
-    df, src_ip_col="source_ip", rate_limit_delay=0.1
+    df, src_ip_col="source_ip", rate_limit_delay=0.1, geo_service=None
 ):
     """
-    Calculate geolocation features for source IPs using ipwho.is API.
+    Calculate geolocation features for source IPs.
 
     Creates features:
     - src_ip_type: IPv4 or IPv6
@@ -33,89 +158,21 @@ def calculate_src_ip_geolocation_features(
     - src_longitude: Geographic longitude
     - src_isp: Internet Service Provider name
 
+    Lookups go through resolve_ip_geolocation, so only IPs missing from the
+    shared cache and the GeoLite2 database reach the ipwho.is API.
+
     Note: Missing values are set to 'unknown' instead of None/NaN
     """
-
-    df = df.copy()
-
-    # Get unique IPs to minimize API calls
-    unique_ips = df[src_ip_col].unique()
-
-    # Create lookup dictionary for unique IPs
-    geo_lookup = {}
-
-    print(f"Fetching geolocation data for {len(unique_ips)} unique source IPs...")
-
-    for i, ip in enumerate(unique_ips):
-        # Fetch IP info
-        ip_info = calculate_ip_info(ip)
-
-        # Extract only the specified fields from response
-        if ip_info.get("success", False):
-            geo_lookup[ip] = {
-                "src_ip_type": ip_info.get("type") or "unknown",
-                "src_continent": ip_info.get("continent") or "unknown",
-                "src_country": ip_info.get("country") or "unknown",
-                "src_region": ip_info.get("region") or "unknown",
-                "src_city": ip_info.get("city") or "unknown",
-                "src_latitude": (
-                    ip_info.get("latitude")
-                    if ip_info.get("latitude") is not None
-                    else "unknown"
-                ),
-                "src_longitude": (
-                    ip_info.get("longitude")
-                    if ip_info.get("longitude") is not None
-                    else "unknown"
-                ),
-                "src_isp": (
-                    ip_info.get("connection", {}).get("isp")
-                    if isinstance(ip_info.get("connection"), dict)
-                    else None
-                )
-                or "unknown",
-            }
-        else:
-            # API call failed or IP not found
-            geo_lookup[ip] = {
-                "src_ip_type": "unknown",
-                "src_continent": "unknown",
-                "src_country": "unknown",
-                "src_region": "unknown",
-                "src_city": "unknown",
-                "src_latitude": "unknown",
-                "src_longitude": "unknown",
-                "src_isp": "unknown",
-            }
-
-        # Rate limiting: wait between requests
-        if i < len(unique_ips) - 1:  # Don't wait after last request
-            time.sleep(rate_limit_delay)
-
-        # Progress indicator
-        if (i + 1) % 10 == 0:
-            print(f"Processed {i + 1}/{len(unique_ips)} source IPs...")
-
-    print("Source IP geolocation lookup complete!")
-
-    # Map geolocation data back to dataframe
-    df["src_ip_type"] = df[src_ip_col].map(lambda ip: geo_lookup[ip]["src_ip_type"])
-    df["src_continent"] = df[src_ip_col].map(lambda ip: geo_lookup[ip]["src_continent"])
-    df["src_country"] = df[src_ip_col].map(lambda ip: geo_lookup[ip]["src_country"])
-    df["src_region"] = df[src_ip_col].map(lambda ip: geo_lookup[ip]["src_region"])
-    df["src_city"] = df[src_ip_col].map(lambda ip: geo_lookup[ip]["src_city"])
-    df["src_latitude"] = df[src_ip_col].map(lambda ip: geo_lookup[ip]["src_latitude"])
-    df["src_longitude"] = df[src_ip_col].map(lambda ip: geo_lookup[ip]["src_longitude"])
-    df["src_isp"] = df[src_ip_col].map(lambda ip: geo_lookup[ip]["src_isp"])
-
-    return df
+    return _add_geolocation_features(
+        df, src_ip_col, "src", rate_limit_delay, geo_service
+    )
 
 
 def calculate_dst_ip_geolocation_features(
-    df, dst_ip_col="destination_ip", rate_limit_delay=0.1
+    df, dst_ip_col="destination_ip", rate_limit_delay=0.1, geo_service=None
 ):
     """
-    Calculate geolocation features for destination IPs using ipwho.is API.
+    Calculate geolocation features for destination IPs.
 
     Creates features:
     - dst_ip_type: IPv4 or IPv6
@@ -127,79 +184,11 @@ def calculate_dst_ip_geolocation_features(
     - dst_longitude: Geographic longitude
     - dst_isp: Internet Service Provider name
 
+    Lookups go through resolve_ip_geolocation, so only IPs missing from the
+    shared cache and the GeoLite2 database reach the ipwho.is API.
+
     Note: Missing values are set to 'unknown' instead of None/NaN
     """
-
-    df = df.copy()
-
-    # Get unique IPs to minimize API calls
-    unique_ips = df[dst_ip_col].unique()
-
-    # Create lookup dictionary for unique IPs
-    geo_lookup = {}
-
-    print(f"Fetching geolocation data for {len(unique_ips)} unique destination IPs...")
-
-    for i, ip in enumerate(unique_ips):
-        # Fetch IP info
-        ip_info = calculate_ip_info(ip)
-
-        # Extract only the specified fields from response
-        if ip_info.get("success", False):
-            geo_lookup[ip] = {
-                "dst_ip_type": ip_info.get("type") or "unknown",
-                "dst_continent": ip_info.get("continent") or "unknown",
-                "dst_country": ip_info.get("country") or "unknown",
-                "dst_region": ip_info.get("region") or "unknown",
-                "dst_city": ip_info.get("city") or "unknown",
-                "dst_latitude": (
-                    ip_info.get("latitude")
-                    if ip_info.get("latitude") is not None
-                    else "unknown"
-                ),
-                "dst_longitude": (
-                    ip_info.get("longitude")
-                    if ip_info.get("longitude") is not None
-                    else "unknown"
-                ),
-                "dst_isp": (
-                    ip_info.get("connection", {}).get("isp")
-                    if isinstance(ip_info.get("connection"), dict)
-                    else None
-                )
-                or "unknown",
-            }
-        else:
-            # API call failed or IP not found
-            geo_lookup[ip] = {
-                "dst_ip_type": "unknown",
-                "dst_continent": "unknown",
-                "dst_country": "unknown",
-                "dst_region": "unknown",
-                "dst_city": "unknown",
-                "dst_latitude": "unknown",
-                "dst_longitude": "unknown",
-                "dst_isp": "unknown",
-            }
-
-        # Rate limiting: wait between requests
-        if i < len(unique_ips) - 1:  # Don't wait after last request
-            time.sleep(rate_limit_delay)
-
-        # Progress indicator
-        if (i + 1) % 10 == 0:
-            print(f"Processed {i + 1}/{len(unique_ips)} destination IPs...")
-
-    print("Destination IP geolocation lookup complete!")
-
-    # Map geolocation data back to dataframe
-    df["dst_ip_type"] = df[dst_ip_col].map(lambda ip: geo_lookup[ip]["dst_ip_type"])
-    df["dst_continent"] = df[dst_ip_col].map(lambda ip: geo_lookup[ip]["dst_continent"])
-    df["dst_country"] = df[dst_ip_col].map(lambda ip: geo_lookup[ip]["dst_country"])
-    df["dst_region"] = df[dst_ip_col].map(lambda ip: geo_lookup[ip]["dst_region"])
-    df["dst_city"] = df[dst_ip_col].map(lambda ip: geo_lookup[ip]["dst_city"])
-    df["dst_latitude"] = df[dst_ip_col].map(lambda ip: geo_lookup[ip]["dst_latitude"])
-    df["dst_longitude"] = df[dst_ip_col].map(lambda ip: geo_lookup[ip]["dst_longitude"])
-    df["dst_isp"] = df[dst_ip_col].map(lambda ip: geo_lookup[ip]["dst_isp"])
-
-    return df
+    return _add_geolocation_features(
+        df, dst_ip_col, "dst", rate_limit_delay, geo_service
+    )
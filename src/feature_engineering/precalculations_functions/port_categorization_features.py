@@ -1,21 +1,109 @@
+import numpy as np
+import pandas as pd
+
+COMMON_PORTS = frozenset([80, 443, 22, 21, 25, 53, 3389])
+
+# Ports 0-65535, index 65536 is the slot of missing/invalid ports (always 0)
+N_PORTS = 65536
+INVALID_PORT = N_PORTS
+
+# Port categories available to calculate_port_categorization(categories=...)
+DEFAULT_PORT_CATEGORIES = {
+    "well_known": range(0, 1024),
+    "registered": range(1024, 49152),
+    "dynamic": range(49152, N_PORTS),
+    "honeypot_service": [
+        21,
+        22,
+        23,
+        25,
+        80,
+        110,
+        143,
+        443,
+        445,
+        1433,
+        3306,
+        3389,
+        5900,
+        8080,
+    ],
+}
+
+
+def build_port_table(ports):
+    """Boolean lookup table indexed by port, with the invalid-port slot False."""
+    table = np.zeros(N_PORTS + 1, dtype=bool)
+    table[np.asarray(list(ports), dtype=np.int64)] = True
+    table[INVALID_PORT] = False
+    return table
+
+
+COMMON_PORT_TABLE = build_port_table(COMMON_PORTS)
+
+
 def is_port_common(port):
     """
     Check if port is common
     """
     try:
-        return port in [80, 443, 22, 21, 25, 53, 3389]
-    except (ValueError, AttributeError):
+        return port in COMMON_PORTS
+    except (TypeError, ValueError, AttributeError):
         return False  # Invalid port or NaN
 
 
-def calculate_port_categorization(df, dst_port_col="destination_port"):
+def _as_port(value):
+    """Integer port of a scalar, INVALID_PORT if it is not a number in 0-65535."""
+    if not isinstance(value, (int, float, np.integer, np.floating)):
+        return INVALID_PORT
+    if not np.isfinite(value) or value != int(value) or not 0 <= value < N_PORTS:
+        return INVALID_PORT
+    return int(value)
+
+
+def port_indices(ports):
+    """
+    Row indices into a port table: the port itself, or INVALID_PORT for
+    missing, non-integral or out of range values. Handles int, float,
+    nullable Int64 and object columns (the latter per unique value).
+    """
+    if pd.api.types.is_integer_dtype(ports.dtype):
+        indices = ports.to_numpy(dtype=np.int64, na_value=INVALID_PORT)
+    elif pd.api.types.is_float_dtype(ports.dtype):
+        values = ports.to_numpy(dtype=float, na_value=np.nan)
+        integral = np.isfinite(values) & (values == np.floor(values))
+        indices = np.where(integral, values, INVALID_PORT).astype(np.int64)
+    else:
+        codes, uniques = pd.factorize(ports)
+        unique_indices = np.fromiter(
+            (_as_port(value) for value in uniques), dtype=np.int64, count=len(uniques)
+        )
+        unique_indices = np.append(unique_indices, INVALID_PORT)
+        # Missing values have code -1, i.e. the INVALID_PORT appended last
+        indices = unique_indices[codes]
+
+    indices[(indices < 0) | (indices > N_PORTS)] = INVALID_PORT
+    return indices
+
+
+def calculate_port_categorization(
+    df, dst_port_col="destination_port", inplace=False, categories=None
+):
     """
     Calculate:
-    - dst_port_is_common: 1 if port is in [80, 443, 22, 21, 53, 3389]
+    - dst_port_is_common: 1 if port is in [80, 443, 22, 21, 25, 53, 3389]
+    - dst_port_is_<name>: 1 if port is in categories[name], for each category
+      passed (e.g. DEFAULT_PORT_CATEGORIES)
+    With inplace=True the columns are added to df without copying it.
     """
 
-    df = df.copy()
+    if not inplace:
+        df = df.copy()
+
+    indices = port_indices(df[dst_port_col])
+    df["dst_port_is_common"] = COMMON_PORT_TABLE[indices].astype(int)
 
-    df["dst_port_is_common"] = df[dst_port_col].apply(is_port_common).astype(int)
+    for name, ports in (categories or {}).items():
+        df[f"dst_port_is_{name}"] = build_port_table(ports)[indices].astype(int)
 
     return df
@@ -1,5 +1,9 @@
 import numpy as np
 
+from src.feature_engineering.precalculations_functions.traffic_totals import (
+    calculate_traffic_totals,
+)
+
 
 def calculate_rate_features(
     df,
@@ -8,29 +12,34 @@ def calculate_rate_features(
     pkts_sent_col="pkts_sent",
     pkts_received_col="pkts_received",
     duration_col="duration",
+    inplace=False,
+    totals=None,
 ):
     """
     Calculate rate-based features: bytes/sec, packets/sec, bytes/packet
+    With inplace=True the columns are added to df without copying it.
+    totals can pass precomputed calculate_traffic_totals output.
     """
-    df = df.copy()
+    if not inplace:
+        df = df.copy()
 
     # Calculate totals
-    df["total_bytes"] = df[bytes_sent_col] + df[bytes_received_col]
-    df["total_packets"] = df[pkts_sent_col] + df[pkts_received_col]
+    if totals is None:
+        totals = calculate_traffic_totals(
+            df, bytes_sent_col, bytes_received_col, pkts_sent_col, pkts_received_col
+        )
+    total_bytes = totals["total_bytes"]
+    total_packets = totals["total_packets"]
 
     # Calculate rates (avoid division by zero)
     df["bytes_per_second"] = np.where(
-        df[duration_col] > 0, df["total_bytes"] / df[duration_col], 0
+        df[duration_col] > 0, total_bytes / df[duration_col], 0
     )
 
     df["packets_per_second"] = np.where(
-        df[duration_col] > 0, df["total_packets"] / df[duration_col], 0
-    )
-
-    df["bytes_per_packet"] = np.where(
-        df["total_packets"] > 0, df["total_bytes"] / df["total_packets"], 0
+        df[duration_col] > 0, total_packets / df[duration_col], 0
     )
 
-    df = df.drop(columns=["total_bytes", "total_packets"])
+    df["bytes_per_packet"] = np.where(total_packets > 0, total_bytes / total_packets, 0)
 
     return df
@@ -1,5 +1,9 @@
 import numpy as np
 
+from src.feature_engineering.precalculations_functions.traffic_totals import (
+    calculate_traffic_totals,
+)
+
 
 def calculate_ratio_features(
     df,
@@ -7,25 +11,32 @@ def calculate_ratio_features(
     bytes_received_col="bytes_received",
     pkts_sent_col="pkts_sent",
     pkts_received_col="pkts_received",
+    inplace=False,
+    totals=None,
 ):
     """
     Calculate ratio-based features: bytes_sent/total_bytes, packets_sent/total_packets
+    With inplace=True the columns are added to df without copying it.
+    totals can pass precomputed calculate_traffic_totals output.
     """
-    df = df.copy()
+    if not inplace:
+        df = df.copy()
 
     # Calculate totals
-    df["total_bytes"] = df[bytes_sent_col] + df[bytes_received_col]
-    df["total_packets"] = df[pkts_sent_col] + df[pkts_received_col]
+    if totals is None:
+        totals = calculate_traffic_totals(
+            df, bytes_sent_col, bytes_received_col, pkts_sent_col, pkts_received_col
+        )
+    total_bytes = totals["total_bytes"]
+    total_packets = totals["total_packets"]
 
     # Calculate ratios (avoid division by zero)
     df["bytes_sent_ratio"] = np.where(
-        df["total_bytes"] > 0, df[bytes_sent_col] / df["total_bytes"], 0
+        total_bytes > 0, df[bytes_sent_col] / total_bytes, 0
     )
 
     df["packets_sent_ratio"] = np.where(
-        df["total_packets"] > 0, df[pkts_sent_col] / df["total_packets"], 0
+        total_packets > 0, df[pkts_sent_col] / total_packets, 0
     )
 
-    df = df.drop(columns=["total_bytes", "total_packets"])
-
     return df
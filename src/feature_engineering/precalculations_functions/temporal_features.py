@@ -1,26 +1,116 @@
+import numpy as np
 import pandas as pd
+from pandas.tseries.api import guess_datetime_format
 
+NS_PER_HOUR = 3_600_000_000_000
+NS_PER_DAY = 24 * NS_PER_HOUR
 
-def calculate_temporal_features(df, timestamp_col="timestamp_start"):
+# 1970-01-01 was a Thursday (Monday=0)
+EPOCH_DAY_OF_WEEK = 3
+
+
+def parse_timestamps(values, timestamp_format=None):
+    """
+    Parse a Series of timestamp strings, each distinct string only once.
+    Uses timestamp_format, or the format guessed from the first value; values
+    not matching it are retried as ISO8601, then with per-value inference.
+    """
+    codes, uniques = pd.factorize(values)
+    uniques = pd.Series(uniques, dtype=object)
+
+    if timestamp_format is None and len(uniques):
+        timestamp_format = guess_datetime_format(str(uniques.iloc[0]))
+
+    if timestamp_format is None:
+        parsed = pd.to_datetime(uniques, format="mixed")
+    else:
+        parsed = pd.to_datetime(uniques, format=timestamp_format, errors="coerce")
+        for fallback in ("ISO8601", "mixed"):
+            failed = parsed.isna()
+            if not failed.any():
+                break
+            parsed[failed] = pd.to_datetime(
+                uniques[failed],
+                format=fallback,
+                errors="coerce" if fallback == "ISO8601" else "raise",
+            )
+
+    parsed_index = pd.DatetimeIndex(parsed)
+    return pd.Series(
+        parsed_index.take(codes, allow_fill=True, fill_value=pd.NaT),
+        index=values.index,
+        name=values.name,
+    )
+
+
+def _wall_clock_ns(timestamps, timezone=None):
+    """
+    Local wall-clock time as int64 nanoseconds since the epoch (NaT stays NaT).
+    With timezone, tz-naive timestamps are taken as UTC and converted to it.
+    """
+    if timezone is not None:
+        if timestamps.dt.tz is None:
+            timestamps = timestamps.dt.tz_localize("UTC")
+        timestamps = timestamps.dt.tz_convert(timezone)
+    if timestamps.dt.tz is not None:
+        timestamps = timestamps.dt.tz_localize(None)
+    return timestamps.to_numpy(dtype="datetime64[ns]").view(np.int64)
+
+
+def calculate_temporal_features(
+    df,
+    timestamp_col="timestamp_start",
+    inplace=False,
+    timezone=None,
+    business_hours=(9, 17),
+    weekend_days=(5, 6),
+    timestamp_format=None,
+):
     """
     Calculate:
     - hour: Hour of day (0-23)
     - day_of_week: Day of week (0=Monday, 6=Sunday)
     - is_weekend: 1 if Saturday/Sunday, 0 otherwise
     - is_business_hours: 1 if weekday 9am-5pm, 0 otherwise
+    The calendar is configurable: timezone the features are computed in
+    (tz-naive timestamps are taken as UTC), business_hours as (first, last)
+    hour, both inclusive, and weekend_days as day_of_week values.
+    With inplace=True the columns are added to df without copying it.
     """
-    df = df.copy()
+    if not inplace:
+        df = df.copy()
 
     # Ensure timestamp is datetime
-    if not pd.api.types.is_datetime64_any_dtype(df[timestamp_col]):
-        df[timestamp_col] = pd.to_datetime(df[timestamp_col])
-
-    # Extract features
-    df["hour"] = df[timestamp_col].dt.hour
-    df["day_of_week"] = df[timestamp_col].dt.dayofweek
-    df["is_weekend"] = df["day_of_week"].isin([5, 6]).astype(int)
-    df["is_business_hours"] = (
-        (df["hour"] >= 9) & (df["hour"] <= 17) & (df["is_weekend"] == 0)
-    ).astype(int)
+    timestamps = df[timestamp_col]
+    if pd.api.types.is_object_dtype(timestamps) or pd.api.types.is_string_dtype(
+        timestamps
+    ):
+        df[timestamp_col] = parse_timestamps(timestamps, timestamp_format)
+    elif not pd.api.types.is_datetime64_any_dtype(timestamps):
+        df[timestamp_col] = pd.to_datetime(timestamps)
+
+    # Extract features from the epoch nanoseconds
+    ns = _wall_clock_ns(df[timestamp_col], timezone)
+    missing = ns == np.iinfo(np.int64).min
+    hour = (ns // NS_PER_HOUR % 24).astype(np.int32)
+    day_of_week = ((ns // NS_PER_DAY + EPOCH_DAY_OF_WEEK) % 7).astype(np.int32)
+
+    is_weekend = np.isin(day_of_week, weekend_days) & ~missing
+    is_business_hours = (
+        (hour >= business_hours[0])
+        & (hour <= business_hours[1])
+        & ~is_weekend
+        & ~missing
+    )
+
+    if missing.any():
+        # Same as the .dt accessor: NaN for missing timestamps
+        df["hour"] = np.where(missing, np.nan, hour)
+        df["day_of_week"] = np.where(missing, np.nan, day_of_week)
+    else:
+        df["hour"] = hour
+        df["day_of_week"] = day_of_week
+    df["is_weekend"] = is_weekend.astype(int)
+    df["is_business_hours"] = is_business_hours.astype(int)
 
     return df
@@ -0,0 +1,17 @@
+def calculate_traffic_totals(
+    df,
+    bytes_sent_col="bytes_sent",
+    bytes_received_col="bytes_received",
+    pkts_sent_col="pkts_sent",
+    pkts_received_col="pkts_received",
+):
+    """
+    Calculate the intermediates shared by the rate and ratio features:
+    - total_bytes: bytes sent + bytes received
+    - total_packets: packets sent + packets received
+    Returned as Series in a dict, not added to df.
+    """
+    return {
+        "total_bytes": df[bytes_sent_col] + df[bytes_received_col],
+        "total_packets": df[pkts_sent_col] + df[pkts_received_col],
+    }
@@ -0,0 +1,138 @@
+"""
+Compact scoring of a trained RBF One-Class SVM.
+The support vectors, dual coefficients and gamma are copied into contiguous
+float32 (or float64) arrays and the decision function is evaluated block by
+block with BLAS matrix products, optionally on a reduced set of support vectors.
+"""
+
+import numpy as np
+from sklearn.cluster import KMeans
+
+
+class CompactRBFScorer:
+    """
+    Decision function of an RBF One-Class SVM:
+    sum_i dual_coef[i] * exp(-gamma * ||x - sv_i||^2) + intercept.
+    Attributes:
+        support_vectors (ndarray): C-contiguous (n_sv, n_features), in the
+            compute dtype of the scorer (float32 by default).
+        dual_coef (ndarray): (n_sv,) coefficients, in the compute dtype.
+        gamma (float): RBF kernel coefficient.
+        intercept (float): Constant term of the decision function.
+        block_size (int): Rows scored per kernel block.
+        max_error (float): Largest score error measured against the exact
+            model when the set was reduced, 0.0 for the exact set.
+    """
+
+    def __init__(
+        self,
+        support_vectors,
+        dual_coef,
+        gamma,
+        intercept,
+        block_size=1024,
+        max_error=0.0,
+        dtype=np.float32,
+    ):
+        self.support_vectors = np.ascontiguousarray(support_vectors, dtype=dtype)
+        self.dual_coef = np.ascontiguousarray(dual_coef, dtype=dtype).ravel()
+        self.gamma = float(gamma)
+        self.intercept = float(intercept)
+        self.block_size = block_size
+        self.max_error = max_error
+        self._sv_norms = np.einsum(
+            "ij,ij->i", self.support_vectors, self.support_vectors
+        )
+
+    @classmethod
+    def from_model(cls, model, block_size=1024, dtype=np.float32):
+        """Exact scorer of a fitted sklearn OneClassSVM with an RBF kernel."""
+        if model.kernel != "rbf":
+            raise ValueError(f"Compact scoring needs an rbf kernel, got {model.kernel}")
+        return cls(
+            model.support_vectors_,
+            model.dual_coef_,
+            model._gamma,
+            model.intercept_[0],
+            block_size=block_size,
+            dtype=dtype,
+        )
+
+    @property
+    def n_support(self):
+        return len(self.dual_coef)
+
+    @property
+    def dtype(self):
+        return self.support_vectors.dtype
+
+    @property
+    def nbytes(self):
+        return self.support_vectors.nbytes + self.dual_coef.nbytes
+
+    def _kernel(self, X, vectors, vector_norms):
+        # exp(-gamma * (||x||^2 + ||v||^2 - 2 x.v)), one GEMM per block
+        sq_dist = X @ vectors.T
+        sq_dist *= -2.0
+        sq_dist += np.einsum("ij,ij->i", X, X)[:, None]
+        sq_dist += vector_norms[None, :]
+        np.maximum(sq_dist, 0.0, out=sq_dist)
+        sq_dist *= -self.gamma
+        return np.exp(sq_dist, out=sq_dist)
+
+    def decision_function(self, X):
+        """
+        Decision scores of X, as float64 like the sklearn model.
+        X is only copied when it is not a C-contiguous array of the scorer dtype.
+        """
+        X = np.ascontiguousarray(X, dtype=self.dtype)
+        scores = np.empty(len(X), dtype=np.float64)
+        for start in range(0, len(X), self.block_size):
+            block = X[start : start + self.block_size]
+            kernel = self._kernel(block, self.support_vectors, self._sv_norms)
+            scores[start : start + len(block)] = kernel @ self.dual_coef
+        scores += self.intercept
+        return scores
+
+    def reduce(self, X, max_score_error, min_size=16, random_state=42):
+        """
+        Scorer on a reduced set of support vectors, or self if none fits.
+        The support vectors are clustered with KMeans, weighted by their
+        coefficient, and the coefficients of the cluster centres are fitted
+        by least squares to the exact scores of half of X. The set size
+        doubles until the largest error on the other half of X is within
+        max_score_error.
+        """
+        X = np.ascontiguousarray(X, dtype=self.dtype)
+        exact = self.decision_function(X)
+        fit_rows, check_rows = X[::2], X[1::2]
+        target = exact[::2] - self.intercept
+
+        size = min_size
+        while size < min(self.n_support, len(fit_rows)):
+            centres = (
+                KMeans(n_clusters=size, n_init=1, random_state=random_state)
+                .fit(self.support_vectors, sample_weight=np.abs(self.dual_coef))
+                .cluster_centers_.astype(self.dtype)
+            )
+            norms = np.einsum("ij,ij->i", centres, centres)
+            coef, *_ = np.linalg.lstsq(
+                self._kernel(fit_rows, centres, norms), target, rcond=None
+            )
+            reduced = CompactRBFScorer(
+                centres,
+                coef,
+                self.gamma,
+                self.intercept,
+                self.block_size,
+                dtype=self.dtype,
+            )
+            error = float(
+                np.max(np.abs(reduced.decision_function(check_rows) - exact[1::2]))
+            )
+            if error <= max_score_error:
+                reduced.max_error = error
+                return reduced
+            size *= 2
+
+        return self
@@ -1,5 +1,6 @@
 from collections import deque
 
+import numpy as np
 from river import drift
 
 # Prometheus metrics (optional - graceful fallback if not available)
@@ -34,6 +35,35 @@ class DriftDetector:
         )
 
     def update(self, is_anomaly):
+        drift_occurred = self._step(is_anomaly)
+
+        # Update metrics
+        if METRICS_ENABLED:
+            self._publish_metrics(int(drift_occurred))
+
+        return drift_occurred
+
+    def update_many(self, is_anomaly):
+        # Feed a batch of predictions, publishing the metrics once per batch.
+        # Returns a boolean array, True where drift was detected
+        flags = np.asarray(is_anomaly, dtype=bool)
+        drifts = np.fromiter(
+            (self._step(flag) for flag in flags.tolist()), dtype=bool, count=len(flags)
+        )
+
+        if METRICS_ENABLED and len(flags):
+            self._publish_metrics(int(drifts.sum()))
+
+        return drifts
+
+    def _publish_metrics(self, drift_count):
+        anomaly_rate_gauge.set(self.get_current_anomaly_rate())
+        samples_since_drift.set(self.processed_samples)
+        if drift_count:
+            drift_detected_total.inc(drift_count)
+        drift_detected_flag.set(1 if self.drift_detected else 0)
+
+    def _step(self, is_anomaly):
         # Convert boolean to integer (1 for Anomaly, 0 for Benign)
         val = 1 if is_anomaly else 0
 
@@ -44,11 +74,6 @@ class DriftDetector:
         # Feed the binary value to ADWIN
         self.adwin.update(val)
 
-        # Update metrics
-        if METRICS_ENABLED:
-            anomaly_rate_gauge.set(self.get_current_anomaly_rate())
-            samples_since_drift.set(self.processed_samples)
-
         # Check for drift using multiple methods
         drift_occurred = False
 
@@ -76,9 +101,6 @@ class DriftDetector:
         if drift_occurred:
             self.drift_detected = True
             self.last_drift_sample = self.processed_samples
-            if METRICS_ENABLED:
-                drift_detected_total.inc()
-                drift_detected_flag.set(1)
             return True
 
         # If we just did a check (every check_interval) and no drift was found
@@ -90,15 +112,11 @@ class DriftDetector:
             if self.last_drift_sample is None:
                 # No drift ever detected, stay stable
                 self.drift_detected = False
-                if METRICS_ENABLED:
-                    drift_detected_flag.set(0)
             else:
                 samples_since_last = self.processed_samples - self.last_drift_sample
                 if samples_since_last >= self.min_unstable_duration:
                     # Enough time passed, back to stable
                     self.drift_detected = False
-                    if METRICS_ENABLED:
-                        drift_detected_flag.set(0)
                 # else: stay UNSTABLE until min_unstable_duration passes
 
         return False
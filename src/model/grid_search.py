@@ -1,6 +1,5 @@
 import numpy as np
 from sklearn.metrics import f1_score
-from sklearn.svm import OneClassSVM
 
 
 class GridSearchOptimizer:
@@ -31,7 +30,7 @@ class GridSearchOptimizer:
 
         # Fit preprocessor
         self.model.preprocessor.fit(X_benign)
-        X_processed = self.model.preprocessor.transform(X_benign)
+        X_processed = self.model._transform(X_benign)
 
         # Define parameter grid
         param_grid = self._get_parameter_grid()
@@ -93,7 +92,7 @@ class GridSearchOptimizer:
                 print(f"\n[{i+1}/{len(param_combinations)}] Testing: {params}")
 
                 # Create and train model
-                model = OneClassSVM(**params)
+                model = self.model._build_estimator(**params, X=X_processed)
                 model.fit(X_processed)
 
                 # Evaluate model
@@ -130,7 +129,7 @@ class GridSearchOptimizer:
             y_true = test_sample["label"]
 
             # Get predictions
-            X_test_processed = self.model.preprocessor.transform(X_test)
+            X_test_processed = self.model._transform(X_test)
             predictions = model.predict(X_test_processed)
 
             # Convert to binary
@@ -7,8 +7,7 @@ if str(project_root) not in sys.path:
     sys.path.insert(0, str(project_root))
 
 
-import pandas as pd
-
+from src.feature_engineering.df_formatting.dataset_cache import load_csv_with_cache
 from src.model.grid_search import GridSearchOptimizer
 from src.model.oneCSVM_model import OneClassSVMModel
 from src.model.simulation_evaluation import SimulationEvaluator
@@ -21,8 +20,8 @@ def load_datasets():
 
     print("1. Loading Datasets...")
     try:
-        df_benign = pd.read_csv(data_path / "normal_traffic_formatted.csv")
-        df_combined = pd.read_csv(data_path / "combined_shuffled_dataset.csv")
+        df_benign = load_csv_with_cache(data_path / "normal_traffic_formatted.csv")
+        df_combined = load_csv_with_cache(data_path / "combined_shuffled_dataset.csv")
         print(f" -> Loaded {len(df_benign)} benign, {len(df_combined)} combined")
 
         # Ensure benign label column exists
@@ -8,7 +8,10 @@ import joblib
 import numpy as np
 import pandas as pd
 from sklearn.compose import ColumnTransformer
+from sklearn.kernel_approximation import Nystroem
+from sklearn.linear_model import SGDOneClassSVM
 from sklearn.model_selection import train_test_split
+from sklearn.pipeline import Pipeline
 from sklearn.preprocessing import OneHotEncoder, RobustScaler
 from sklearn.svm import OneClassSVM
 
@@ -18,6 +21,7 @@ try:
         anomalies_detected_total,
         decision_score_histogram,
         model_retrain_total,
+        observe_batch,
         prediction_latency,
         predictions_total,
         retrain_buffer_size,
@@ -34,19 +38,58 @@ project_root = Path(__file__).resolve().parents[2]
 if str(project_root) not in sys.path:
     sys.path.insert(0, str(project_root))
 
+from src.model.compact_scorer import CompactRBFScorer  # noqa: E402
+
+# Severity levels by band code of predict_batch, most severe first
+SEVERITY_LEVELS = np.array(["RED", "ORANGE", "GREEN"], dtype=object)
+SEVERITY_DESCRIPTIONS = np.array(
+    [
+        "CRITICAL: Far outside normal boundary",
+        "SUSPICIOUS: Just outside boundary",
+        "Normal",
+    ],
+    dtype=object,
+)
+
+
+# Training engines: exact libsvm solver, or a Nystroem kernel approximation
+# followed by a linear One-Class SVM trained with SGD
+ENGINES = ("libsvm", "sgd")
+
 
 class OneClassSVMModel:
-    def __init__(self, nu=0.5, kernel="rbf", gamma="scale"):
+    def __init__(
+        self,
+        nu=0.5,
+        kernel="rbf",
+        gamma="scale",
+        engine="libsvm",
+        n_components=500,
+        compact_scoring=True,
+        max_score_error=None,
+        compute_dtype="float32",
+    ):
+        if engine not in ENGINES:
+            raise ValueError(f"Unknown engine {engine!r}, expected one of {ENGINES}")
 
         self.random_state = 42
+        self.engine = engine
+        self.params = {"nu": nu, "kernel": kernel, "gamma": gamma}
+        # Size of the Nystroem feature map of the sgd engine
+        self.n_components = n_components
 
         # One-Class SVM (Kernel='rbf' is standard for non-linear boundaries)
-        self.model = OneClassSVM(
-            kernel=kernel,
-            nu=nu,
-            gamma=gamma,
-            verbose=True,  # Useful to see progress as SVM is slow
-        )
+        self.model = self._build_estimator(**self.params)
+
+        # Compact float32 scorer of a trained rbf libsvm model, see compact().
+        # max_score_error allows a reduced support-vector set within that
+        # absolute score error on the validation set
+        self.compact_scoring = compact_scoring
+        self.max_score_error = max_score_error
+        self.scorer = None
+
+        # dtype of the preprocessed feature matrices and of compact scoring
+        self.compute_dtype = np.dtype(compute_dtype)
 
         self.preprocessor = None
         self.threshold_boundary = 0.0
@@ -68,6 +111,73 @@ class OneClassSVMModel:
             maxlen=5000
         )  # Store recent samples for potential retraining
 
+    def _build_estimator(self, nu, kernel, gamma, X=None):
+        # Unfitted estimator of the configured engine. Nystroem has no
+        # "scale" heuristic, so the sgd engine resolves it from X
+        if self.engine == "libsvm":
+            return OneClassSVM(
+                kernel=kernel,
+                nu=nu,
+                gamma=gamma,
+                verbose=True,  # Useful to see progress as SVM is slow
+            )
+
+        if gamma == "scale" and X is not None:
+            variance = X.var()
+            gamma = 1.0 / (X.shape[1] * variance) if variance > 0 else 1.0
+        elif gamma in ("scale", "auto"):
+            gamma = None  # 1 / n_features
+
+        return Pipeline(
+            [
+                (
+                    "kernel",
+                    Nystroem(
+                        kernel=kernel,
+                        gamma=gamma,
+                        n_components=self.n_components,
+                        random_state=self.random_state,
+                    ),
+                ),
+                ("svm", SGDOneClassSVM(nu=nu, random_state=self.random_state)),
+            ]
+        )
+
+    def compact(self, X_calibration=None):
+        # Extract the trained rbf model into a CompactRBFScorer, reduced when
+        # max_score_error is set and calibration rows are given
+        self.scorer = None
+        if (
+            not self.compact_scoring
+            or self.engine != "libsvm"
+            or self.model.kernel != "rbf"
+        ):
+            return None
+
+        scorer = CompactRBFScorer.from_model(self.model, dtype=self.compute_dtype)
+        if self.max_score_error is not None and X_calibration is not None:
+            scorer = scorer.reduce(X_calibration, self.max_score_error)
+            print(
+                f" -> Compact scorer: {scorer.n_support} of "
+                f"{len(self.model.support_vectors_)} support vectors, "
+                f"max score error {scorer.max_error:.4f}"
+            )
+        self.scorer = scorer
+        return scorer
+
+    def _transform(self, X):
+        # Preprocessed features as a C-contiguous compute_dtype matrix, no
+        # copy when the transformer already produced one
+        return np.asarray(
+            self.preprocessor.transform(X), dtype=self.compute_dtype, order="C"
+        )
+
+    def _decision_function(self, X):
+        # Decision scores, from the compact scorer when there is one
+        if self.scorer is not None:
+            return self.scorer.decision_function(X)
+        return self.model.decision_function(X)
+
     def add_to_buffer(self, df_chunk):
         # Storing recent data for potential retraining
         for _, row in df_chunk.iterrows():
@@ -138,7 +248,11 @@ class OneClassSVMModel:
                 ("num", RobustScaler(), self.num_features),
                 (
                     "cat",
-                    OneHotEncoder(handle_unknown="ignore", sparse_output=False),
+                    OneHotEncoder(
+                        handle_unknown="ignore",
+                        sparse_output=False,
+                        dtype=self.compute_dtype,
+                    ),
                     [col for col in self.cat_features if col in df.columns],
                 ),
             ]
@@ -163,6 +277,11 @@ class OneClassSVMModel:
                 "cat_features": self.cat_features,
                 "num_features": self.num_features,
                 "random_state": self.random_state,
+                "engine": self.engine,
+                "n_components": self.n_components,
+                "params": self.params,
+                "scorer": self.scorer,
+                "compute_dtype": self.compute_dtype.name,
             }
             with open(self.config_path, "wb") as f:
                 pickle.dump(config, f)
@@ -194,6 +313,16 @@ class OneClassSVMModel:
             self.cat_features = config["cat_features"]
             self.num_features = config["num_features"]
             self.random_state = config["random_state"]
+            # Configs saved before the sgd engine existed
+            self.engine = config.get("engine", "libsvm")
+            self.n_components = config.get("n_components", self.n_components)
+            self.params = config.get("params", self.params)
+            # Models saved before compute_dtype existed were float64
+            self.compute_dtype = np.dtype(config.get("compute_dtype", "float64"))
+            if "scorer" in config:
+                self.scorer = config["scorer"]
+            else:
+                self.compact()
 
             if "best_params" in config:
                 self.best_params = config["best_params"]
@@ -236,25 +365,34 @@ class OneClassSVMModel:
             X_benign, test_size=0.2, random_state=self.random_state
         )
 
-        # 2. Downsample for SVM Speed (Critical Step for Large Datasets)
-        if len(X_train) > max_train_samples:
+        # 2. Downsample for SVM Speed (Critical Step for Large Datasets).
+        # The sgd engine scales linearly and trains on the full split
+        if self.engine == "libsvm" and len(X_train) > max_train_samples:
             X_train = X_train.sample(
                 n=max_train_samples, random_state=self.random_state
             )
 
         # 3. Fit Preprocessor
         self.preprocessor.fit(X_train)
-        X_train_processed = self.preprocessor.transform(X_train)
+        X_train_processed = self._transform(X_train)
 
         # 4. Train SVM
+        if self.engine == "sgd":
+            self.model = self._build_estimator(**self.params, X=X_train_processed)
         print("[System] Training One-Class SVM (This may take a moment)...")
-        self.model.fit(X_train_processed)
+        if self.engine == "libsvm":
+            # libsvm only trains in float64, make its conversion copy explicit
+            self.model.fit(X_train_processed.astype(np.float64, copy=False))
+        else:
+            self.model.fit(X_train_processed)
         print("[System] Training Complete.")
 
+        X_val_processed = self._transform(X_val)
+        self.compact(X_val_processed)
+
         # 5. Calibrate Thresholds
         print("[System] Calibrating Threshold on Validation Set...")
-        X_val_processed = self.preprocessor.transform(X_val)
-        scores = self.model.decision_function(X_val_processed)
+        scores = self._decision_function(X_val_processed)
 
         self.threshold_boundary = np.percentile(scores, contamination * 100)
         print(f" -> Decision Boundary adjusted to: {self.threshold_boundary:.4f}")
@@ -266,53 +404,81 @@ class OneClassSVMModel:
         # 6. Save Model
         self.save_model()
 
-    def predict(self, row_data):
-        # Predicting distance scores and severity levels for new data
+    def predict_batch(self, row_data):
+        """
+        Severity of every row, as a DataFrame with the severity, description
+        and anomaly_score columns, indexed like row_data.
+        Severities are assigned with np.select over the threshold bands, and
+        the Prometheus counters get one increment per batch and severity.
+        """
         start_time = time.time()
 
         try:
-            X_processed = self.preprocessor.transform(row_data)
+            X_processed = self._transform(row_data)
         except Exception as e:
-            return [("ERROR", str(e), 0.0)] * len(row_data)
+            return pd.DataFrame(
+                {
+                    "severity": "ERROR",
+                    "description": str(e),
+                    "anomaly_score": 0.0,
+                },
+                index=row_data.index,
+            )
 
-        scores = self.model.decision_function(X_processed)
+        scores = np.asarray(self._decision_function(X_processed), dtype=float)
 
-        results = []
-        for i in range(len(row_data)):
-            score = scores[i]
+        # Far outside the boundary -> RED, just outside -> ORANGE, else GREEN
+        codes = np.select(
+            [
+                scores < (self.threshold_boundary - 0.5),
+                scores < self.threshold_boundary,
+            ],
+            [0, 1],
+            default=2,
+        )
 
-            # Record decision score in histogram
-            if METRICS_ENABLED:
-                decision_score_histogram.observe(score)
-
-            # Distance logic
-            if score < self.threshold_boundary:
-                # Far outside the boundary -> High Severity
-                if score < (self.threshold_boundary - 0.5):
-                    results.append(
-                        ("RED", "CRITICAL: Far outside normal boundary", score)
-                    )
-                else:
-                    results.append(
-                        ("ORANGE", "SUSPICIOUS: Just outside boundary", score)
-                    )
-            else:
-                results.append(("GREEN", "Normal", score))
+        results = pd.DataFrame(
+            {
+                "severity": SEVERITY_LEVELS[codes],
+                "description": SEVERITY_DESCRIPTIONS[codes],
+                "anomaly_score": scores,
+            },
+            index=row_data.index,
+        )
 
         # Update metrics
         if METRICS_ENABLED:
+            observe_batch(decision_score_histogram, scores)
+
             duration = time.time() - start_time
             prediction_latency.observe(duration)
-            samples_processed_total.inc(len(row_data))
+            samples_processed_total.inc(len(scores))
 
-            for severity, _, _ in results:
-                predictions_total.labels(severity=severity).inc()
-                if severity != "GREEN":
-                    anomalies_detected_total.inc()
+            counts = np.bincount(codes, minlength=len(SEVERITY_LEVELS))
+            for severity, count in zip(SEVERITY_LEVELS, counts):
+                if count:
+                    predictions_total.labels(severity=severity).inc(int(count))
+            anomalies = int(counts[:-1].sum())
+            if anomalies:
+                anomalies_detected_total.inc(anomalies)
 
         return results
 
+    def predict(self, row_data):
+        # Predicting distance scores and severity levels for new data,
+        # as a list of (severity, description, score) tuples
+        results = self.predict_batch(row_data)
+        return list(
+            zip(
+                results["severity"].tolist(),
+                results["description"].tolist(),
+                results["anomaly_score"].tolist(),
+            )
+        )
+
     def update_model_parameters(self, best_params):
         # Update model with new parameters
         self.best_params = best_params
-        self.model = OneClassSVM(**best_params)
+        self.params = dict(best_params)
+        self.model = self._build_estimator(**best_params)
+        self.scorer = None
@@ -3,6 +3,7 @@ Prometheus metrics registry for Cyber Anomaly Detection system.
 Centralizes all metric definitions for ML model monitoring.
 """
 
+import numpy as np
 from prometheus_client import REGISTRY, Counter, Gauge, Histogram, Info, generate_latest
 
 # Track which metrics have been created to avoid duplicates
@@ -215,6 +216,41 @@ model_info = _get_or_create_info(
 )
 
 
+# Histogram internals of prometheus_client used for a batch update; without
+# them observe_batch falls back to Histogram.observe per value
+_HISTOGRAM_INTERNALS = ("_raise_if_not_observable", "_upper_bounds", "_buckets", "_sum")
+
+
+def observe_batch(histogram, values):
+    """
+    Observe many values in a histogram with one increment per bucket.
+    The values are binned with np.searchsorted against the upper bounds, the
+    same "value <= bound" rule as Histogram.observe. Every increment is atomic
+    as in observe(), but the batch as a whole is not: a concurrent scrape can
+    see part of it. Histograms without the expected internals get observe()
+    once per value.
+    """
+    values = np.asarray(values, dtype=float).ravel()
+    if not values.size:
+        return
+    if not all(hasattr(histogram, name) for name in _HISTOGRAM_INTERNALS):
+        for value in values.tolist():
+            histogram.observe(value)
+        return
+    histogram._raise_if_not_observable()
+
+    bounds = np.asarray(histogram._upper_bounds, dtype=float)
+    # NaN sorts past the last bound and, as with observe(), lands in no bucket
+    counts = np.bincount(
+        np.searchsorted(bounds, values, side="left"), minlength=len(bounds) + 1
+    )[: len(bounds)]
+
+    histogram._sum.inc(float(values.sum()))
+    for bucket, count in zip(histogram._buckets, counts.tolist()):
+        if count:
+            bucket.inc(count)
+
+
 def get_metrics():
     """Generate Prometheus metrics output"""
     return generate_latest(REGISTRY)
@@ -1,6 +1,8 @@
+import numpy as np
 import pandas as pd
 
 from src.feature_engineering.aggregation_functions import (
+    calculate_all_aggregation_features,
     calculate_total_anomalous_events,
     calculate_total_events_for_dst_ports,
     calculate_total_events_processed,
@@ -326,3 +328,60 @@ class TestAggregateStatusMetrics:
 
         # Check that original dataframe length is preserved
         assert len(result) == len(df)
+
+    def test_rows_without_timestamp(self):
+        """test that NaT rows get NaN/0 like rows missing from the window merge"""
+
+        df = pd.DataFrame(
+            {
+                "timestamp_start": pd.to_datetime(
+                    ["2025-01-06 10:00:00", None, "2025-01-06 10:30:00"]
+                ),
+                "source_ip": ["1.1.1.1", "2.2.2.2", "1.1.1.1"],
+                "destination_port": [80, 80, None],
+                "application_protocol": ["http", "http", "http"],
+                "label": ["malicious", "malicious", "normal"],
+            },
+            index=[10, 11, 12],
+        )
+
+        result = calculate_all_aggregation_features(df)
+
+        assert list(result.index) == [0, 1, 2]
+        assert result["events_in_window"].tolist()[0] == 2
+        assert np.isnan(result["events_in_window"].iloc[1])
+        assert np.isnan(result["burst_indicator"].iloc[1])
+        assert result["unique_malicious_ips"].tolist() == [1, 0, 1]
+        assert result["events_to_dst_port"].tolist() == [1, 0, 0]
+        assert result["total_events_for_protocol"].tolist() == [2, 0, 2]
+        assert result["malicious_ratio_for_protocol"].tolist() == [50.0, 0.0, 50.0]
+
+    def test_single_pass_matches_individual_functions(self):
+        """test that the shared engine equals chaining the six functions"""
+
+        rng = np.random.default_rng(0)
+        n = 500
+        df = pd.DataFrame(
+            {
+                "timestamp_start": pd.Timestamp("2025-01-06")
+                + pd.to_timedelta(rng.integers(0, 12 * 3600, n), unit="s"),
+                "source_ip": rng.choice(["1.1.1.1", "8.8.8.8", None], n),
+                "destination_port": rng.choice([22.0, 80.0, np.nan], n),
+                "application_protocol": rng.choice(["http", "dns", None], n),
+                "label": rng.choice(["normal", "malicious"], n, p=[0.9, 0.1]),
+            }
+        )
+        df.loc[::50, "timestamp_start"] = pd.NaT
+
+        chained = df
+        for function in (
+            calculate_total_events_processed,
+            calculate_total_anomalous_events,
+            calculate_total_unique_malicious_ips,
+            calculate_trend_percentage_change,
+            calculate_total_events_for_dst_ports,
+            calculate_total_malicious_events_per_protocol,
+        ):
+            chained = function(chained)
+
+        pd.testing.assert_frame_equal(calculate_all_aggregation_features(df), chained)
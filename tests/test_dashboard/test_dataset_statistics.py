@@ -0,0 +1,162 @@
+"""Tests for the materialized dataset statistics."""
+
+import sys
+from pathlib import Path
+from unittest.mock import patch
+
+import pandas as pd
+import pytest
+
+# Add project root to path
+sys.path.append(str(Path(__file__).parents[2]))
+
+from src.dashboard import flask_api
+from src.dashboard.dataset_statistics import DatasetStatistics
+
+
+@pytest.fixture
+def df_logs():
+    """Processed logs with the columns used by the stats endpoints."""
+    return pd.DataFrame(
+        {
+            "source_ip": ["1.1.1.1", "8.8.8.8", "1.1.1.1", "10.0.0.1"],
+            "destination_ip": ["10.0.0.1", "10.0.0.1", "10.0.0.2", "8.8.8.8"],
+            "destination_port": [22, 80, 22, 443],
+            "transport_protocol": ["TCP", "TCP", "UDP", "TCP"],
+            "label": ["malicious", "benign", "malicious", "benign"],
+            "direction": ["inbound", "inbound", "inbound", "outbound"],
+            "src_is_private": [0, 0, 0, 1],
+            "dst_is_private": [1, 1, 1, 0],
+            "dst_port_is_common": [1, 1, 1, 0],
+            "burst_indicator": [0, 1, 1, 0],
+            "hour": [3, 3, 14, 23],
+            "day_of_week": [0, 5, 6, 0],
+            "is_business_hours": [0, 0, 1, 0],
+            "is_weekend": [0, 1, 1, 0],
+            "bytes_per_second": [10.0, 20.0, 30.0, 40.0],
+            "packets_per_second": [1.0, 2.0, 3.0, 4.0],
+            "duration": [0.5, 1.0, 1.5, 2.0],
+            "bytes_sent_ratio": [0.1, 0.2, 0.3, 0.4],
+            "is_internal": [0, 0, 0, 0],
+        }
+    )
+
+
+class TestDatasetStatistics:
+    """Test DatasetStatistics payloads, versions and incremental updates."""
+
+    def test_payloads(self, df_logs):
+        """Test the payload values against direct pandas computations."""
+        stats = DatasetStatistics(df_logs)
+
+        summary = stats.payload("summary")
+        assert summary["total_records"] == 4
+        assert summary["malicious_count"] == 2
+        assert summary["protocols"] == {"TCP": 3, "UDP": 1}
+        assert summary["top_destination_ports"] == {22: 2, 80: 1, 443: 1}
+
+        network = stats.payload("network")
+        assert network["internal_external"]["External → Internal"] == 3
+        assert network["top_dest_ports"] == {"22": 2, "80": 1, "443": 1}
+        assert network["burst_events"] == 2
+        assert network["burst_ratio"] == 0.5
+
+        temporal = stats.payload("temporal")
+        assert temporal["by_hour"] == {3: 2, 14: 1, 23: 1}
+        assert temporal["by_day_of_week"] == {"Mon": 2, "Sat": 1, "Sun": 1}
+
+        traffic = stats.payload("traffic")
+        assert traffic["avg_bytes_per_second"] == df_logs["bytes_per_second"].mean()
+
+    def test_payload_computed_once(self, df_logs):
+        """Test that repeated requests reuse the materialized payload."""
+        stats = DatasetStatistics(df_logs)
+        first = stats.payload("summary")
+
+        with patch("src.dashboard.dataset_statistics._partials") as mock_partials:
+            assert stats.payload("summary") is first
+            stats.payload("network")
+            mock_partials.assert_not_called()
+
+    def test_append_matches_rebuild(self, df_logs):
+        """Test that appended rows give the same stats as a full rebuild."""
+        stats = DatasetStatistics(df_logs.iloc[:3])
+        stats.payload("summary")
+        etag = stats.etag
+
+        stats.append(df_logs.iloc[3:])
+        rebuilt = DatasetStatistics(df_logs)
+
+        assert stats.etag != etag
+        for name in ("summary", "network", "temporal", "traffic"):
+            assert stats.payload(name) == rebuilt.payload(name)
+
+
+class TestStatsEndpoints:
+    """Test ETag handling of the /api/stats/* endpoints."""
+
+    @pytest.mark.parametrize("name", ["summary", "network", "temporal", "traffic"])
+    def test_not_modified(self, df_logs, name):
+        """Test that a matching If-None-Match gets a 304 without computing."""
+        with (
+            patch.object(flask_api, "df_logs", df_logs),
+            patch.object(flask_api, "dataset_stats", DatasetStatistics(df_logs)),
+        ):
+            client = flask_api.app.test_client()
+            response = client.get(f"/api/stats/{name}")
+            etag = response.headers["ETag"]
+            assert response.status_code == 200
+
+            with patch.object(DatasetStatistics, "payload") as mock_payload:
+                cached = client.get(
+                    f"/api/stats/{name}", headers={"If-None-Match": etag}
+                )
+                mock_payload.assert_not_called()
+
+        assert cached.status_code == 304
+        assert cached.headers["ETag"] == etag
+
+    def test_appended_logs_are_served(self, df_logs):
+        """Test that rows added through the API update the served statistics."""
+        stats = DatasetStatistics(df_logs.iloc[:3])
+        with (
+            patch.object(flask_api, "df_logs", df_logs.iloc[:3]),
+            patch.object(flask_api, "dataset_stats", stats),
+            patch.object(flask_api, "logs_version", 0),
+            patch.object(flask_api, "ip_summary", None),
+        ):
+            client = flask_api.app.test_client()
+            first = client.get("/api/stats/summary")
+            assert first.get_json()["total_records"] == 3
+
+            appended = client.post(
+                "/api/logs/append", json=df_logs.iloc[3:].to_dict(orient="records")
+            )
+            assert appended.get_json() == {"appended": 1, "total_records": 4}
+
+            with patch.object(
+                flask_api, "DatasetStatistics", side_effect=AssertionError
+            ):
+                response = client.get(
+                    "/api/stats/summary",
+                    headers={"If-None-Match": first.headers["ETag"]},
+                )
+
+            assert flask_api.dataset_stats is stats
+            assert len(flask_api.df_logs) == 4
+
+        assert response.status_code == 200
+        summary = response.get_json()
+        assert summary["total_records"] == 4
+        assert summary["benign_count"] == 2
+        assert summary["protocols"] == {"TCP": 3, "UDP": 1}
+        assert response.headers["ETag"] == f'"{stats.etag}"'
+        assert response.headers["ETag"] != first.headers["ETag"]
+
+    def test_append_rejects_invalid_body(self):
+        """Test that the append endpoint only accepts a list of records."""
+        client = flask_api.app.test_client()
+
+        response = client.post("/api/logs/append", json={"source_ip": "1.1.1.1"})
+
+        assert response.status_code == 400
@@ -345,3 +345,88 @@ class TestCORSConfiguration:
         """Test Flask app is properly initialized."""
         assert flask_api.app is not None
         assert flask_api.app.name == "src.dashboard.flask_api"
+
+
+class TestBuildAlertsPayload:
+    """Test the column-wise alert construction of /api/alerts/recent."""
+
+    @pytest.fixture
+    def sample(self):
+        """Sampled logs with a shuffled index, as returned by DataFrame.sample."""
+        return pd.DataFrame(
+            {
+                "source_ip": ["192.168.1.1", "10.0.0.2", "8.8.8.8", None],
+                "destination_ip": ["8.8.8.8", "1.1.1.1", "192.168.1.1", "10.0.0.2"],
+                "destination_port": [80, 443, 22, 3389],
+                "transport_protocol": ["TCP", "TCP", "SSH", "RDP"],
+                "label": ["benign", "benign", "malicious", "malicious"],
+                "bytes_sent": [1000, 2000, 500, 3000],
+                "pkts_sent": [10, 20, 5, 30],
+            },
+            index=[7, 3, 12, 0],
+        )
+
+    @pytest.fixture
+    def predictions(self):
+        return [
+            ("GREEN", "Normal", 0.1),
+            ("ORANGE", "SUSPICIOUS: Just outside boundary", np.float64(-0.2)),
+            ("RED", "CRITICAL: Far outside normal boundary", -0.9),
+            ("ORANGE", "SUSPICIOUS: Just outside boundary", -0.3),
+        ]
+
+    def test_sorted_by_severity(self, sample, predictions):
+        """Test stable severity order, counts and per-field values."""
+        payload = flask_api.build_alerts_payload(sample, predictions)
+
+        alerts = payload["alerts"]
+        assert [alert["id"] for alert in alerts] == [12, 3, 0, 7]
+        assert [alert["severity"] for alert in alerts] == [
+            "RED",
+            "ORANGE",
+            "ORANGE",
+            "GREEN",
+        ]
+        assert payload["total_count"] == 4
+        assert payload["red_count"] == 1
+        assert payload["orange_count"] == 2
+        assert payload["green_count"] == 1
+
+        assert alerts[1]["anomaly_score"] == -0.2
+        assert alerts[1]["packets_sent"] == 20
+        assert alerts[2]["source_ip"] is None
+        assert alerts[0]["protocol"] == "SSH"
+        assert alerts[0]["country"] == "Unknown"
+
+    def test_columnar_predictions(self, sample, predictions):
+        """Test predict_batch columns give the same payload as tuples."""
+        columns = pd.DataFrame(
+            predictions, columns=["severity", "description", "anomaly_score"]
+        )
+
+        def without_timestamps(payload):
+            for alert in payload["alerts"]:
+                del alert["timestamp"]
+            return payload
+
+        assert without_timestamps(
+            flask_api.build_alerts_payload(sample, columns)
+        ) == without_timestamps(flask_api.build_alerts_payload(sample, predictions))
+
+    def test_severity_filter(self, sample, predictions):
+        """Test that only alerts of the requested severity are built."""
+        payload = flask_api.build_alerts_payload(sample, predictions, "ORANGE")
+
+        assert [alert["id"] for alert in payload["alerts"]] == [3, 0]
+        assert payload["total_count"] == 2
+        assert payload["red_count"] == 0
+
+    def test_json_response(self, sample, predictions):
+        """Test that the payload serializes to JSON."""
+        payload = flask_api.build_alerts_payload(sample, predictions)
+
+        with flask_api.app.app_context():
+            response = flask_api.json_response(payload)
+
+        assert response.mimetype == "application/json"
+        assert response.get_json()["alerts"][0]["id"] == 12
@@ -0,0 +1,160 @@
+"""Tests for the SQLite geolocation cache."""
+
+import json
+import sqlite3
+import sys
+import threading
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+# Add project root to path
+sys.path.append(str(Path(__file__).parents[2]))
+
+from src.dashboard.geo_cache_store import SQLiteGeoCache
+from src.dashboard.geolocation_service import GeolocationService
+
+
+def _record(ip, country="Testland"):
+    return {"ip": ip, "country": country, "city": "Stub City", "source": "api"}
+
+
+class TestSQLiteGeoCache:
+    """Test SQLiteGeoCache persistence, LRU layer and TTL."""
+
+    @pytest.fixture
+    def db_path(self, tmp_path):
+        return tmp_path / "geo_cache.sqlite"
+
+    def test_records_persist_across_instances(self, db_path):
+        """Test that writes are visible to a new cache on the same file."""
+        cache = SQLiteGeoCache(db_path)
+        cache["8.8.8.8"] = _record("8.8.8.8")
+        cache["1.1.1.1"] = _record("1.1.1.1", "Australia")
+        cache.close()
+
+        reopened = SQLiteGeoCache(db_path)
+        assert len(reopened) == 2
+        assert reopened["1.1.1.1"]["country"] == "Australia"
+        assert set(reopened) == {"8.8.8.8", "1.1.1.1"}
+        assert "9.9.9.9" not in reopened
+
+    def test_memory_layer_is_bounded(self, db_path):
+        """Test that the LRU layer evicts, while the database keeps everything."""
+        cache = SQLiteGeoCache(db_path, max_memory_entries=3)
+        for i in range(10):
+            cache[f"8.8.8.{i}"] = _record(f"8.8.8.{i}")
+
+        assert len(cache._memory) == 3
+        assert list(cache._memory) == ["8.8.8.7", "8.8.8.8", "8.8.8.9"]
+        assert cache["8.8.8.0"]["ip"] == "8.8.8.0"
+        assert len(cache) == 10
+
+    def test_stale_records_are_missing(self, db_path):
+        """Test that records older than the TTL are treated as missing."""
+        cache = SQLiteGeoCache(db_path, ttl=60)
+        cache["8.8.8.8"] = _record("8.8.8.8")
+        assert "8.8.8.8" in cache
+
+        with patch("src.dashboard.geo_cache_store.time.time") as mock_time:
+            mock_time.return_value = 1e12
+            assert "8.8.8.8" not in cache
+            with pytest.raises(KeyError):
+                cache["8.8.8.8"]
+
+    def test_delete(self, db_path):
+        """Test deleting present and missing keys."""
+        cache = SQLiteGeoCache(db_path)
+        cache["8.8.8.8"] = _record("8.8.8.8")
+        del cache["8.8.8.8"]
+
+        assert "8.8.8.8" not in cache
+        with pytest.raises(KeyError):
+            del cache["8.8.8.8"]
+
+    def test_concurrent_writers(self, db_path):
+        """Test appends from several threads and a second cache instance."""
+        caches = [SQLiteGeoCache(db_path), SQLiteGeoCache(db_path)]
+
+        def write(worker):
+            cache = caches[worker % 2]
+            for i in range(50):
+                ip = f"10.{worker}.0.{i}"
+                cache[ip] = _record(ip)
+
+        threads = [threading.Thread(target=write, args=(w,)) for w in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert len(SQLiteGeoCache(db_path)) == 200
+
+    def test_close_closes_every_thread_connection(self, db_path):
+        """Test that close() closes the connections opened by worker threads."""
+        cache = SQLiteGeoCache(db_path)
+        connections = []
+
+        def worker(i):
+            cache[f"10.0.0.{i}"] = _record(f"10.0.0.{i}")
+            connections.append(cache._connection())
+
+        threads = [threading.Thread(target=worker, args=(i,)) for i in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        cache.close()
+
+        for conn in connections:
+            with pytest.raises(sqlite3.ProgrammingError, match="closed"):
+                conn.execute("SELECT 1")
+        # The cache opens a new connection on the next use
+        assert len(cache) == 4
+        cache.close()
+
+
+class TestGeolocationServiceSQLiteCache:
+    """Test GeolocationService on top of the SQLite cache."""
+
+    def make_service(self, cache_file):
+        with patch.object(GeolocationService, "_init_geoip_database"):
+            return GeolocationService(cache_file=cache_file)
+
+    def test_lookups_persist_without_saving(self, tmp_path):
+        """Test that lookups are written through and seen by a new service."""
+        service = self.make_service(tmp_path / "geo_cache.sqlite")
+        service.get_location("192.168.1.1")
+        service.close()
+
+        reopened = self.make_service(tmp_path / "geo_cache.sqlite")
+        assert reopened.get_cached_count() == 1
+        assert reopened.cache["192.168.1.1"]["country"] == "Private"
+
+    def test_api_lookup_does_not_count_records(self, tmp_path):
+        """Test that an API lookup does not run COUNT(*) for a periodic save."""
+        service = self.make_service(tmp_path / "geo_cache.sqlite")
+
+        with (
+            patch.object(service, "fetch_remote", return_value=_record("8.8.8.8")),
+            patch.object(SQLiteGeoCache, "__len__", side_effect=AssertionError),
+        ):
+            assert service.get_location("8.8.8.8")["country"] == "Testland"
+        service.close()
+
+    def test_legacy_json_is_imported(self, tmp_path):
+        """Test that the default cache imports the legacy geo_cache.json."""
+        legacy = tmp_path / "geo_cache.json"
+        legacy.write_text(json.dumps({"8.8.8.8": _record("8.8.8.8")}))
+        module = "src.dashboard.geolocation_service"
+
+        with (
+            patch(f"{module}.DEFAULT_CACHE_FILE", tmp_path / "geo_cache.sqlite"),
+            patch(f"{module}.LEGACY_CACHE_FILE", legacy),
+        ):
+            service = self.make_service(None)
+
+        assert isinstance(service.cache, SQLiteGeoCache)
+        assert service.get_location("8.8.8.8")["country"] == "Testland"
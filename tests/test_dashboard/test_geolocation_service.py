@@ -2,6 +2,9 @@
 
 import json
 import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 from pathlib import Path
 from unittest.mock import Mock, patch
 
@@ -10,7 +13,7 @@ import pytest
 # Add project root to path
 sys.path.append(str(Path(__file__).parents[2]))
 
-from src.dashboard.geolocation_service import GeolocationService
+from src.dashboard.geolocation_service import GeolocationService, TokenBucket
 
 
 class TestGeolocationService:
@@ -137,6 +140,24 @@ class TestGeolocationService:
         assert result is not None
         assert result["country"] == "Private"
 
+    def test_lookup_offline(self, geo_service):
+        """Test offline lookups cache private IPs and leave public IPs to the API."""
+        result = geo_service.lookup_offline("10.0.0.1")
+        assert result["source"] == "private"
+        assert geo_service.cache["10.0.0.1"] == result
+
+        assert geo_service.lookup_offline("8.8.8.8") is None
+        assert "8.8.8.8" not in geo_service.cache
+
+    def test_flush_and_cached_location(self, geo_service, temp_cache_file):
+        """Test the public cache read and save used by the feature pipeline."""
+        geo_service.get_location("10.0.0.1")
+
+        assert geo_service.cached_location("10.0.0.1")["source"] == "private"
+        assert geo_service.cached_location("8.8.8.8") is None
+        geo_service.flush()
+        assert "10.0.0.1" in json.loads(temp_cache_file.read_text())
+
     def test_get_cached_count(self, geo_service):
         """Test get_cached_count method."""
         assert geo_service.get_cached_count() == 0
@@ -214,3 +235,106 @@ class TestGeolocationService:
 
         # Cache file should exist (saved after batch)
         assert temp_cache_file.exists()
+
+
+class _StubIpwhoisHandler(BaseHTTPRequestHandler):
+    """ipwho.is stand-in: 9.9.9.9 fails, every other IP resolves to Testland."""
+
+    def do_GET(self):
+        ip = self.path.strip("/")
+        self.server.requests.append(ip)
+        time.sleep(self.server.delay)
+        if ip == "9.9.9.9":
+            body = {"success": False, "message": "Reserved range"}
+        else:
+            body = {"success": True, "country": "Testland", "city": "Stub City"}
+        payload = json.dumps(body).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class TestConcurrentLookups:
+    """Test the concurrent API resolver against a local stub server."""
+
+    @pytest.fixture
+    def stub_server(self):
+        """Threaded stub HTTP server standing in for ipwho.is."""
+        server = ThreadingHTTPServer(("127.0.0.1", 0), _StubIpwhoisHandler)
+        server.requests = []
+        server.delay = 0.0
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        yield server
+        server.shutdown()
+        server.server_close()
+
+    @pytest.fixture
+    def geo_service(self, stub_server, tmp_path):
+        """Service pointed at the stub server, without a GeoIP2 database."""
+        with patch.object(GeolocationService, "_init_geoip_database"):
+            service = GeolocationService(
+                api_url=f"http://127.0.0.1:{stub_server.server_port}/{{ip}}",
+                cache_file=tmp_path / "geo_cache.json",
+                requests_per_second=None,
+            )
+        yield service
+        service.close()
+
+    def test_batch_resolves_misses_through_api(self, geo_service, stub_server):
+        """Test that each public IP is requested once and cached."""
+        ips = ["8.8.8.8", "1.1.1.1", "8.8.8.8", "10.0.0.1", "4.4.4.4"]
+
+        results = geo_service.get_locations_batch(ips)
+
+        assert sorted(stub_server.requests) == ["1.1.1.1", "4.4.4.4", "8.8.8.8"]
+        assert results["8.8.8.8"]["country"] == "Testland"
+        assert results["8.8.8.8"]["source"] == "api"
+        assert results["10.0.0.1"]["country"] == "Private"
+        assert "1.1.1.1" in json.loads(geo_service.cache_file.read_text())
+
+    def test_failures_are_negatively_cached(self, geo_service, stub_server):
+        """Test that a failed lookup is not retried until its TTL expires."""
+        assert geo_service.get_locations_batch(["9.9.9.9"])["9.9.9.9"] is None
+        assert geo_service.get_location("9.9.9.9") is None
+        assert stub_server.requests == ["9.9.9.9"]
+        assert "9.9.9.9" not in geo_service.cache
+
+        # Expire the negative entry
+        geo_service._remote_state().negative["9.9.9.9"] = time.monotonic() - 1
+        geo_service.get_location("9.9.9.9")
+        assert stub_server.requests == ["9.9.9.9", "9.9.9.9"]
+
+    def test_inflight_lookups_are_deduplicated(self, geo_service, stub_server):
+        """Test that concurrent lookups of one IP share a single request."""
+        stub_server.delay = 0.3
+        results = []
+        threads = [
+            threading.Thread(
+                target=lambda: results.append(geo_service.get_location("8.8.4.4"))
+            )
+            for _ in range(4)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert stub_server.requests == ["8.8.4.4"]
+        assert len(results) == 4
+        assert all(result["city"] == "Stub City" for result in results)
+
+    def test_token_bucket_limits_rate(self):
+        """Test that the token bucket spaces requests beyond the burst."""
+        bucket = TokenBucket(rate=20, capacity=1)
+
+        start = time.monotonic()
+        for _ in range(5):
+            bucket.acquire()
+
+        assert time.monotonic() - start >= 0.15
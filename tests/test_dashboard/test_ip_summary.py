@@ -0,0 +1,216 @@
+"""Tests for the per source IP summary."""
+
+import sys
+import threading
+import time
+from pathlib import Path
+from unittest.mock import Mock, patch
+
+import numpy as np
+import pandas as pd
+import pytest
+
+# Add project root to path
+sys.path.append(str(Path(__file__).parents[2]))
+
+from src.dashboard import flask_api
+from src.dashboard.ip_summary import SourceIPSummary
+
+
+def _location(ip):
+    if ip.startswith("10."):
+        return {"latitude": None, "longitude": None, "country": "Private"}
+    return {"latitude": 1.5, "longitude": 2.5, "country": "Testland", "city": None}
+
+
+class TestSourceIPSummary:
+    """Test SourceIPSummary aggregation, updates and serving."""
+
+    @pytest.fixture
+    def df_logs(self):
+        return pd.DataFrame(
+            {
+                "source_ip": ["8.8.8.8", "1.1.1.1", "8.8.8.8", None, "10.0.0.1"],
+                "label": ["benign", "benign", "malicious", "malicious", "benign"],
+                "timestamp_start": [
+                    "2025-01-01 10:00:00",
+                    "2025-01-01 11:00:00",
+                    "2025-01-02 10:00:00",
+                    "2025-01-01 00:00:00",
+                    "2025-01-03 00:00:00",
+                ],
+            }
+        )
+
+    @pytest.fixture
+    def geo_service(self):
+        service = Mock()
+        service.get_locations_batch.side_effect = lambda ips: {
+            ip: _location(ip) for ip in ips
+        }
+        return service
+
+    def test_aggregates(self, df_logs):
+        """Test count, malicious flag and first/last seen per IP."""
+        table = SourceIPSummary(df_logs).table
+
+        assert list(table.index) == ["8.8.8.8", "1.1.1.1", "10.0.0.1"]
+        assert table.loc["8.8.8.8", "count"] == 2
+        assert table.loc["8.8.8.8", "malicious"]
+        assert not table.loc["1.1.1.1", "malicious"]
+        assert table.loc["8.8.8.8", "first_seen"] == pd.Timestamp("2025-01-01 10:00")
+        assert table.loc["8.8.8.8", "last_seen"] == pd.Timestamp("2025-01-02 10:00")
+
+    def test_incremental_update(self, df_logs):
+        """Test that update() matches building from all logs at once."""
+        new_logs = pd.DataFrame(
+            {
+                "source_ip": ["1.1.1.1", "9.9.9.9"],
+                "label": ["malicious", "benign"],
+                "timestamp_start": ["2024-12-31 00:00:00", "2025-02-01 00:00:00"],
+            }
+        )
+        summary = SourceIPSummary(df_logs)
+        summary.update(new_logs)
+        expected = SourceIPSummary(pd.concat([df_logs, new_logs], ignore_index=True))
+
+        pd.testing.assert_frame_equal(summary.table, expected.table)
+
+    def test_locations_resolved_once(self, df_logs, geo_service):
+        """Test that only IPs added since the last call are looked up."""
+        summary = SourceIPSummary(df_logs)
+        summary.resolve_locations(geo_service)
+        summary.resolve_locations(geo_service)
+        assert geo_service.get_locations_batch.call_count == 1
+
+        summary.update(pd.DataFrame({"source_ip": ["9.9.9.9"], "label": ["benign"]}))
+        summary.resolve_locations(geo_service)
+        geo_service.get_locations_batch.assert_called_with(["9.9.9.9"])
+
+    def test_geo_points_and_country_counts(self, df_logs, geo_service):
+        """Test the served points skip unlocated IPs and keep the labels."""
+        summary = SourceIPSummary(df_logs)
+        summary.resolve_locations(geo_service)
+
+        points = summary.geo_points()
+        assert [point["ip"] for point in points] == ["8.8.8.8", "1.1.1.1"]
+        assert points[0]["label"] == "malicious"
+        assert points[0]["city"] == "Unknown"
+        assert points[0]["first_seen"] == "2025-01-01T10:00:00"
+        assert summary.country_counts() == {"Testland": 2}
+
+    def test_resolve_locations_limit(self, df_logs, geo_service):
+        """Test that a limited call looks up at most limit pending IPs."""
+        summary = SourceIPSummary(df_logs)
+
+        assert summary.resolve_locations(geo_service, limit=2) == 2
+        assert summary.pending_count() == 1
+        assert summary.resolve_locations(geo_service, limit=2) == 1
+        assert summary.resolve_locations(geo_service, limit=2) == 0
+
+    def test_geo_points_not_cached_when_stale(self, df_logs, geo_service):
+        """Test points computed while the table changed are not cached."""
+        summary = SourceIPSummary(df_logs)
+        summary.resolve_locations(geo_service)
+        datetime_as_string = np.datetime_as_string
+        new_ip = pd.DataFrame({"source_ip": ["9.9.9.9"], "label": ["benign"]})
+
+        def update_midway(*args, **kwargs):
+            # Another thread updates the table while the points are built
+            if "9.9.9.9" not in summary.table.index:
+                summary.update(new_ip)
+                summary.resolve_locations(geo_service)
+            return datetime_as_string(*args, **kwargs)
+
+        with patch.object(np, "datetime_as_string", side_effect=update_midway):
+            stale = summary.geo_points()
+
+        assert "9.9.9.9" not in [point["ip"] for point in stale]
+        assert "9.9.9.9" in [point["ip"] for point in summary.geo_points()]
+
+    def test_geolocation_endpoint(self, df_logs, geo_service):
+        """Test that the endpoint serves the summary without a row limit."""
+        summary = SourceIPSummary(df_logs)
+        geo_service.get_cached_count.return_value = 3
+
+        with (
+            patch.object(flask_api, "df_logs", df_logs),
+            patch.object(flask_api, "ip_summary", summary),
+            patch.object(flask_api, "get_geo_service", return_value=geo_service),
+        ):
+            client = flask_api.app.test_client()
+            client.get("/api/stats/geolocation")
+            assert summary.wait_resolved(timeout=5)
+            response = client.get("/api/stats/geolocation")
+
+        data = response.get_json()
+        assert response.status_code == 200
+        assert len(data["geo_points"]) == 2
+        assert data["country_stats"] == {"Testland": 2}
+        assert data["cached_ips"] == 3
+        assert data["pending_ips"] == 0
+
+    def test_appended_logs_reach_the_summary(self, df_logs, geo_service):
+        """Test that rows added through the API are folded into the summary."""
+        summary = SourceIPSummary(df_logs)
+        geo_service.get_cached_count.return_value = 0
+        new_rows = [
+            {"source_ip": "9.9.9.9", "label": "malicious"},
+            {"source_ip": "8.8.8.8", "label": "benign"},
+        ]
+
+        with (
+            patch.object(flask_api, "df_logs", df_logs),
+            patch.object(flask_api, "ip_summary", summary),
+            patch.object(flask_api, "dataset_stats", None),
+            patch.object(flask_api, "get_geo_service", return_value=geo_service),
+        ):
+            client = flask_api.app.test_client()
+            client.post("/api/logs/append", json=new_rows)
+            client.get("/api/stats/geolocation")
+            assert summary.wait_resolved(timeout=5)
+            data = client.get("/api/stats/geolocation").get_json()
+            assert flask_api.ip_summary is summary
+
+        assert summary.table.loc["8.8.8.8", "count"] == 3
+        assert summary.table.loc["9.9.9.9", "malicious"]
+        assert "9.9.9.9" in [point["ip"] for point in data["geo_points"]]
+        assert data["country_stats"] == {"Testland": 3}
+
+    def test_geolocation_endpoint_does_not_wait_for_lookups(self, geo_service):
+        """Test a request with many unresolved IPs returns before the lookups."""
+        df_logs = pd.DataFrame(
+            {"source_ip": [f"8.8.{i // 250}.{i % 250}" for i in range(5000)]}
+        )
+        summary = SourceIPSummary(df_logs)
+        summary.update(pd.DataFrame({"source_ip": ["1.1.1.1"]}))
+        summary.table.loc["1.1.1.1", ["latitude", "longitude", "resolved"]] = [
+            1.5,
+            2.5,
+            True,
+        ]
+        release = threading.Event()
+
+        def slow_lookup(ips):
+            release.wait(timeout=10)
+            return {ip: _location(ip) for ip in ips}
+
+        geo_service.get_locations_batch.side_effect = slow_lookup
+        geo_service.get_cached_count.return_value = 0
+
+        with (
+            patch.object(flask_api, "df_logs", df_logs),
+            patch.object(flask_api, "ip_summary", summary),
+            patch.object(flask_api, "get_geo_service", return_value=geo_service),
+        ):
+            start = time.perf_counter()
+            response = flask_api.app.test_client().get("/api/stats/geolocation")
+            elapsed = time.perf_counter() - start
+
+        release.set()
+        data = response.get_json()
+        assert elapsed < 2
+        assert [point["ip"] for point in data["geo_points"]] == ["1.1.1.1"]
+        assert data["pending_ips"] == 5000
+        assert summary.wait_resolved(timeout=10)
+        assert summary.pending_count() == 0
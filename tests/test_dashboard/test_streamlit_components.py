@@ -250,3 +250,39 @@ class TestMetricsFormatting:
         value = 0.8567891
         formatted = f"{value:.4f}"
         assert formatted == "0.8568"
+
+
+class TestStreamlitAppFetchApi:
+    """Test the ETag revalidation of streamlit_app.fetch_api."""
+
+    @pytest.fixture
+    def streamlit_app(self):
+        """streamlit_app imported with the API server reported as running."""
+        import importlib
+
+        with patch("socket.socket.connect_ex", return_value=0), patch("time.sleep"):
+            from src.dashboard import streamlit_app
+
+            streamlit_app._etag_cache.clear()
+            yield streamlit_app, lambda: importlib.reload(streamlit_app)
+            streamlit_app._etag_cache.clear()
+
+    def test_etag_reused_across_reruns(self, streamlit_app):
+        """Test a rerun sends If-None-Match and reuses the body on a 304."""
+        module, rerun = streamlit_app
+        fresh = Mock(status_code=200, headers={"ETag": '"stats-1"'})
+        fresh.json.return_value = {"total_records": 4}
+        not_modified = Mock(status_code=304, headers={"ETag": '"stats-1"'})
+
+        with patch.object(
+            module.requests, "get", side_effect=[fresh, not_modified]
+        ) as get:
+            first = module.fetch_api("/stats/summary")
+            # st.rerun() re-executes the script, module globals start over
+            module = rerun()
+            second = module.fetch_api("/stats/summary")
+
+        assert first == second == {"total_records": 4}
+        assert get.call_args_list[0].kwargs["headers"] is None
+        assert get.call_args_list[1].kwargs["headers"] == {"If-None-Match": '"stats-1"'}
+        not_modified.json.assert_not_called()
@@ -0,0 +1,99 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.feature_engineering.df_formatting.handler_df_formatter import (
+    apply_aggregations,
+    apply_precalculations,
+)
+from src.feature_engineering.feature_store import PartitionedFeatureStore
+
+
+def make_formatted_df(n, start, seed, hours=4):
+    """Formatted traffic (BASE_FEATURES) spread over a few hours"""
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame(
+        {
+            "source_ip": rng.choice(["1.1.1.1", "8.8.8.8", "192.168.1.5"], n),
+            "destination_ip": rng.choice(["10.0.0.1", "142.250.185.46"], n),
+            "source_port": rng.integers(1024, 65535, n),
+            "destination_port": rng.choice([22, 80, 443], n),
+            "timestamp_start": pd.Timestamp(start)
+            + pd.to_timedelta(rng.integers(0, hours * 3600, n), unit="s"),
+            "transport_protocol": rng.choice(["tcp", "udp"], n),
+            "application_protocol": rng.choice(["http", "ssh", "dns"], n),
+            "duration": rng.random(n) * 10,
+            "bytes_sent": rng.integers(0, 5000, n),
+            "bytes_received": rng.integers(0, 5000, n),
+            "pkts_sent": rng.integers(1, 50, n),
+            "pkts_received": rng.integers(0, 50, n),
+            "direction": rng.choice(["L2R", "R2L"], n),
+            "label": rng.choice(["benign", "malicious"], n),
+            "event_id": np.arange(n) + seed * 1_000_000,
+        }
+    )
+
+
+class TestPartitionedFeatureStore:
+    """Test suite for the hourly partitioned feature store"""
+
+    @pytest.fixture
+    def store(self, tmp_path):
+        return PartitionedFeatureStore(tmp_path / "store")
+
+    def test_append_creates_hourly_partitions(self, store):
+        """Test that rows are split into one partition per hour"""
+        keys = store.append(make_formatted_df(200, "2025-10-24 02:00", seed=1))
+
+        assert keys == store.partitions()
+        assert store.partitions() == [
+            "2025-10-24T02",
+            "2025-10-24T03",
+            "2025-10-24T04",
+            "2025-10-24T05",
+        ]
+        assert len(store.read()) == 200
+
+    def test_incremental_append_matches_full_recompute(self, store):
+        """Test that appending in segments gives the same features as a full run"""
+        first = make_formatted_df(300, "2025-10-24 02:00", seed=1)
+        second = make_formatted_df(100, "2025-10-24 04:30", seed=2)
+        store.append(first)
+        rewritten = store.append(second)
+
+        # The 02:00 and 03:00 hours are not touched by the second segment
+        assert "2025-10-24T02" not in rewritten
+        assert "2025-10-24T03" not in rewritten
+
+        # A late segment for 02:00 also changes the trend features of 03:00
+        late = make_formatted_df(20, "2025-10-24 02:00", seed=3, hours=1)
+        assert store.append(late) == ["2025-10-24T02", "2025-10-24T03"]
+
+        expected = apply_aggregations(
+            apply_precalculations(pd.concat([first, second, late], ignore_index=True))
+        )
+        result = store.read()
+
+        expected = expected.sort_values("event_id").reset_index(drop=True)
+        result = result.sort_values("event_id").reset_index(drop=True)
+        pd.testing.assert_frame_equal(
+            result[expected.columns], expected, check_dtype=False
+        )
+
+    def test_manifest_persists(self, store, tmp_path):
+        """Test that a reopened store sees the existing partitions"""
+        store.append(make_formatted_df(50, "2025-10-24 02:00", seed=1))
+
+        reopened = PartitionedFeatureStore(tmp_path / "store")
+
+        assert reopened.partitions() == store.partitions()
+        assert reopened.read(start="2025-10-24 03:15").shape[0] < 50
+
+    def test_rows_without_timestamp_are_dropped(self, store):
+        """Test that NaT rows are dropped instead of creating a bad partition"""
+        df = make_formatted_df(10, "2025-10-24 02:00", seed=1)
+        df.loc[0, "timestamp_start"] = pd.NaT
+
+        store.append(df)
+
+        assert len(store.read()) == 9
@@ -0,0 +1,71 @@
+import pandas as pd
+import pytest
+
+from src.feature_engineering.df_formatting import dataset_cache
+from src.feature_engineering.df_formatting.dataset_cache import (
+    FormattedDatasetCache,
+    csv_cache_path,
+    load_csv_with_cache,
+)
+
+
+class TestDatasetCache:
+    """Test suite for the Feather cache of formatted datasets"""
+
+    @pytest.fixture
+    def processed_csv(self, tmp_path):
+        """Processed dataset as written by the formatting pipeline"""
+        path = tmp_path / "combined_shuffled_dataset.csv"
+        pd.DataFrame(
+            {
+                "source_ip": ["1.1.1.1", "10.0.0.1", "8.8.8.8"],
+                "transport_protocol": ["TCP", "UDP", "TCP"],
+                "application_protocol": ["http", None, "dns"],
+                "bytes_sent": [10, 20, 30],
+                "label": ["malicious", "benign", "benign"],
+            }
+        ).to_csv(path, index=False)
+        return path
+
+    def test_csv_sidecar_roundtrip(self, processed_csv):
+        """Test that the second load reads the sidecar with the same values"""
+        first = load_csv_with_cache(processed_csv)
+        assert csv_cache_path(processed_csv).exists()
+
+        second = load_csv_with_cache(processed_csv)
+
+        pd.testing.assert_frame_equal(first, second)
+        # Stored as a categorical, served as object like pd.read_csv
+        assert second["label"].dtype == object
+        second.loc[0, "label"] = "unknown"  # a categorical would raise here
+        assert second["bytes_sent"].dtype == "int64"
+
+    def test_csv_sidecar_invalidated_on_change(self, processed_csv):
+        """Test that rewriting the CSV changes the sidecar key"""
+        load_csv_with_cache(processed_csv)
+        old_cache_path = csv_cache_path(processed_csv)
+
+        df = pd.read_csv(processed_csv)
+        pd.concat([df, df]).to_csv(processed_csv, index=False)
+
+        assert csv_cache_path(processed_csv) != old_cache_path
+        assert len(load_csv_with_cache(processed_csv)) == 6
+
+    def test_key_depends_on_inputs_and_version(self, processed_csv, tmp_path):
+        """Test that the key changes with log content, params and code version"""
+        key = FormattedDatasetCache(tmp_path, [processed_csv], sample_size=10).key
+
+        assert (
+            FormattedDatasetCache(tmp_path, [processed_csv], sample_size=20).key != key
+        )
+        with pytest.MonkeyPatch.context() as mp:
+            mp.setattr(dataset_cache, "FEATURE_CODE_VERSION", "test")
+            assert (
+                FormattedDatasetCache(tmp_path, [processed_csv], sample_size=10).key
+                != key
+            )
+
+    def test_cache_miss_returns_none(self, processed_csv, tmp_path):
+        """Test that a missing entry is a miss"""
+        cache = FormattedDatasetCache(tmp_path, [processed_csv])
+        assert cache.load("suricata_formatted") is None
@@ -1,10 +1,15 @@
 import json
 import os
 import tempfile
+from unittest.mock import patch
 
+import pandas as pd
 import pytest
 
-from src.feature_engineering.df_formatting import DataFrameFormatter
+from src.feature_engineering.df_formatting import (
+    DataFrameFormatter,
+    DataFrameFormatterSuricata,
+)
 from src.feature_engineering.df_initializing import DataFrameInitializer
 
 
@@ -215,3 +220,117 @@ class TestNormalTrafficDataFrameFormatter:
         expected_columns = create_base_features
         for col in expected_columns:
             assert col in df_formatter.normal_traffic_df.columns
+
+    def test_from_logs_uses_cache(
+        self, temp_normal_traffic_file, temp_suricata_file, tmp_path
+    ):
+        """Test that the second from_logs call loads the Feather cache"""
+        cache_dir = tmp_path / "cache"
+        formatted = DataFrameFormatter.from_logs(
+            temp_suricata_file, temp_normal_traffic_file, 2, cache_dir=cache_dir
+        )
+        assert len(list(cache_dir.glob("*.feather"))) == 2
+
+        with patch.object(DataFrameFormatter, "format_all_dfs") as mock_format:
+            cached = DataFrameFormatter.from_logs(
+                temp_suricata_file, temp_normal_traffic_file, 2, cache_dir=cache_dir
+            )
+            mock_format.assert_not_called()
+
+        assert list(cached.suricata_df.columns) == list(formatted.suricata_df.columns)
+        assert cached.suricata_df["label"].dtype == object
+        assert cached.n_jobs == 1 and cached.chunk_size == 100_000
+        assert len(cached.normal_traffic_df) == len(formatted.normal_traffic_df)
+
+    def test_parallel_matches_serial(
+        self, temp_normal_traffic_file, temp_suricata_file
+    ):
+        """Test that chunked process pool formatting gives the serial output"""
+        df_initializer = DataFrameInitializer(
+            suricata_json_path=temp_suricata_file,
+            normal_traffic_json_path=temp_normal_traffic_file,
+        )
+        df_suricata, df_normal_traffic = df_initializer.initialize_dfs(sample_size=2)
+
+        serial = DataFrameFormatter(df_suricata.copy(), df_normal_traffic.copy())
+        parallel = DataFrameFormatter(
+            df_suricata.copy(), df_normal_traffic.copy(), n_jobs=2, chunk_size=1
+        )
+
+        pd.testing.assert_frame_equal(parallel.suricata_df, serial.suricata_df)
+        pd.testing.assert_frame_equal(
+            parallel.normal_traffic_df, serial.normal_traffic_df
+        )
+
+
+class TestSuricataFlowExtraction:
+    """Test suite for the columnar flow extraction of DataFrameFormatterSuricata"""
+
+    @pytest.fixture
+    def suricata_df(self):
+        """Events with full, partial and missing flow data"""
+        return pd.DataFrame(
+            {
+                "timestamp": [
+                    "2025-10-24T02:44:06.405778+0000",
+                    "2025-10-24T02:44:07.619878+0000",
+                    "2025-10-24T02:44:08.000000+0000",
+                ],
+                "flow": [
+                    {
+                        "pkts_toserver": 2,
+                        "pkts_toclient": 1,
+                        "bytes_toserver": 164,
+                        "bytes_toclient": 172,
+                        "start": "2025-10-24T02:44:06.405778+0000",
+                    },
+                    {"pkts_toserver": 1, "bytes_toserver": 82},
+                    None,
+                ],
+            }
+        )
+
+    def test_extract_flow_counters(self, suricata_df):
+        """Test that flow counters are mapped to the unified schema"""
+        formatter = DataFrameFormatterSuricata(suricata_df, [])
+        result = formatter._extract_flow_data(suricata_df.copy())
+
+        assert result["bytes_sent"].tolist() == [164, 82, 0]
+        assert result["bytes_received"].tolist() == [172, 0, 0]
+        assert result["pkts_sent"].tolist() == [2, 1, 0]
+        assert result["pkts_received"].tolist() == [1, 0, 0]
+        assert result["bytes_sent"].dtype == "int64"
+
+    def test_extract_flow_without_flow_column(self, suricata_df):
+        """Test that events without any flow column get default values"""
+        df = suricata_df.drop(columns=["flow"])
+        formatter = DataFrameFormatterSuricata(df, [])
+        result = formatter._extract_flow_data(df.copy())
+
+        assert (result["bytes_sent"] == 0).all()
+        assert (result["duration"] == 0.0).all()
+        assert "flow_start" not in result.columns
+
+    def test_duration_is_clipped_and_failures_counted(self):
+        """Test vectorized duration: clipping, defaults and parse failure count"""
+        df = pd.DataFrame(
+            {
+                "timestamp": [
+                    "2025-10-24T02:44:07.500000+0000",
+                    "2025-10-24T02:44:07.500000+0000",
+                    "not-a-timestamp",
+                ],
+                "flow": [
+                    {"start": "2025-10-24T02:44:06.000000+0000"},
+                    {"start": "2025-10-24T02:44:09.000000+0000"},
+                    {"start": "2025-10-24T02:44:06.000000+0000"},
+                ],
+            }
+        )
+        formatter = DataFrameFormatterSuricata(df, [])
+        result = formatter._extract_flow_data(df.copy())
+
+        assert result["duration"].iloc[0] == 1.5
+        assert result["duration"].iloc[1] == 0.0  # negative duration clipped
+        assert result["duration"].iloc[2] == 0.0  # unparseable timestamp
+        assert formatter.duration_parse_failures == 1
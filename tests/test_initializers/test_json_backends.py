@@ -0,0 +1,60 @@
+import json
+import math
+
+import pytest
+
+from src.feature_engineering.df_initializing.json_backends import (
+    available_array_backends,
+    available_line_backends,
+    get_array_parser,
+    get_line_parser,
+)
+
+
+class TestJsonBackends:
+    """Test suite for the pluggable JSON parsing backends"""
+
+    def test_stdlib_backend_always_available(self):
+        """Test that the stdlib json and the python ijson backends are fallbacks"""
+        assert "json" in available_line_backends()
+        assert "python" in available_array_backends()
+
+    @pytest.mark.parametrize("backend", available_line_backends())
+    def test_line_parser_parses_bytes(self, backend):
+        """Test that every line backend parses bytes without decoding"""
+        loads = get_line_parser(backend)
+        record = loads(b'{"event_type": "flow", "flow": {"pkts_toserver": 2}}\n')
+        assert record == {"event_type": "flow", "flow": {"pkts_toserver": 2}}
+
+    @pytest.mark.parametrize("backend", available_line_backends())
+    def test_line_parser_accepts_nan_and_big_integers(self, backend):
+        """Test lines orjson rejects are parsed like the stdlib json module"""
+        loads = get_line_parser(backend)
+        record = loads(b'{"flow": {"age": NaN, "bytes": 18446744073709551616}}\n')
+
+        assert math.isnan(record["flow"]["age"])
+        assert record["flow"]["bytes"] == 2**64
+
+    @pytest.mark.parametrize("backend", available_line_backends())
+    def test_line_parser_rejects_malformed_lines(self, backend):
+        """Test malformed lines still raise a JSON decode error"""
+        with pytest.raises(json.JSONDecodeError):
+            get_line_parser(backend)(b'{"event_type": ')
+
+    @pytest.mark.parametrize("backend", available_array_backends())
+    def test_array_parser_streams_items(self, backend, tmp_path):
+        """Test that every ijson backend streams array items"""
+        path = tmp_path / "items.json"
+        path.write_bytes(b'[{"appName": "HTTPWeb"}, {"appName": "SSH"}]')
+
+        with open(path, "rb") as f:
+            items = list(get_array_parser(backend).items(f, "item"))
+
+        assert [item["appName"] for item in items] == ["HTTPWeb", "SSH"]
+
+    def test_unknown_backend_raises(self):
+        """Test that unknown backend names are rejected"""
+        with pytest.raises(ValueError):
+            get_line_parser("simdjson")
+        with pytest.raises(ValueError):
+            get_array_parser("simdjson")
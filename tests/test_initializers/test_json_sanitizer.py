@@ -0,0 +1,48 @@
+import gzip
+import io
+import json
+
+import pytest
+
+from src.feature_engineering.df_initializing.json_sanitizer import (
+    InvalidNumberSanitizer,
+    sanitize_json_file,
+)
+
+RAW = b'[{"a": NaN, "b": Infinity, "c": -Infinity, "d": 1.5, "e": "NaNo"}]'
+
+
+class TestInvalidNumberSanitizer:
+    """Test suite for the streaming NaN/Infinity sanitizer"""
+
+    def test_replaces_invalid_numbers(self):
+        """Test that NaN, Infinity and -Infinity become null"""
+        sanitizer = InvalidNumberSanitizer(io.BytesIO(RAW))
+        data = json.loads(sanitizer.read())
+
+        assert data == [{"a": None, "b": None, "c": None, "d": 1.5, "e": "NaNo"}]
+        assert sanitizer.replacements == 3
+
+    @pytest.mark.parametrize("block_size", [1, 2, 3, 5, 7, 11])
+    def test_tokens_split_across_blocks(self, block_size):
+        """Test that tokens cut by block boundaries are still replaced"""
+        sanitizer = InvalidNumberSanitizer(io.BytesIO(RAW), block_size=block_size)
+        chunks = []
+        while chunk := sanitizer.read(4):
+            chunks.append(chunk)
+
+        assert json.loads(b"".join(chunks))[0]["c"] is None
+        assert sanitizer.replacements == 3
+
+    def test_sanitize_gzip_file(self, tmp_path):
+        """Test that gzip input is written to a gzip output"""
+        input_path = tmp_path / "benign.json.gz"
+        output_path = tmp_path / "benign_fixed.json.gz"
+        with gzip.open(input_path, "wb") as f:
+            f.write(RAW)
+
+        replacements = sanitize_json_file(input_path, output_path, block_size=8)
+
+        assert replacements == 3
+        with gzip.open(output_path, "rb") as f:
+            assert json.load(f)[0]["b"] is None
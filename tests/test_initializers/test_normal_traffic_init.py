@@ -1,11 +1,15 @@
 import json
 import os
+import random
 import tempfile
 
 import pandas as pd
 import pytest
 
 from src.feature_engineering.df_initializing import NormalTrafficDataFrameInitializer
+from src.feature_engineering.df_initializing.reservoir_sampling import (
+    StratifiedReservoirSampler,
+)
 
 
 class TestNormalTrafficDataFrameInitializer:
@@ -123,3 +127,111 @@ class TestNormalTrafficDataFrameInitializer:
         initializer = NormalTrafficDataFrameInitializer(temp_traffic_file)
         df = initializer.initialize_benign_traffic(sample_size=1)
         assert len(df) == 1
+
+    @pytest.fixture
+    def large_traffic_file(self, tmp_path):
+        """Benign traffic with one frequent and two rare applications"""
+        records = [
+            {"appName": "HTTPWeb", "totalSourceBytes": i} for i in range(200)
+        ] + [
+            {"appName": "SSH", "totalSourceBytes": 1000},
+            {"appName": "DNS", "totalSourceBytes": 2000},
+        ]
+        path = tmp_path / "benign.json"
+        with open(path, "w") as f:
+            json.dump(records, f)
+        return str(path)
+
+    def test_reservoir_sample_is_reproducible(self, large_traffic_file):
+        """Test that the same seed gives the same sample"""
+        initializer = NormalTrafficDataFrameInitializer(large_traffic_file)
+        df_a = initializer.initialize_benign_traffic(sample_size=20, random_state=7)
+        df_b = initializer.initialize_benign_traffic(sample_size=20, random_state=7)
+
+        assert len(df_a) == 20
+        pd.testing.assert_frame_equal(df_a, df_b)
+
+    def test_reservoir_sample_is_not_head(self, large_traffic_file):
+        """Test that the reservoir sample is drawn from the whole file"""
+        initializer = NormalTrafficDataFrameInitializer(large_traffic_file)
+        df_head = initializer.initialize_benign_traffic(sample_size=20, sampling="head")
+        df_reservoir = initializer.initialize_benign_traffic(sample_size=20)
+
+        assert df_head["totalSourceBytes"].max() == 19
+        assert df_reservoir["totalSourceBytes"].max() > 19
+
+    def test_stratified_sample_keeps_rare_strata(self, large_traffic_file):
+        """Test that stratified sampling keeps every appName"""
+        initializer = NormalTrafficDataFrameInitializer(large_traffic_file)
+        df = initializer.initialize_benign_traffic(
+            sample_size=10, stratify_by="appName"
+        )
+
+        assert len(df) == 10
+        assert set(df["appName"]) == {"HTTPWeb", "SSH", "DNS"}
+        assert (df["appName"] == "HTTPWeb").sum() == 8
+
+    def test_stratified_sampler_memory_is_bounded(self):
+        """Test the stratified sampler never holds more than sample_size records"""
+        rng = random.Random(0)
+        sampler = StratifiedReservoirSampler(50, rng)
+        max_retained = 0
+        for i in range(20000):
+            # Many frequent and rare strata, new ones appearing throughout
+            stratum = f"app{rng.randrange(5)}" if i % 10 else f"rare{i // 100}"
+            sampler.offer(stratum, i)
+            max_retained = max(max_retained, sampler.retained)
+
+        items = sampler.items
+        assert max_retained <= 50
+        assert len(items) <= 50
+        assert len(set(items)) == len(items)
+        assert len(sampler.counts) > 50
+
+    def test_stratified_sampler_follows_quotas(self):
+        """Test each stratum gets its proportional share of the sample"""
+        sampler = StratifiedReservoirSampler(40, random.Random(1))
+        for i in range(4000):
+            sampler.offer("rare" if i % 4 == 0 else "common", i)
+
+        items = sampler.items
+        assert len(items) == 40
+        assert sum(1 for i in items if i % 4 == 0) == 10
+        # Sampled from the whole stream, not only its tail
+        assert min(items) < 2000 < max(items)
+
+    def test_unknown_sampling_method(self, temp_traffic_file):
+        """Test that unknown sampling methods are rejected"""
+        initializer = NormalTrafficDataFrameInitializer(temp_traffic_file)
+        with pytest.raises(ValueError):
+            initializer.initialize_benign_traffic(sample_size=1, sampling="tail")
+
+    @pytest.fixture
+    def invalid_numbers_file(self, tmp_path):
+        """Benign traffic containing NaN and Infinity values"""
+        path = tmp_path / "benign.json"
+        path.write_bytes(
+            b'[{"appName": "HTTPWeb", "totalSourceBytes": NaN},'
+            b' {"appName": "SSH", "totalSourceBytes": -Infinity}]'
+        )
+        return str(path)
+
+    def test_inline_sanitizing(self, invalid_numbers_file):
+        """Test that NaN/Infinity are replaced while parsing"""
+        initializer = NormalTrafficDataFrameInitializer(
+            invalid_numbers_file, sanitize_invalid_numbers=True
+        )
+        df = initializer.initialize_benign_traffic(sample_size=10, sampling="head")
+
+        assert len(df) == 2
+        assert df["totalSourceBytes"].isna().all()
+
+    def test_preprocess_replace_invalid_numbers(self, invalid_numbers_file, tmp_path):
+        """Test that the preprocessed copy is parsed afterwards"""
+        initializer = NormalTrafficDataFrameInitializer(invalid_numbers_file)
+        output_path = str(tmp_path / "benign_fixed.json.gz")
+        initializer.preprocess_json_replace_invalid_numbers(output_path)
+
+        assert initializer.benign_traffic_json_path == output_path
+        df = initializer.initialize_benign_traffic(sample_size=10)
+        assert len(df) == 2
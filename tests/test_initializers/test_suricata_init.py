@@ -1,3 +1,4 @@
+import gzip
 import json
 import os
 import tempfile
@@ -142,3 +143,43 @@ class TestSuricataDataFrameInitializer:
         assert "dest_ip" in df.columns
         assert "proto" in df.columns
         assert "alert" in df.columns
+
+    def test_initialize_suricata_gzip(self, sample_suricata_data, tmp_path):
+        """Test reading a gzip-compressed eve.json"""
+        gz_path = tmp_path / "eve.json.gz"
+        with gzip.open(gz_path, "wt") as f:
+            for record in sample_suricata_data:
+                f.write(json.dumps(record) + "\n")
+
+        initializer = SuricataDataFrameInitializer(str(gz_path))
+        df = initializer.initialize_suricata()
+        assert len(df) == len(sample_suricata_data)
+
+    def test_iter_suricata_chunks_sizes(self, temp_suricata_file):
+        """Test that chunks respect the chunk size"""
+        initializer = SuricataDataFrameInitializer(temp_suricata_file)
+        chunks = list(initializer.iter_suricata_chunks(chunk_size=1))
+
+        assert len(chunks) == 2
+        assert all(isinstance(chunk, pd.DataFrame) for chunk in chunks)
+        assert all(len(chunk) == 1 for chunk in chunks)
+
+    def test_iter_suricata_chunks_event_type_filter(
+        self, sample_suricata_data, tmp_path
+    ):
+        """Test that only the requested event types are kept"""
+        path = tmp_path / "eve.json"
+        flow_event = {"timestamp": "2025-10-24T02:45:00.000000+0000"}
+        flow_event["event_type"] = "flow"
+        with open(path, "w") as f:
+            for record in sample_suricata_data + [flow_event]:
+                f.write(json.dumps(record) + "\n")
+            f.write('{"event_type":"stats","stats":{}}\n')
+
+        initializer = SuricataDataFrameInitializer(str(path))
+        chunks = list(
+            initializer.iter_suricata_chunks(chunk_size=10, event_types={"flow"})
+        )
+
+        assert len(chunks) == 1
+        assert chunks[0]["event_type"].tolist() == ["flow"]
@@ -0,0 +1,149 @@
+"""Tests for the compact RBF One-Class SVM scorer."""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.svm import OneClassSVM
+
+sys.path.append(str(Path(__file__).parents[2]))  # Add project root to path
+
+from src.model.compact_scorer import CompactRBFScorer
+from src.model.oneCSVM_model import OneClassSVMModel
+
+
+@pytest.fixture
+def clustered_data():
+    """Training and held-out rows drawn from a few tight clusters."""
+    rng = np.random.default_rng(0)
+    centres = rng.normal(size=(5, 8)) * 3
+
+    def draw(n_rows):
+        return centres[rng.integers(0, 5, n_rows)] + rng.normal(size=(n_rows, 8)) * 0.5
+
+    return draw(1500), draw(1000)
+
+
+@pytest.fixture
+def sample_data():
+    """Benign flows with the columns the model preprocesses."""
+    rng = np.random.default_rng(1)
+    return pd.DataFrame(
+        {
+            "bytes_in": rng.integers(100, 1000, 40),
+            "bytes_out": rng.integers(100, 1000, 40),
+            "transport_protocol": ["TCP", "UDP"] * 20,
+            "direction": "outbound",
+            "label": "benign",
+        }
+    )
+
+
+@pytest.fixture
+def fitted_svm(clustered_data):
+    X_train, _ = clustered_data
+    return OneClassSVM(nu=0.5, gamma="scale").fit(X_train)
+
+
+class TestCompactRBFScorer:
+    """Test the exact and reduced compact scorers against sklearn."""
+
+    def test_exact_scores(self, fitted_svm, clustered_data):
+        """Test float32 contiguous arrays and scores matching the sklearn model."""
+        _, X_test = clustered_data
+        scorer = CompactRBFScorer.from_model(fitted_svm, block_size=128)
+
+        assert scorer.support_vectors.dtype == np.float32
+        assert scorer.support_vectors.flags["C_CONTIGUOUS"]
+        assert scorer.n_support == len(fitted_svm.support_vectors_)
+        np.testing.assert_allclose(
+            scorer.decision_function(X_test),
+            fitted_svm.decision_function(X_test),
+            atol=1e-3,
+        )
+
+    def test_block_size_does_not_change_scores(self, fitted_svm, clustered_data):
+        """Test scoring block by block gives the same scores."""
+        _, X_test = clustered_data
+        scorer = CompactRBFScorer.from_model(fitted_svm, block_size=4096)
+        blocked = CompactRBFScorer.from_model(fitted_svm, block_size=7)
+
+        np.testing.assert_allclose(
+            blocked.decision_function(X_test),
+            scorer.decision_function(X_test),
+            atol=1e-3,
+        )
+
+    def test_reduce_within_budget(self, fitted_svm, clustered_data):
+        """Test the reduced set is smaller and within the error budget."""
+        _, X_test = clustered_data
+        scorer = CompactRBFScorer.from_model(fitted_svm)
+        budget = 0.05 * np.std(scorer.decision_function(X_test))
+
+        reduced = scorer.reduce(X_test[:500], budget)
+
+        assert reduced.n_support < scorer.n_support
+        assert reduced.max_error <= budget
+        held_out_error = np.max(
+            np.abs(
+                reduced.decision_function(X_test[500:])
+                - fitted_svm.decision_function(X_test[500:])
+            )
+        )
+        assert held_out_error <= 2 * budget
+
+    def test_reduce_keeps_exact_set_when_budget_is_unreachable(
+        self, fitted_svm, clustered_data
+    ):
+        """Test the exact scorer is kept when no reduced set fits the budget."""
+        _, X_test = clustered_data
+        scorer = CompactRBFScorer.from_model(fitted_svm)
+
+        assert scorer.reduce(X_test[:200], 0.0) is scorer
+
+    def test_rejects_non_rbf_kernel(self, clustered_data):
+        """Test a linear model cannot be compacted."""
+        X_train, _ = clustered_data
+        model = OneClassSVM(kernel="linear").fit(X_train[:200])
+
+        with pytest.raises(ValueError):
+            CompactRBFScorer.from_model(model)
+
+
+class TestModelCompaction:
+    """Test OneClassSVMModel scoring through the compact scorer."""
+
+    def test_fit_builds_scorer(self, sample_data, tmp_path):
+        """Test fit compacts the model and scores match libsvm."""
+        model = OneClassSVMModel(nu=0.1)
+        model.config_path = tmp_path / "test_config.pkl"
+        model.model_path = tmp_path / "test_model.pkl"
+        model.preprocessor_path = tmp_path / "test_preprocessor.pkl"
+        model.fit(sample_data, max_train_samples=20)
+
+        X = model.preprocessor.transform(
+            sample_data.drop(columns=model.features_to_drop, errors="ignore")
+        )
+        assert isinstance(model.scorer, CompactRBFScorer)
+        np.testing.assert_allclose(
+            model._decision_function(X), model.model.decision_function(X), atol=1e-4
+        )
+
+        loaded = OneClassSVMModel()
+        loaded.config_path = model.config_path
+        loaded.model_path = model.model_path
+        loaded.preprocessor_path = model.preprocessor_path
+        assert loaded.load_model() is True
+        assert loaded.scorer.n_support == model.scorer.n_support
+
+    def test_compaction_disabled(self, sample_data, tmp_path):
+        """Test compact_scoring=False keeps libsvm scoring."""
+        model = OneClassSVMModel(nu=0.1, compact_scoring=False)
+        model.config_path = tmp_path / "test_config.pkl"
+        model.model_path = tmp_path / "test_model.pkl"
+        model.preprocessor_path = tmp_path / "test_preprocessor.pkl"
+        model.fit(sample_data, max_train_samples=20)
+
+        assert model.scorer is None
@@ -2,10 +2,13 @@
 # Adjust the import path based on your project structure
 import sys
 from pathlib import Path
+from unittest.mock import patch
 
 import numpy as np
 import pandas as pd
 import pytest
+from sklearn.kernel_approximation import Nystroem
+from sklearn.linear_model import SGDOneClassSVM
 from sklearn.svm import OneClassSVM
 
 sys.path.append(str(Path(__file__).parents[2]))  # Add project root to path
@@ -44,9 +47,14 @@ def sample_data():
 
 
 @pytest.fixture
-def model_instance():
+def model_instance(tmp_path):
     # Creating a fresh model instance -> UNTRAINED
-    return OneClassSVMModel(nu=0.1, kernel="rbf", gamma="scale")
+    model = OneClassSVMModel(nu=0.1, kernel="rbf", gamma="scale")
+    # fit() saves the model: keep the tracked files in src/model untouched
+    model.model_path = tmp_path / "model.pkl"
+    model.preprocessor_path = tmp_path / "preprocessor.pkl"
+    model.config_path = tmp_path / "config.pkl"
+    return model
 
 
 # --- Tests for OneClassSVMModel ---
@@ -110,6 +118,170 @@ class TestOneClassSVMModel:
         assert new_model.threshold_boundary == model_instance.threshold_boundary
 
 
+class TestSGDEngine:
+    """Test the Nystroem + SGDOneClassSVM engine."""
+
+    @pytest.fixture
+    def sgd_model(self, tmp_path):
+        model = OneClassSVMModel(nu=0.1, engine="sgd", n_components=10)
+        model.model_path = tmp_path / "test_model.pkl"
+        model.preprocessor_path = tmp_path / "test_preprocessor.pkl"
+        model.config_path = tmp_path / "test_config.pkl"
+        return model
+
+    def test_initialization(self, sgd_model):
+        """Test the engine builds a kernel approximation pipeline"""
+        assert isinstance(sgd_model.model.named_steps["kernel"], Nystroem)
+        assert isinstance(sgd_model.model.named_steps["svm"], SGDOneClassSVM)
+        assert sgd_model.model.named_steps["svm"].nu == 0.1
+
+    def test_unknown_engine(self):
+        """Test an unknown engine is rejected"""
+        with pytest.raises(ValueError):
+            OneClassSVMModel(engine="thundersvm")
+
+    def test_fit_uses_full_training_split(self, sgd_model, sample_data):
+        """Test no downsampling and a data-driven gamma for gamma='scale'"""
+        sgd_model.fit(sample_data, max_train_samples=5, contamination=0.1)
+
+        kernel = sgd_model.model.named_steps["kernel"]
+        assert kernel.components_.shape[0] == 10  # more than 5 training rows
+        assert kernel.gamma > 0
+        assert sgd_model.threshold_boundary != 0.0
+
+        results = sgd_model.predict(sample_data.iloc[:5])
+        assert len(results) == 5
+        assert all(res[0] in ["GREEN", "ORANGE", "RED"] for res in results)
+
+    def test_save_and_load(self, sgd_model, sample_data):
+        """Test the engine and scores survive a save/load round trip"""
+        sgd_model.fit(sample_data, max_train_samples=20)
+        sgd_model.save_model()
+
+        new_model = OneClassSVMModel()
+        new_model.model_path = sgd_model.model_path
+        new_model.preprocessor_path = sgd_model.preprocessor_path
+        new_model.config_path = sgd_model.config_path
+
+        assert new_model.load_model() is True
+        assert new_model.engine == "sgd"
+        pd.testing.assert_frame_equal(
+            new_model.predict_batch(sample_data), sgd_model.predict_batch(sample_data)
+        )
+
+
+class TestComputeDtype:
+    """Test the float32 feature matrices and scoring."""
+
+    def _fit(self, sample_data, tmp_path, compute_dtype):
+        model = OneClassSVMModel(nu=0.1, compute_dtype=compute_dtype)
+        model.model_path = tmp_path / f"{compute_dtype}_model.pkl"
+        model.preprocessor_path = tmp_path / f"{compute_dtype}_preprocessor.pkl"
+        model.config_path = tmp_path / f"{compute_dtype}_config.pkl"
+        model.fit(sample_data, max_train_samples=20)
+        return model
+
+    def test_float32_matrices(self, sample_data, tmp_path):
+        """Test preprocessing and the compact scorer run in C-contiguous float32"""
+        model = self._fit(sample_data, tmp_path, "float32")
+
+        X = model._transform(
+            sample_data.drop(columns=model.features_to_drop, errors="ignore")
+        )
+        assert X.dtype == np.float32
+        assert X.flags["C_CONTIGUOUS"]
+        assert model.scorer.dtype == np.float32
+
+        new_model = OneClassSVMModel()
+        new_model.model_path = model.model_path
+        new_model.preprocessor_path = model.preprocessor_path
+        new_model.config_path = model.config_path
+        new_model.load_model()
+        assert new_model.compute_dtype == np.float32
+
+    def test_score_drift_versus_float64(self, sample_data, tmp_path):
+        """Test float32 scores stay close to float64 ones"""
+        results = [
+            self._fit(sample_data, tmp_path, dtype).predict_batch(sample_data)
+            for dtype in ("float64", "float32")
+        ]
+
+        np.testing.assert_allclose(
+            results[1]["anomaly_score"], results[0]["anomaly_score"], atol=1e-3
+        )
+
+
+class TestPredictBatch:
+    """Test the vectorized severity assignment of predict_batch."""
+
+    @pytest.fixture
+    def banded_model(self, model_instance, sample_data):
+        """Fitted model whose scores are fixed around a 0.0 threshold."""
+        model_instance.fit(sample_data.iloc[:20], max_train_samples=20)
+        model_instance.threshold_boundary = 0.0
+        scores = np.array([0.3, -0.1, -0.6, 0.0, -0.5])
+        model_instance._decision_function = lambda X: scores[: len(X)]
+        return model_instance
+
+    def test_severity_bands(self, banded_model, sample_data):
+        """Test RED/ORANGE/GREEN bands, descriptions and the index."""
+        rows = sample_data.iloc[10:15]
+        results = banded_model.predict_batch(rows)
+
+        assert list(results.columns) == ["severity", "description", "anomaly_score"]
+        assert results.index.equals(rows.index)
+        assert results["severity"].tolist() == [
+            "GREEN",
+            "ORANGE",
+            "RED",
+            "GREEN",
+            "ORANGE",
+        ]
+        assert results["description"].iloc[2] == (
+            "CRITICAL: Far outside normal boundary"
+        )
+        assert results["anomaly_score"].tolist() == [0.3, -0.1, -0.6, 0.0, -0.5]
+
+    def test_predict_wraps_predict_batch(self, banded_model, sample_data):
+        """Test predict returns the same rows as (severity, msg, score) tuples."""
+        rows = sample_data.iloc[:5]
+        tuples = banded_model.predict(rows)
+        results = banded_model.predict_batch(rows)
+
+        assert tuples == list(results.itertuples(index=False, name=None))
+        assert all(isinstance(score, float) for _, _, score in tuples)
+
+    def test_error_rows(self, model_instance, sample_data):
+        """Test every row is an ERROR when preprocessing fails."""
+        results = model_instance.predict(sample_data.iloc[:3])
+
+        assert len(results) == 3
+        assert all(severity == "ERROR" for severity, _, _ in results)
+
+    def test_aggregated_metrics(self, banded_model, sample_data):
+        """Test Prometheus counters get one increment per severity."""
+        from src.model import oneCSVM_model
+
+        if not oneCSVM_model.METRICS_ENABLED:
+            pytest.skip("prometheus_client not installed")
+
+        with (
+            patch.object(oneCSVM_model, "predictions_total") as counter,
+            patch.object(oneCSVM_model, "anomalies_detected_total") as anomalies,
+        ):
+            banded_model.predict_batch(sample_data.iloc[:5])
+
+        increments = {
+            call.kwargs["severity"]: inc_call.args[0]
+            for call, inc_call in zip(
+                counter.labels.call_args_list,
+                counter.labels.return_value.inc.call_args_list,
+            )
+        }
+        assert increments == {"RED": 1, "ORANGE": 2, "GREEN": 2}
+        anomalies.inc.assert_called_once_with(3)
+
+
 # --- Tests for DriftDetector ---
 
 
@@ -155,3 +327,22 @@ class TestDriftDetector:
 
         assert detector.drift_detected is False
         assert len(detector.history) == 0  # History should be cleared too
+
+    def test_update_many_matches_update(self):
+        """Test a batch update gives the same drifts and state as single updates"""
+        rng = np.random.default_rng(0)
+        flags = np.concatenate([rng.random(300) < 0.05, rng.random(300) < 0.6])
+
+        single = DriftDetector(threshold=0.01)
+        expected = [single.update(flag) for flag in flags]
+
+        batched = DriftDetector(threshold=0.01)
+        drifts = np.concatenate(
+            [batched.update_many(chunk) for chunk in np.array_split(flags, 7)]
+        )
+
+        assert drifts.tolist() == expected
+        assert any(expected)
+        assert batched.drift_detected == single.drift_detected
+        assert batched.processed_samples == single.processed_samples
+        assert list(batched.history) == list(single.history)
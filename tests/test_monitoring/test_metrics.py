@@ -0,0 +1,89 @@
+"""Tests for the batch observation helper of the metrics registry."""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+from prometheus_client import CollectorRegistry, Histogram
+
+# Add project root to path
+sys.path.append(str(Path(__file__).parents[2]))
+
+from src.monitoring.metrics import observe_batch
+
+BUCKETS = [-2, -1.5, -1, -0.5, 0, 0.5, 1, 1.5, 2, 3, 5]
+
+
+def _histogram(**kwargs):
+    """Histogram registered in a private registry."""
+    return Histogram(
+        "test_scores", "Test scores", registry=CollectorRegistry(), **kwargs
+    )
+
+
+def _samples(histogram):
+    return {
+        (sample.name, tuple(sample.labels.items())): sample.value
+        for metric in histogram.collect()
+        for sample in metric.samples
+        if not sample.name.endswith("_created")
+    }
+
+
+class TestObserveBatch:
+    """Test observe_batch against per value Histogram.observe."""
+
+    def test_matches_observe(self):
+        """Test bucket counts, count and sum, including values on the bounds."""
+        rng = np.random.default_rng(0)
+        values = np.concatenate([rng.normal(0, 2, 1000), BUCKETS, [10.0, -10.0]])
+
+        expected = _histogram(buckets=BUCKETS)
+        for value in values:
+            expected.observe(value)
+
+        batched = _histogram(buckets=BUCKETS)
+        observe_batch(batched, values[:500])
+        observe_batch(batched, values[500:])
+
+        expected_samples = _samples(expected)
+        batched_samples = _samples(batched)
+        assert batched_samples.keys() == expected_samples.keys()
+        for key, value in expected_samples.items():
+            assert batched_samples[key] == pytest.approx(value)
+
+    def test_labelled_child(self):
+        """Test a labelled child is observed and the parent is rejected."""
+        histogram = _histogram(labelnames=["endpoint"], buckets=[0.1, 1.0])
+
+        observe_batch(histogram.labels(endpoint="health"), [0.05, 0.5, 2.0])
+
+        samples = _samples(histogram)
+        assert samples[("test_scores_count", (("endpoint", "health"),))] == 3
+        with pytest.raises(ValueError):
+            observe_batch(histogram, [0.5])
+
+    def test_empty_batch(self):
+        """Test an empty batch leaves the histogram untouched."""
+        histogram = _histogram(buckets=BUCKETS)
+
+        observe_batch(histogram, np.array([]))
+
+        assert _samples(histogram)[("test_scores_count", ())] == 0
+
+    def test_falls_back_to_observe(self):
+        """Test histograms without the expected internals get observe() per value."""
+
+        class PlainHistogram:
+            def __init__(self):
+                self.observed = []
+
+            def observe(self, amount):
+                self.observed.append(amount)
+
+        histogram = PlainHistogram()
+
+        observe_batch(histogram, np.array([0.5, 2.0, -1.0]))
+
+        assert histogram.observed == [0.5, 2.0, -1.0]
@@ -1,8 +1,12 @@
+import ipaddress
+
 import numpy as np
 import pandas as pd
 
 from src.feature_engineering.precalculations_functions import (
     calculate_ip_classification_features,
+    classify_private_ips,
+    ip_classification_features,
     is_private_ip,
 )
 
@@ -102,3 +106,91 @@ class TestCalculateIpClassificationFeatures:
         # NaN should be treated as not private
         assert result["src_is_private"].iloc[1] == 0
         assert result["src_is_private"].iloc[2] == 0
+
+
+class TestClassifyPrivateIps:
+
+    def test_matches_is_private_ip(self):
+        """Test that the vectorized path agrees with is_private_ip on every value"""
+        values = pd.Series(
+            [
+                "10.0.0.1",
+                "172.31.255.255",
+                "172.32.0.1",
+                "192.168.1.1",
+                "127.0.0.1",
+                "169.254.10.1",
+                "100.64.0.1",
+                "8.8.8.8",
+                "255.255.255.255",
+                "::1",
+                "fe80::1",
+                "2001:4860::8888",
+                "010.0.0.1",
+                "1.2.3",
+                "1.2.3.4 ",
+                "invalid",
+                "",
+                None,
+                np.nan,
+                3232235777,
+            ],
+            dtype=object,
+        )
+
+        result = classify_private_ips(values)
+
+        assert result.tolist() == [is_private_ip(ip) for ip in values]
+
+    def test_repeated_ips(self):
+        """Test that results of unique IPs are mapped back to every row"""
+        values = pd.Series(["8.8.8.8", "10.0.0.1"] * 1000)
+
+        result = classify_private_ips(values)
+
+        assert result[::2].sum() == 0
+        assert result[1::2].all()
+
+    def test_network_table_matches_ipaddress(self):
+        """Test the hard-coded private networks against ipaddress' is_private"""
+        sample = [
+            "192.0.0.8",
+            "192.0.0.9",
+            "192.0.0.10",
+            "192.0.0.100",
+            "192.0.0.171",
+            "100.64.0.1",
+            "::ffff:10.0.0.1",
+        ]
+        # First and last address of every range and their neighbours
+        for network in (
+            ip_classification_features.PRIVATE_NETWORKS
+            + ip_classification_features.PRIVATE_NETWORK_EXCEPTIONS
+        ):
+            first = int(network.network_address)
+            last = int(network.broadcast_address)
+            for address in (first - 1, first, last, last + 1):
+                if 0 <= address < 2**32:
+                    sample.append(str(ipaddress.IPv4Address(address)))
+        rng = np.random.default_rng(0)
+        sample += [
+            str(ipaddress.IPv4Address(int(a))) for a in rng.integers(0, 2**32, 2000)
+        ]
+
+        result = classify_private_ips(pd.Series(sample, dtype=object))
+
+        assert result.tolist() == [is_private_ip(ip) for ip in sample]
+
+    def test_falls_back_when_table_disagrees(self, monkeypatch):
+        """Test every value goes through is_private_ip when the table is off"""
+        # An empty table would classify every address as public
+        monkeypatch.setattr(ip_classification_features, "PRIVATE_NETWORKS", ())
+        assert ip_classification_features._table_matches_ipaddress() is False
+        monkeypatch.setattr(
+            ip_classification_features, "TABLE_MATCHES_IPADDRESS", False
+        )
+        values = pd.Series(["10.0.0.1", "192.0.0.100", "8.8.8.8"], dtype=object)
+
+        result = classify_private_ips(values)
+
+        assert result.tolist() == [is_private_ip(ip) for ip in values]
@@ -1,14 +1,31 @@
 from unittest.mock import patch
 
 import pandas as pd
+import pytest
 
+from src.dashboard.geolocation_service import GeolocationService
 from src.feature_engineering.precalculations_functions.ip_geolocation_features import (
     calculate_dst_ip_geolocation_features,
     calculate_ip_info,
     calculate_src_ip_geolocation_features,
+    resolve_ip_geolocation,
 )
 
 
+@pytest.fixture(autouse=True)
+def isolated_geo_service(tmp_path):
+    """Keep the default geolocation service off the real cache files"""
+    with patch.object(GeolocationService, "_init_geoip_database"):
+        service = GeolocationService(cache_file=tmp_path / "geo_cache.sqlite")
+    patch_target = (
+        "src.feature_engineering.precalculations_functions"
+        ".ip_geolocation_features.get_geo_service"
+    )
+    with patch(patch_target, return_value=service):
+        yield service
+    service.close()
+
+
 class TestIPGeolocationFeatures:
 
     def test_calculate_ip_info_failure(self):
@@ -145,3 +162,110 @@ class TestIPGeolocationFeatures:
 
             # Check that original dataframe length is preserved
             assert len(result) == len(df)
+
+
+class TestResolveIpGeolocation:
+    """Test suite for the shared offline-first geolocation resolver"""
+
+    PATCH_TARGET = (
+        "src.feature_engineering.precalculations_functions"
+        ".ip_geolocation_features.calculate_ip_info"
+    )
+
+    @pytest.fixture
+    def geo_service(self, tmp_path):
+        """GeolocationService with an empty temporary cache and no database"""
+        with patch.object(GeolocationService, "__init__", lambda self: None):
+            service = GeolocationService()
+        service.cache = {}
+        service.cache_file = tmp_path / "geo_cache.json"
+        service.geoip_reader = None
+        return service
+
+    def test_api_lookups_are_cached(self, geo_service):
+        """Test that each public IP is fetched once and stored in the shared cache"""
+        df = pd.DataFrame(
+            {"source_ip": ["8.8.8.8", "8.8.8.8", "10.0.0.1", "8.8.8.8", None]}
+        )
+        response = {
+            "success": True,
+            "type": "IPv4",
+            "continent": "North America",
+            "country": "United States",
+            "region": "California",
+            "city": "Mountain View",
+            "latitude": 37.4056,
+            "longitude": -122.0775,
+            "connection": {"isp": "Google LLC"},
+        }
+
+        with patch(self.PATCH_TARGET, return_value=response) as mock_info:
+            result = calculate_src_ip_geolocation_features(
+                df, rate_limit_delay=0, geo_service=geo_service
+            )
+            mock_info.assert_called_once()
+            assert mock_info.call_args.args[0] == "8.8.8.8"
+
+        assert result["src_country"].tolist() == [
+            "United States",
+            "United States",
+            "unknown",
+            "United States",
+            "unknown",
+        ]
+        assert result["src_isp"].iloc[0] == "Google LLC"
+        assert result["src_latitude"].iloc[0] == 37.4056
+        assert geo_service.cache_file.exists()
+
+        with patch(self.PATCH_TARGET) as mock_info:
+            cached = calculate_src_ip_geolocation_features(
+                df, rate_limit_delay=0, geo_service=geo_service
+            )
+            mock_info.assert_not_called()
+        pd.testing.assert_frame_equal(cached, result)
+
+    def test_legacy_cache_records(self, geo_service):
+        """Test that dashboard cache entries without the new fields are used"""
+        geo_service.cache["1.1.1.1"] = {
+            "ip": "1.1.1.1",
+            "country": "Australia",
+            "country_code": "AU",
+            "city": "Sydney",
+            "latitude": -33.8688,
+            "longitude": 151.2093,
+            "source": "api",
+        }
+
+        with patch(self.PATCH_TARGET) as mock_info:
+            table = resolve_ip_geolocation(["1.1.1.1"], geo_service)
+            mock_info.assert_not_called()
+
+        row = table.loc["1.1.1.1"]
+        assert row["ip_type"] == "IPv4"
+        assert row["city"] == "Sydney"
+        assert row["continent"] == "unknown"
+        assert not geo_service.cache_file.exists()
+
+    def test_record_expiring_between_calls_is_a_miss(self, geo_service):
+        """Test that a cache entry expiring after the membership check is refetched"""
+
+        class ExpiringCache(dict):
+            # The entry is fresh for `in` but stale by the time it is read
+            def __contains__(self, ip):
+                return True
+
+            def __getitem__(self, ip):
+                raise KeyError(ip)
+
+            def get(self, ip, default=None):
+                return default
+
+        geo_service.cache = ExpiringCache()
+        response = {"success": True, "country": "Australia", "city": "Sydney"}
+
+        with patch(self.PATCH_TARGET, return_value=response) as mock_info:
+            table = resolve_ip_geolocation(["1.1.1.1", "10.0.0.1"], geo_service)
+            mock_info.assert_called_once()
+
+        assert table.loc["1.1.1.1", "country"] == "Australia"
+        assert table.loc["10.0.0.1", "country"] == "unknown"
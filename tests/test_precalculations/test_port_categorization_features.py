@@ -7,6 +7,7 @@ import pandas as pd
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
 
 from src.feature_engineering.precalculations_functions import (
+    DEFAULT_PORT_CATEGORIES,
     calculate_port_categorization,
     is_port_common,
 )
@@ -76,3 +77,46 @@ class TestCalculatePortCategorization:
 
         # All should be common
         assert all(result["dst_port_is_common"] == 1)
+
+    def test_calculate_port_categorization_nullable_ports(self):
+        """Test Int64 ports with missing values from the Suricata formatter"""
+        df = pd.DataFrame(
+            {"destination_port": pd.array([80, None, 8080, 3389], dtype="Int64")}
+        )
+
+        result = calculate_port_categorization(df, "destination_port")
+
+        assert result["dst_port_is_common"].tolist() == [1, 0, 0, 1]
+
+    def test_calculate_port_categorization_matches_is_port_common(self):
+        """Test that every column dtype gives the same result as is_port_common"""
+        values = [80, 443.0, 80.5, -1, 70000, "80", None, np.nan, 25]
+        df = pd.DataFrame({"destination_port": pd.Series(values, dtype=object)})
+
+        result = calculate_port_categorization(df, "destination_port")
+
+        expected = [int(is_port_common(port)) for port in values]
+        assert result["dst_port_is_common"].tolist() == expected
+
+    def test_calculate_port_categorization_categories(self):
+        """Test the configurable port categories"""
+        df = pd.DataFrame({"destination_port": [22, 8080, 50000, np.nan]})
+
+        result = calculate_port_categorization(
+            df, "destination_port", categories=DEFAULT_PORT_CATEGORIES
+        )
+
+        assert result["dst_port_is_well_known"].tolist() == [1, 0, 0, 0]
+        assert result["dst_port_is_registered"].tolist() == [0, 1, 0, 0]
+        assert result["dst_port_is_dynamic"].tolist() == [0, 0, 1, 0]
+        assert result["dst_port_is_honeypot_service"].tolist() == [1, 1, 0, 0]
+
+    def test_calculate_port_categorization_default_columns(self):
+        """Test that categories are only added when requested"""
+        df = pd.DataFrame({"destination_port": [22]})
+
+        result = calculate_port_categorization(df, "destination_port")
+
+        assert [col for col in result.columns if col.startswith("dst_port_")] == [
+            "dst_port_is_common"
+        ]
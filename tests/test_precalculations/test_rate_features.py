@@ -1,6 +1,9 @@
 import pandas as pd
 
-from src.feature_engineering.precalculations_functions import calculate_rate_features
+from src.feature_engineering.precalculations_functions import (
+    calculate_rate_features,
+    calculate_traffic_totals,
+)
 
 
 class TestCalculateRateFeatures:
@@ -87,3 +90,23 @@ class TestCalculateRateFeatures:
 
         assert "bytes_per_second" in result.columns
         assert result["bytes_per_second"].iloc[0] == 150.0
+
+    def test_calculate_rate_features_inplace_with_totals(self):
+        """Test that inplace mode adds columns to the same frame using shared totals"""
+        df = pd.DataFrame(
+            {
+                "bytes_sent": [1000, 0],
+                "bytes_received": [500, 0],
+                "pkts_sent": [10, 0],
+                "pkts_received": [5, 0],
+                "duration": [10, 0],
+            }
+        )
+        expected = calculate_rate_features(df)
+
+        totals = calculate_traffic_totals(df)
+        result = calculate_rate_features(df, inplace=True, totals=totals)
+
+        assert result is df
+        assert "total_bytes" not in df.columns
+        pd.testing.assert_frame_equal(df, expected)
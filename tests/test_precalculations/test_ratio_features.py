@@ -1,7 +1,10 @@
 import pandas as pd
 import pytest
 
-from src.feature_engineering.precalculations_functions import calculate_ratio_features
+from src.feature_engineering.precalculations_functions import (
+    calculate_ratio_features,
+    calculate_traffic_totals,
+)
 
 
 class TestCalculateRatioFeatures:
@@ -60,3 +63,25 @@ class TestCalculateRatioFeatures:
         # Should be 1.0 (all sent, none received)
         assert result["bytes_sent_ratio"].iloc[0] == 1.0
         assert result["packets_sent_ratio"].iloc[0] == 1.0
+
+    def test_calculate_ratio_features_not_inplace_keeps_input(self):
+        """Test that the default mode leaves the input frame untouched"""
+        df = pd.DataFrame(
+            {
+                "bytes_sent": [300],
+                "bytes_received": [100],
+                "pkts_sent": [3],
+                "pkts_received": [1],
+            }
+        )
+
+        result = calculate_ratio_features(df, totals=calculate_traffic_totals(df))
+
+        assert list(df.columns) == [
+            "bytes_sent",
+            "bytes_received",
+            "pkts_sent",
+            "pkts_received",
+        ]
+        assert result["bytes_sent_ratio"].iloc[0] == 0.75
+        assert result["packets_sent_ratio"].iloc[0] == 0.75
@@ -95,3 +95,55 @@ class TestCalculateTemporalFeatures:
         # Should work and convert strings to datetime
         assert "hour" in result.columns
         assert result["hour"].iloc[0] == 10
+
+    def test_calculate_temporal_features_mixed_precision_strings(self):
+        """Test CSV timestamps with and without fractional seconds and missing values"""
+        df = pd.DataFrame(
+            {
+                "timestamp_start": [
+                    "2010-06-13 23:57:00",
+                    "2025-10-24 02:44:06.405778",
+                    None,
+                    "2010-06-13 23:57:00",
+                ]
+            }
+        )
+
+        result = calculate_temporal_features(df)
+
+        assert pd.api.types.is_datetime64_any_dtype(result["timestamp_start"])
+        assert result["hour"].iloc[0] == 23
+        assert result["day_of_week"].iloc[1] == 4  # Friday
+        assert pd.isna(result["hour"].iloc[2])
+        assert result["is_weekend"].tolist() == [1, 0, 0, 1]
+
+    def test_calculate_temporal_features_timezone(self):
+        """Test features computed in a configured timezone"""
+        df = pd.DataFrame(
+            {"timestamp_start": pd.to_datetime(["2025-10-24 07:30:00"])}  # UTC
+        )
+
+        result = calculate_temporal_features(df, timezone="Europe/Rome")
+
+        assert result["hour"].iloc[0] == 9
+        assert result["is_business_hours"].iloc[0] == 1
+
+    def test_calculate_temporal_features_custom_calendar(self):
+        """Test a custom business-hours and weekend calendar"""
+        df = pd.DataFrame(
+            {
+                "timestamp_start": pd.to_datetime(
+                    ["2025-01-10 08:00:00", "2025-01-11 08:00:00"]  # Fri, Sat
+                )
+            }
+        )
+
+        result = calculate_temporal_features(
+            df, business_hours=(8, 16), weekend_days=(4, 5)
+        )
+
+        assert result["is_weekend"].tolist() == [1, 1]
+        assert result["is_business_hours"].tolist() == [0, 0]
+
+        result = calculate_temporal_features(df, business_hours=(8, 16))
+        assert result["is_business_hours"].tolist() == [1, 0]